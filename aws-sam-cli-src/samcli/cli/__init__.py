@@ -1,3 +1,8 @@
 """
 CLI Framework
 """
+
+from samcli.cli.startup_profiler import start_startup_profiler
+
+# started before the rest of the CLI is imported, so that the profile covers its imports
+start_startup_profiler()
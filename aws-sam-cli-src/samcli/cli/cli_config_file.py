@@ -9,22 +9,125 @@ CLI configuration decorator to use TOML configuration files for click commands.
 import functools
 import logging
 import os
+import threading
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import click
 from click.core import ParameterSource
 
 from samcli.cli.context import Context, get_cmd_names
+from samcli.cli.startup_profiler import profile_startup_phase
 from samcli.commands.exceptions import ConfigException
 from samcli.lib.config.samconfig import DEFAULT_CONFIG_FILE_NAME, DEFAULT_ENV, SamConfig
-from samcli.lib.utils.defaults import get_default_aws_region
 
 __all__ = ("ConfigProvider", "configuration_option", "get_ctx_defaults")
 
 LOG = logging.getLogger(__name__)
 
 
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Returns the modification time and size of the file, or None when it does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CachedSamConfig:
+    """
+    A SamConfig, parsed at most once, with the configuration already resolved for a command and environment
+    """
+
+    def __init__(self, samconfig: SamConfig, stamp: Optional[Tuple[int, int]]):
+        self.samconfig = samconfig
+        self.stamp = stamp
+        self._resolved: Dict[Tuple[Tuple[str, ...], Optional[str], Optional[str]], dict] = {}
+        self._lock = threading.Lock()
+
+    def get_all(self, cmd_names: List[str], section: Optional[str], env: Optional[str]) -> dict:
+        """
+        Resolves the configuration of the command, like SamConfig.get_all, but only once per command, section and
+        environment. A copy is returned, so callers can update it.
+
+        Raises
+        ------
+        KeyError
+            When the command, section or environment is not in the configuration file. Not cached, so that it is
+            raised again on the next call.
+        """
+        key = (tuple(cmd_names), section, env)
+        with self._lock:
+            resolved = self._resolved.get(key)
+            if resolved is None:
+                # change from tomlkit table type to normal dictionary, so that click defaults work out of the box.
+                resolved = dict(self.samconfig.get_all(cmd_names, section, env=env).items())
+                self._resolved[key] = resolved
+        return dict(resolved)
+
+
+class SamConfigCache:
+    """
+    Process-wide cache of the configuration files, keyed by their absolute path.
+
+    Each command group and command of an invocation reads the configuration file through its own configuration
+    option, so without the cache the same file is parsed several times. An entry is parsed again when the modification
+    time or the size of its file changed, and is invalidated explicitly when the file is written by the CLI.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, CachedSamConfig] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(config_dir: Any, filename: Optional[str]) -> str:
+        filename = filename or SamConfig.get_default_file(config_dir=config_dir)
+        return os.path.abspath(os.path.join(str(config_dir), filename))
+
+    def load(self, config_dir: Any, filename: Optional[str] = None) -> CachedSamConfig:
+        """
+        Returns the cached configuration file, reading it again only if it changed since it was cached
+
+        Parameters
+        ----------
+        config_dir: Any
+            Directory of the configuration file
+        filename: Optional[str]
+            Name of the configuration file, or its absolute path. The default configuration file of the directory is
+            used when not given.
+
+        Returns
+        -------
+        CachedSamConfig
+            The cached configuration file
+        """
+        key = self._key(config_dir, filename)
+        stamp = _file_stamp(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.stamp != stamp:
+                config_file_path = Path(key)
+                entry = CachedSamConfig(SamConfig(config_file_path.parent, config_file_path.name), stamp)
+                self._entries[key] = entry
+        return entry
+
+    def invalidate(self, config_dir: Any = None, filename: Optional[str] = None) -> None:
+        """
+        Drops the cached configuration file, or all of them when no directory is given
+        """
+        with self._lock:
+            if config_dir is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(config_dir, filename), None)
+
+
+SAMCONFIG_CACHE = SamConfigCache()
+
+
 class ConfigProvider:
     """
     A parser for sam configuration files
@@ -76,7 +179,8 @@ class ConfigProvider:
         config_file_name = config_file_path.name
         config_file_dir = config_file_path.parents[0]
 
-        samconfig = SamConfig(config_file_dir, config_file_name)
+        cached_samconfig = SAMCONFIG_CACHE.load(config_file_dir, config_file_name)
+        samconfig = cached_samconfig.samconfig
 
         # Enable debug level logging by environment variable "SAM_DEBUG"
         if os.environ.get("SAM_DEBUG", "").lower() == "true":
@@ -100,9 +204,7 @@ class ConfigProvider:
                 samconfig.path(),
             )
 
-            # NOTE(TheSriram): change from tomlkit table type to normal dictionary,
-            # so that click defaults work out of the box.
-            resolved_config = dict(samconfig.get_all(self.cmd_names, self.section, env=config_env).items())
+            resolved_config = cached_samconfig.get_all(self.cmd_names, self.section, env=config_env)
             handle_parse_options(resolved_config)
             LOG.debug("Configuration values successfully loaded.")
             LOG.debug("Configuration values are: %s", resolved_config)
@@ -174,6 +276,7 @@ def get_options_map() -> dict:
         return {}
 
 
+@profile_startup_phase("config_load")
 def configuration_callback(
     cmd_name: str,
     option_name: str,
@@ -332,7 +435,9 @@ def save_command_line_args_to_config(
         # Use the region from context if it was set (via --region, env var, or AWS config)
         region_to_save = sam_context.region
     else:
-        # Use the same default region logic as the deploy command
+        # Use the same default region logic as the deploy command, botocore is only imported when saving the config
+        from samcli.lib.utils.defaults import get_default_aws_region
+
         region_to_save = get_default_aws_region()
 
     if region_to_save:
@@ -355,13 +460,19 @@ def save_params(func):
     def wrapper(*args, **kwargs):
         ctx = click.get_current_context()
         cmd_names = get_cmd_names(ctx.info_name, ctx)
+        config_dir = getattr(ctx, "samconfig_dir", os.getcwd())
+        config_file = ctx.params.get("config_file", None)
 
-        save_command_line_args_to_config(
-            ctx=ctx,
-            cmd_names=cmd_names,
-            config_env_name=ctx.params.get("config_env", None),
-            config_file=SamConfig(getattr(ctx, "samconfig_dir", os.getcwd()), ctx.params.get("config_file", None)),
-        )
+        try:
+            save_command_line_args_to_config(
+                ctx=ctx,
+                cmd_names=cmd_names,
+                config_env_name=ctx.params.get("config_env", None),
+                config_file=SAMCONFIG_CACHE.load(config_dir, config_file).samconfig,
+            )
+        finally:
+            if ctx.params.get("save_params", False):
+                SAMCONFIG_CACHE.invalidate(config_dir, config_file)
 
         return func(*args, **kwargs)
 
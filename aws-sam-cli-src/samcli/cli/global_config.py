@@ -2,14 +2,17 @@
 Provides global configuration helpers.
 """
 
+import atexit
 import json
 import logging
 import os
+import tempfile
 import threading
+import time
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Type, TypeVar, cast, overload
+from typing import Any, Dict, List, Optional, Set, Tuple, Type, TypeVar, cast, overload
 
 import click
 
@@ -34,6 +37,66 @@ class DefaultEntry:
     LAST_VERSION_CHECK = ConfigEntry("lastVersionCheck", None)
     TELEMETRY = ConfigEntry("telemetryEnabled", "SAM_CLI_TELEMETRY")
     ACCELERATE_OPT_IN_STACKS = ConfigEntry("accelerateOptInStacks", None)
+    TEMPLATE_CACHE = ConfigEntry("templateCacheEnabled", "SAM_CLI_TEMPLATE_CACHE")
+
+
+class _ConfigFileLock:
+    """
+    Advisory inter-process lock, held while a SAM CLI process merges its changes into the config file.
+
+    On Windows, the lock is retried for up to LOCK_TIMEOUT_SECONDS, then TimeoutError is raised.
+    """
+
+    LOCK_TIMEOUT_SECONDS = 10.0
+    LOCK_RETRY_DELAY_SECONDS = 0.1
+
+    def __init__(self, lock_path: Path):
+        self.lock_path = lock_path
+        self.lock_file: Any = None
+
+    def __enter__(self):
+        self.lock_file = open(self.lock_path, "a+")
+        if os.name == "nt":
+            import msvcrt
+
+            self.lock_file.seek(0)
+            deadline = time.monotonic() + self.LOCK_TIMEOUT_SECONDS
+            while True:
+                try:
+                    msvcrt.locking(self.lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError as ex:
+                    if time.monotonic() >= deadline:
+                        self.lock_file.close()
+                        raise TimeoutError(f"Timed out waiting for the lock {self.lock_path}") from ex
+                    time.sleep(self.LOCK_RETRY_DELAY_SECONDS)
+        else:
+            import fcntl
+
+            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                self.lock_file.seek(0)
+                msvcrt.locking(self.lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self.lock_file.close()
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
 
 class Singleton(type):
@@ -55,6 +118,11 @@ class GlobalConfig(metaclass=Singleton):
 
     Generally uses '~/.aws-sam/' or 'C:\\Users\\<user>\\AppData\\Roaming\\AWS SAM' as
     the base directory, depending on platform.
+
+    Changes are written behind: set_value only records them, and they are all written in one go when the process
+    exits (or when flush is called). The changed entries are merged into the current content of the file under an
+    advisory lock, and the file is replaced atomically, so that concurrent SAM CLI processes neither tear the file nor
+    drop each other's changes. The file is only read again when its modification time or size changed.
     """
 
     DEFAULT_CONFIG_FILENAME: str = "metadata.json"
@@ -77,6 +145,12 @@ class GlobalConfig(metaclass=Singleton):
     _config_data: Optional[Dict[str, Any]]
     # config_keys that should be flushed to file
     _persistent_fields: List[str]
+    # config_keys changed since the last write of the config file
+    _dirty_fields: Set[str]
+    # whether the changes must be written to the config file when the process exits
+    _flush_requested: bool
+    # modification time and size of the config file when it was last read or written
+    _config_stamp: Optional[Tuple[int, int]]
     docker_host: str
 
     def __init__(self):
@@ -86,7 +160,13 @@ class GlobalConfig(metaclass=Singleton):
         self._config_filename = None
         self._config_data = None
         self._persistent_fields = list()
+        self._dirty_fields = set()
+        self._flush_requested = False
+        self._config_stamp = None
         self.docker_host = os.environ.get(GlobalConfig.DOCKER_HOST_ENV_VAR, "")
+        # registered when the singleton is created, which is before the exit handlers of the CLI (e.g. the metrics)
+        # are registered, so that changes made by those handlers are still written
+        atexit.register(self.flush)
 
     @property
     def config_dir(self) -> Path:
@@ -121,8 +201,8 @@ class GlobalConfig(metaclass=Singleton):
         """
         if not dir_path.is_dir():
             raise ValueError("config_dir must be a directory.")
+        self._switch_config_file()
         self._config_dir = dir_path
-        self._config_data = None
 
     @property
     def config_filename(self) -> str:
@@ -138,8 +218,17 @@ class GlobalConfig(metaclass=Singleton):
 
     @config_filename.setter
     def config_filename(self, filename: str) -> None:
+        self._switch_config_file()
         self._config_filename = filename
-        self._config_data = None
+
+    def _switch_config_file(self) -> None:
+        """Write the pending changes to the current config file, before another config file is used"""
+        with self._access_lock:
+            self.flush()
+            self._config_data = None
+            self._config_stamp = None
+            self._dirty_fields.clear()
+            self._flush_requested = False
 
     @property
     def config_path(self) -> Path:
@@ -215,7 +304,7 @@ class GlobalConfig(metaclass=Singleton):
             configuration file and env var has different values.
             By default False
         reload_config : bool, optional
-            Whether configuration file should be reloaded before getting the value.
+            Whether configuration file should be reloaded before getting the value, if it changed since it was read.
             By default False
 
         Returns
@@ -243,7 +332,7 @@ class GlobalConfig(metaclass=Singleton):
                     value = value == "1"
 
             if value is None and config_entry.config_key:
-                if reload_config or self._config_data is None:
+                if self._config_data is None or (reload_config and _file_stamp(self.config_path) != self._config_stamp):
                     self._load_config()
                 value = cast(dict, self._config_data).get(config_entry.config_key)
 
@@ -275,7 +364,8 @@ class GlobalConfig(metaclass=Singleton):
             configuration file and env var has different values.
             By default False
         flush : bool, optional
-            Should the value be written to configuration file, by default True
+            Should the value be written to configuration file when the process exits, by default True.
+            Values set without flush are only written along with the values set with it.
         """
         with self._access_lock:
             self._set_value(config_entry, value, is_flag, flush)
@@ -292,6 +382,7 @@ class GlobalConfig(metaclass=Singleton):
             if self._config_data is None:
                 self._load_config()
             cast(dict, self._config_data)[config_entry.config_key] = value
+            self._dirty_fields.add(config_entry.config_key)
 
             if config_entry.persistent:
                 self._persistent_fields.append(config_entry.config_key)
@@ -299,39 +390,82 @@ class GlobalConfig(metaclass=Singleton):
                 self._persistent_fields.remove(config_entry.config_key)
 
             if flush:
+                self._flush_requested = True
+
+    def flush(self) -> None:
+        """Write the values set with flush to the configuration file now, instead of when the process exits"""
+        with self._access_lock:
+            if self._flush_requested:
                 self._write_config()
 
-    def _load_config(self) -> None:
-        """Reload configurations from file and populate self._config_data"""
-        if not self.config_path.exists():
-            self._config_data = {}
-            return
+    def _read_config_file(self) -> Dict[str, Any]:
+        """Read the configurations of the config file, recording its modification time and size"""
+        self._config_stamp = _file_stamp(self.config_path)
+        if self._config_stamp is None:
+            return {}
         try:
-            body = self.config_path.read_text()
-            json_body = json.loads(body)
-            self._config_data = json_body
-            # Default existing fields to be persistent
-            # so that they will be kept when flushed back
-            for key in json_body:
-                self._persistent_fields.append(key)
+            json_body = json.loads(self.config_path.read_text())
+            if not isinstance(json_body, dict):
+                raise ValueError("The global config file does not contain a JSON object")
+            return json_body
         except (OSError, ValueError) as ex:
             LOG.warning(
                 "Error when loading global config file: %s",
                 self.config_path,
                 exc_info=ex,
             )
-            self._config_data = {}
+            return {}
+
+    def _load_config(self) -> None:
+        """Reload configurations from file and populate self._config_data, keeping the changes not written yet"""
+        pending_changes = {
+            key: value for (key, value) in (self._config_data or {}).items() if key in self._dirty_fields
+        }
+        json_body = self._read_config_file()
+        # Default existing fields to be persistent
+        # so that they will be kept when flushed back
+        for key in json_body:
+            self._persistent_fields.append(key)
+        json_body.update(pending_changes)
+        self._config_data = json_body
 
     def _write_config(self) -> None:
-        """Write configurations in self._config_data to file"""
-        if not self._config_data:
+        """Merge the configurations changed since the last write into the config file, and replace it atomically"""
+        if not self._dirty_fields:
             return
-        config_data = {key: value for (key, value) in self._config_data.items() if key in self._persistent_fields}
+        changed_data = cast(dict, self._config_data or {})
         try:
-            json_str = json.dumps(config_data, indent=4)
             if not self.config_dir.exists():
                 self.config_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
-            self.config_path.write_text(json_str)
+            with _ConfigFileLock(Path(self.config_dir, self.config_filename + ".lock")):
+                # other processes may have written the file since it was read, only the changed keys are replaced
+                config_data = self._read_config_file()
+                for key in self._dirty_fields:
+                    if key in self._persistent_fields and key in changed_data:
+                        config_data[key] = changed_data[key]
+                    else:
+                        config_data.pop(key, None)
+                json_str = json.dumps(config_data, indent=4)
+
+                file_descriptor, temp_path = tempfile.mkstemp(dir=self.config_dir, prefix=self.config_filename)
+                try:
+                    with os.fdopen(file_descriptor, "w") as temp_file:
+                        temp_file.write(json_str)
+                    os.replace(temp_path, self.config_path)
+                except BaseException:
+                    Path(temp_path).unlink(missing_ok=True)
+                    raise
+                self._config_stamp = _file_stamp(self.config_path)
+
+            for key, value in config_data.items():
+                if key not in changed_data:
+                    changed_data[key] = value
+                    self._persistent_fields.append(key)
+            self._dirty_fields.clear()
+            self._flush_requested = False
+        except TimeoutError as ex:
+            # the changes stay pending, they are written by the next flush
+            LOG.warning("Skipped writing the global config file %s: %s", self.config_path, ex)
         except (OSError, ValueError) as ex:
             LOG.warning(
                 "Error when writing global config file: %s",
@@ -414,6 +548,15 @@ class GlobalConfig(metaclass=Singleton):
         """
         self.set_value(DefaultEntry.TELEMETRY, value, is_flag=True, flush=True)
 
+    @property
+    def template_cache_enabled(self) -> bool:
+        """
+        Check if parsed templates are cached on disk between invocations (see template_cache.py). Disabled by
+        default, set the SAM_CLI_TEMPLATE_CACHE environment variable to '1' or "templateCacheEnabled" to true in the
+        config file to enable it.
+        """
+        return bool(self.get_value(DefaultEntry.TEMPLATE_CACHE, default=False, value_type=bool, is_flag=True))
+
     @property
     def last_version_check(self) -> Optional[float]:
         return self.get_value(DefaultEntry.LAST_VERSION_CHECK, value_type=float)
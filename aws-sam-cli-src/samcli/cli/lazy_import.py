@@ -0,0 +1,77 @@
+"""
+Deferred imports of modules that are expensive to import
+
+Command modules are imported to build the help text and the options of a command, so the modules only needed to run
+the command (boto3, docker, Flask, ...) should not be imported at module level. Functions usually import them locally,
+while names used across a module can be bound to a lazy module instead:
+
+    template = lazy_import("samcli.commands._utils.template")
+
+    def callback(...):
+        return template.get_template_data(path)  # imported on the first attribute access
+
+PyInstaller can't see these imports, so the modules must be part of SAM_CLI_HIDDEN_IMPORTS (see hidden_imports.py),
+which already lists every samcli module. The import goes through `importlib.import_module`, so the import module proxy
+attached by `samdev` still reports lazily imported modules that are missing from the hidden imports.
+"""
+
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    """
+    Module placeholder which imports the actual module the first time one of its attributes is accessed
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    # looked up at call time, so that the import module proxy of samdev sees the import
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._load(), name, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> Any:
+    """
+    Returns a placeholder for the module, which is imported the first time one of its attributes is accessed. The
+    module is returned directly when it is already imported.
+
+    Parameters
+    ----------
+    name: str
+        Absolute name of the module
+
+    Returns
+    -------
+    The module, or a LazyModule standing for it
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
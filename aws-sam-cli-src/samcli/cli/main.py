@@ -12,6 +12,7 @@ from samcli.cli.command import BaseCommand
 from samcli.cli.context import Context
 from samcli.cli.global_config import GlobalConfig
 from samcli.cli.options import debug_option, profile_option, region_option
+from samcli.cli.startup_profiler import profile_startup_phase
 from samcli.commands._utils.experimental import experimental, get_all_experimental_env_vars
 from samcli.lib.utils.sam_logging import (
     LAMBDA_BULDERS_LOGGER_NAME,
@@ -19,7 +20,6 @@ from samcli.lib.utils.sam_logging import (
     SAM_CLI_LOGGER_NAME,
     SamCliLogger,
 )
-from samcli.lib.utils.system_info import gather_additional_dependencies_info, gather_system_info
 
 LOG = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
@@ -52,6 +52,8 @@ def print_info(ctx, param, value):
     if not value or ctx.resilient_parsing:
         return
 
+    from samcli.lib.utils.system_info import gather_additional_dependencies_info, gather_system_info
+
     info = {
         "version": __version__,
         "system": gather_system_info(),
@@ -121,6 +123,7 @@ TELEMETRY_PROMPT = """
     help="Show system and dependencies information.",
 )
 @pass_context
+@profile_startup_phase("cli_setup")
 def cli(ctx):
     """
     AWS Serverless Application Model (SAM) CLI
@@ -0,0 +1,260 @@
+"""
+Startup profiler of the SAM CLI
+
+Set the SAM_CLI_PROFILE_STARTUP environment variable to record how long the CLI spends importing modules and in the
+startup phases (CLI setup, config load, template parse, provider setup) of a command:
+
+* SAM_CLI_PROFILE_STARTUP=1 prints the phases and the import tree on stderr when the process exits
+* SAM_CLI_PROFILE_STARTUP=<path> writes them as JSON to the given file instead
+
+The import tree is similar to the output of `python -X importtime`, but is recorded from within the CLI so that it
+also works with the installers, which do not accept interpreter options.
+
+tests/integration/startup/test_startup_budget.py checks that the cold startup of key commands stays within a time
+budget.
+
+This module is imported before anything else in the CLI, so it only depends on the standard library.
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+STARTUP_PROFILE_ENV_VAR = "SAM_CLI_PROFILE_STARTUP"
+
+# Imports faster than this are left out of the printed import tree, the JSON report contains all of them
+PRINTED_IMPORT_THRESHOLD = 0.001
+
+
+class ImportRecord:
+    """
+    Import of a module, with the imports that happened while it was executing
+    """
+
+    def __init__(self, name: str, find_time: float):
+        self.name = name
+        self.cumulative_time = find_time
+        self.children: List["ImportRecord"] = []
+
+    @property
+    def self_time(self) -> float:
+        return self.cumulative_time - sum(child.cumulative_time for child in self.children)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "module": self.name,
+            "self_ms": round(self.self_time * 1000, 3),
+            "cumulative_ms": round(self.cumulative_time * 1000, 3),
+            "imports": [child.to_dict() for child in self.children],
+        }
+
+
+class StartupProfile:
+    """
+    Import tree and phase timings of the current process
+    """
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.imports: List[ImportRecord] = []
+        self.phases: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _import_stack(self) -> List[ImportRecord]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def importing(self, name: str, find_time: float) -> Iterator[None]:
+        record = ImportRecord(name, find_time)
+        stack = self._import_stack()
+        if stack:
+            stack[-1].children.append(record)
+        else:
+            with self._lock:
+                self.imports.append(record)
+
+        stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record.cumulative_time += time.perf_counter() - start
+            stack.pop()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.phases.append(
+                    {
+                        "phase": name,
+                        "start_ms": round((start - self.start) * 1000, 3),
+                        "duration_ms": round((end - start) * 1000, 3),
+                    }
+                )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "argv": sys.argv,
+            "total_ms": round((time.perf_counter() - self.start) * 1000, 3),
+            "import_ms": round(sum(record.cumulative_time for record in self.imports) * 1000, 3),
+            "phases": self.phases,
+            "imports": [record.to_dict() for record in self.imports],
+        }
+
+    def format(self) -> str:
+        report = self.to_dict()
+        lines = [
+            f"SAM CLI startup profile: total {report['total_ms']:.1f} ms, imports {report['import_ms']:.1f} ms",
+            "Phases:",
+        ]
+        for phase in self.phases:
+            lines.append(f"  {phase['phase']:<24} {phase['duration_ms']:>10.1f} ms (at {phase['start_ms']:.1f} ms)")
+        lines.append(f"Imports taking more than {PRINTED_IMPORT_THRESHOLD * 1000:.0f} ms:")
+        lines.append(f"  {'self [ms]':>10} | {'cumulative [ms]':>15} | module")
+        self._format_imports(self.imports, 0, lines)
+        return "\n".join(lines)
+
+    def _format_imports(self, records: List[ImportRecord], depth: int, lines: List[str]) -> None:
+        for record in records:
+            if record.cumulative_time < PRINTED_IMPORT_THRESHOLD:
+                continue
+            lines.append(
+                f"  {record.self_time * 1000:>10.1f} | {record.cumulative_time * 1000:>15.1f} | "
+                f"{'  ' * depth}{record.name}"
+            )
+            self._format_imports(record.children, depth + 1, lines)
+
+
+class _TimedLoader:
+    """
+    Wraps the loader of a module to time its execution, delegating everything else to the original loader
+    """
+
+    def __init__(self, loader: Any, name: str, find_time: float, profile: StartupProfile):
+        self._loader = loader
+        self._name = name
+        self._find_time = find_time
+        self._profile = profile
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        # the module only sees its original loader, the wrapper is not visible after the import
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        with self._profile.importing(self._name, self._find_time):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class _TimedFinder:
+    """
+    Meta path finder which finds modules through the other finders, and wraps their loaders with a _TimedLoader
+    """
+
+    def __init__(self, profile: StartupProfile):
+        self._profile = profile
+
+    def find_spec(self, fullname: str, path=None, target=None):
+        start = time.perf_counter()
+        spec = None
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+
+        if spec is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+        spec.loader = _TimedLoader(spec.loader, fullname, time.perf_counter() - start, self._profile)
+        return spec
+
+
+class _ProfileHolder:
+    """
+    Holds the profile of the current process once the profiler is started
+    """
+
+    def __init__(self) -> None:
+        self.profile: Optional[StartupProfile] = None
+
+
+_CURRENT = _ProfileHolder()
+
+
+def is_startup_profiling_enabled() -> bool:
+    return os.environ.get(STARTUP_PROFILE_ENV_VAR, "").lower() not in ("", "0", "false")
+
+
+def start_startup_profiler() -> None:
+    """
+    Starts recording the imports and phases of the process when SAM_CLI_PROFILE_STARTUP is set, and reports them when
+    the process exits. Does nothing when the profiler is disabled or already started.
+    """
+    if _CURRENT.profile is not None or not is_startup_profiling_enabled():
+        return
+
+    profile = StartupProfile()
+    _CURRENT.profile = profile
+    sys.meta_path.insert(0, _TimedFinder(profile))
+    atexit.register(_report, profile, os.environ[STARTUP_PROFILE_ENV_VAR])
+
+
+def _report(profile: StartupProfile, destination: str) -> None:
+    if destination.lower() in ("1", "true"):
+        sys.stderr.write(profile.format() + "\n")
+        return
+    try:
+        with open(destination, "w") as report_file:
+            json.dump(profile.to_dict(), report_file, indent=2)
+    except OSError as ex:
+        sys.stderr.write(f"Unable to write the startup profile to {destination}: {ex}\n")
+
+
+@contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    """
+    Records the duration of a startup phase when the startup profiler is enabled
+    """
+    profile = _CURRENT.profile
+    if profile is None:
+        yield
+        return
+    with profile.phase(name):
+        yield
+
+
+def profile_startup_phase(name: str) -> Callable:
+    """
+    Decorator recording the duration of the decorated function as a startup phase
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with startup_phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
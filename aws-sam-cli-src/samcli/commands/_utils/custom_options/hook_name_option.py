@@ -4,6 +4,7 @@ Custom Click options for hook name
 
 import logging
 import os
+import uuid
 from typing import Any, Mapping
 
 import click
@@ -18,6 +19,10 @@ LOG = logging.getLogger(__name__)
 
 PLAN_FILE_OPTION = "terraform_plan_file"
 
+# identifies the current `sam build` for the batched build of the Terraform Makefile rules, which inherit it from the
+# SAM CLI process, see copy_terraform_built_artifacts.py
+BATCH_BUILD_ID_ENV_VAR = "SAM_CLI_TERRAFORM_BATCH_BUILD_ID"
+
 
 class HookNameOption(click.Option):
     """
@@ -60,6 +65,9 @@ class HookNameOption(click.Option):
 
         _validate_build_command_parameters(command_name, opts)
 
+        if command_name == "build":
+            os.environ[BATCH_BUILD_ID_ENV_VAR] = uuid.uuid4().hex
+
         try:
             self._call_prepare_hook(iac_hook_wrapper, opts, ctx)
         except Exception as ex:
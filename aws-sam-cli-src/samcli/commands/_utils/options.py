@@ -10,6 +10,7 @@ from typing import Dict, List, Tuple
 import click
 from click.types import FuncParamType
 
+from samcli.cli.lazy_import import lazy_import
 from samcli.cli.types import (
     CfnMetadataType,
     CfnParameterOverridesType,
@@ -31,11 +32,13 @@ from samcli.commands._utils.custom_options.hook_name_option import HookNameOptio
 from samcli.commands._utils.custom_options.option_nargs import OptionNargs
 from samcli.commands._utils.custom_options.replace_help_option import ReplaceHelpSummaryOption
 from samcli.commands._utils.parameterized_option import parameterized_option
-from samcli.commands._utils.template import TemplateNotFoundException, get_template_artifacts_format, get_template_data
 from samcli.lib.hook.hook_wrapper import get_available_hook_packages_ids
 from samcli.lib.observability.util import OutputOption
 from samcli.lib.utils.packagetype import IMAGE, ZIP
-from samcli.local.docker.lambda_image import Runtime
+from samcli.local.docker.lambda_runtime import Runtime
+
+# parsing templates needs yaml, jmespath and botocore, which are only imported when a template option is processed
+_template = lazy_import("samcli.commands._utils.template")
 
 _TEMPLATE_OPTION_DEFAULT_VALUE = "template.[yaml|yml|json]"
 SUPPORTED_BUILD_IN_SOURCE_WORKFLOWS = [
@@ -63,6 +66,10 @@ def get_or_default_template_file_name(ctx, param, provided_value, include_build)
     :return: Actual value to be used in the CLI
     """
 
+    if ctx and ctx.params.get("stacks_file"):
+        # sam deploy --stacks-file reads the template of each stack from the stacks file
+        return None
+
     original_template_path = os.path.abspath(provided_value)
 
     search_paths = ["template.yaml", "template.yml", "template.json"]
@@ -93,9 +100,9 @@ def get_or_default_template_file_name(ctx, param, provided_value, include_build)
         setattr(ctx, "samconfig_dir", os.path.dirname(original_template_path))
         try:
             # FIX-ME: figure out a way to insert this directly to sam-cli context and not use click context.
-            template_data = get_template_data(result)
+            template_data = _template.get_template_data(result)
             setattr(ctx, "template_dict", template_data)
-        except TemplateNotFoundException:
+        except _template.TemplateNotFoundException:
             # Ignoring because there are certain cases where template file will not be available, eg: --help
             pass
 
@@ -113,8 +120,10 @@ def guided_deploy_stack_name(ctx, param, provided_value):
     """
 
     guided = ctx.params.get("guided", False) or ctx.params.get("g", False)
+    # the stacks file names the stacks to deploy
+    stacks_file = ctx.params.get("stacks_file")
 
-    if not guided and not provided_value:
+    if not guided and not stacks_file and not provided_value:
         raise click.BadOptionUsage(
             option_name=param.name,
             ctx=ctx,
@@ -182,6 +191,10 @@ def artifact_callback(ctx, param, provided_value, artifact):
     :return: Actual value to be used in the CLI
     """
 
+    if ctx.params.get("stacks_file"):
+        # the artifacts of sam deploy --stacks-file are checked against the template of each stack
+        return provided_value
+
     # NOTE(sriram-mv): Both params and default_map need to be checked, as the option can be either be
     # passed in directly or through configuration file.
     # If passed in through configuration file, default_map is loaded with those values.
@@ -193,7 +206,7 @@ def artifact_callback(ctx, param, provided_value, artifact):
     required = any(
         [
             _template_artifact == artifact
-            for _template_artifact in get_template_artifacts_format(template_file=template_file)
+            for _template_artifact in _template.get_template_artifacts_format(template_file=template_file)
         ]
     )
     # NOTE(sriram-mv): Explicit check for param name being s3_bucket
@@ -227,7 +240,7 @@ def resolve_s3_callback(ctx, param, provided_value, artifact, exc_set, exc_not_s
     required = any(
         [
             _template_artifact == artifact
-            for _template_artifact in get_template_artifacts_format(template_file=template_file)
+            for _template_artifact in _template.get_template_artifacts_format(template_file=template_file)
         ]
     )
     # NOTE(sriram-mv): Explicit check for s3_bucket being explicitly passed in along with `--resolve-s3`.
@@ -724,19 +737,22 @@ def force_upload_option(f):
     return force_upload_click_option()(f)
 
 
-def resolve_s3_click_option(guided):
+def _package_resolve_s3_callback(ctx, param, provided_value):
+    # importing samcli.commands.package loads the whole package command, only do it when the option is processed
     from samcli.commands.package.exceptions import PackageResolveS3AndS3NotSetError, PackageResolveS3AndS3SetError
 
-    callback = (
-        None
-        if guided
-        else partial(
-            resolve_s3_callback,
-            artifact=ZIP,
-            exc_set=PackageResolveS3AndS3SetError,
-            exc_not_set=PackageResolveS3AndS3NotSetError,
-        )
+    return resolve_s3_callback(
+        ctx,
+        param,
+        provided_value,
+        artifact=ZIP,
+        exc_set=PackageResolveS3AndS3SetError,
+        exc_not_set=PackageResolveS3AndS3NotSetError,
     )
+
+
+def resolve_s3_click_option(guided):
+    callback = None if guided else _package_resolve_s3_callback
     return click.option(
         "--resolve-s3/--no-resolve-s3",
         required=False,
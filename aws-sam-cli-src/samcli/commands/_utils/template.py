@@ -2,14 +2,22 @@
 Utilities to manipulate template
 """
 
+import copy
+import functools
+import hashlib
 import itertools
 import os
 import pathlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 
 import jmespath
 import yaml
 from botocore.utils import set_value_from_jmespath
 
+from samcli.cli.startup_profiler import profile_startup_phase
+from samcli.commands._utils import template_cache
 from samcli.commands.exceptions import UserException
 from samcli.lib.samlib.resource_metadata_normalizer import ASSET_PATH_METADATA_KEY, ResourceMetadataNormalizer
 from samcli.lib.utils import graphql_api
@@ -33,10 +41,81 @@ class TemplateFailedParsingException(UserException):
     pass
 
 
+# Number of parsed templates kept in memory, a command reads a handful of templates at most (nested stacks aside)
+MAX_CACHED_TEMPLATES = 32
+
+
+class _ParsedTemplate(NamedTuple):
+    stamp: Tuple[int, int]
+    digest: str
+    template_dict: Any
+
+
+_PARSED_TEMPLATES: "OrderedDict[str, _ParsedTemplate]" = OrderedDict()
+_PARSED_TEMPLATES_LOCK = threading.Lock()
+
+
+def _get_parsed_template(template_file) -> Any:
+    """
+    Returns the parsed template, shared by every caller: it must not be modified, see get_template_data for a copy.
+
+    The parsed templates are cached by path, and reused as long as the modification time, the size and the content
+    hash of the file are unchanged. The file is read and hashed on every call, which costs much less than parsing
+    the YAML again, and catches edits that keep the modification time and the size of the file. When enabled, the
+    on-disk cache of template_cache.py is looked up by content hash before parsing the template.
+    """
+    path = os.path.abspath(template_file)
+    try:
+        stat = os.stat(path)
+        with open(path, "rb") as fp:
+            content = fp.read()
+    except FileNotFoundError as ex:
+        raise TemplateNotFoundException("Template file not found at {}".format(template_file)) from ex
+
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    digest = hashlib.sha256(content).hexdigest()
+    with _PARSED_TEMPLATES_LOCK:
+        parsed = _PARSED_TEMPLATES.get(path)
+        if parsed and parsed.digest == digest:
+            _PARSED_TEMPLATES.move_to_end(path)
+            if parsed.stamp != stamp:
+                _PARSED_TEMPLATES[path] = parsed._replace(stamp=stamp)
+            return parsed.template_dict
+
+    use_disk_cache = template_cache.is_template_cache_enabled()
+    template_dict = template_cache.load_template(digest) if use_disk_cache else None
+    if template_dict is None:
+        try:
+            template_dict = yaml_parse(content.decode("utf-8"))
+        except (ValueError, yaml.YAMLError) as ex:
+            raise TemplateFailedParsingException("Failed to parse template: {}".format(str(ex))) from ex
+        if use_disk_cache:
+            template_cache.store_template(digest, template_dict)
+
+    with _PARSED_TEMPLATES_LOCK:
+        _PARSED_TEMPLATES[path] = _ParsedTemplate(stamp, digest, template_dict)
+        _PARSED_TEMPLATES.move_to_end(path)
+        while len(_PARSED_TEMPLATES) > MAX_CACHED_TEMPLATES:
+            _PARSED_TEMPLATES.popitem(last=False)
+    return template_dict
+
+
+def clear_template_cache() -> None:
+    """
+    Forgets the parsed templates, the next read of each template parses it again
+    """
+    with _PARSED_TEMPLATES_LOCK:
+        _PARSED_TEMPLATES.clear()
+
+
+@profile_startup_phase("template_parse")
 def get_template_data(template_file):
     """
     Read the template file, parse it as JSON/YAML and return the template as a dictionary.
 
+    The template is parsed once per process (as long as the file does not change), each call returns a copy of the
+    parsed template which the caller is free to modify.
+
     Parameters
     ----------
     template_file : string
@@ -47,14 +126,23 @@ def get_template_data(template_file):
     Template data as a dictionary
     """
 
-    if not pathlib.Path(template_file).exists():
-        raise TemplateNotFoundException("Template file not found at {}".format(template_file))
+    return copy.deepcopy(_get_parsed_template(template_file))
 
-    with open(template_file, "r", encoding="utf-8") as fp:
-        try:
-            return yaml_parse(fp.read())
-        except (ValueError, yaml.YAMLError) as ex:
-            raise TemplateFailedParsingException("Failed to parse template: {}".format(str(ex))) from ex
+
+@functools.lru_cache(maxsize=None)
+def _compile_jmespath(expression: str):
+    return jmespath.compile(expression)
+
+
+@functools.lru_cache(maxsize=1)
+def _packageable_location_expressions() -> Dict[str, tuple]:
+    """
+    Returns the compiled jmespath expressions of the package-able locations of each package-able resource type
+    """
+    return {
+        resource_type: tuple(_compile_jmespath(location) for location in itertools.chain(*locations))
+        for resource_type, locations in get_packageable_resource_paths().items()
+    }
 
 
 def move_template(src_template_path, dest_template_path, template_dict):
@@ -180,7 +268,7 @@ def _update_relative_paths(template_dict, original_root, new_root):
                         continue
                     set_value_from_jmespath(properties, property_path, updated_path)
 
-            path = jmespath.search(path_prop_name, properties)
+            path = _compile_jmespath(path_prop_name).search(properties)
             updated_path = _resolve_relative_to(path, original_root, new_root)
 
             if not updated_path:
@@ -297,21 +385,20 @@ def get_template_artifacts_format(template_file):
     :return: list of artifact formats
     """
 
-    template_dict = get_template_data(template_file=template_file)
+    template_dict = _get_parsed_template(template_file)
 
-    # Get a list of Resources where the artifacts format matter for packaging.
-    packageable_resources = get_packageable_resource_paths()
+    # Get the package-able locations of the Resources where the artifacts format matter for packaging.
+    packageable_locations = _packageable_location_expressions()
 
     artifacts = []
     for _, resource in template_dict.get("Resources", {}).items():
         # First check if the resources are part of package-able resource types.
-        if resource.get("Type") in packageable_resources.keys():
-            # Flatten list of locations per resource type.
-            locations = list(itertools.chain(*packageable_resources.get(resource.get("Type"))))
+        locations: Optional[tuple] = packageable_locations.get(resource.get("Type"))
+        if locations:
+            properties = resource.get("Properties", {})
             for location in locations:
-                properties = resource.get("Properties", {})
                 # Search for package-able location within resource properties.
-                if jmespath.search(location, properties):
+                if location.search(properties):
                     artifacts.append(properties.get("PackageType", ZIP))
 
     return artifacts
@@ -328,7 +415,7 @@ def get_template_function_resource_ids(template_file, artifact):
     :return: list of artifact formats
     """
 
-    template_dict = get_template_data(template_file=template_file)
+    template_dict = _get_parsed_template(template_file)
     _function_resource_ids = []
     for resource_id, resource in template_dict.get("Resources", {}).items():
         if resource.get("Properties", {}).get("PackageType", ZIP) == artifact and resource.get("Type") in [
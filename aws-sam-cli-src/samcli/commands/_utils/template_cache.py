@@ -0,0 +1,160 @@
+"""
+On-disk cache of parsed templates, shared between invocations of the CLI
+
+Parsing a large template as YAML takes seconds, so when the cache is enabled (SAM_CLI_TEMPLATE_CACHE=1, see
+GlobalConfig.template_cache_enabled) the parsed templates are pickled under the SAM CLI config directory, keyed by the
+hash of their content and the version of the parser. An unchanged template is then loaded from the cache instead of
+being parsed again, by any command and from any directory.
+
+The cache cleans itself up after writing a template: entries which were not used for MAX_AGE_SECONDS are deleted, and
+then the least recently used entries until the cache is smaller than MAX_SIZE_BYTES.
+"""
+
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import yaml
+
+from samcli import __version__ as SAM_CLI_VERSION
+from samcli.cli.global_config import GlobalConfig
+
+LOG = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = "template-cache"
+CACHE_FILE_SUFFIX = ".pickle"
+
+MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+MAX_SIZE_BYTES = 256 * 1024 * 1024
+
+# The parsed template depends on the SAM CLI constructors of the intrinsics, on PyYAML and on the pickle format of the
+# interpreter, entries written by other versions of any of them are ignored
+PARSER_VERSION = "{}-{}-py{}.{}".format(SAM_CLI_VERSION, yaml.__version__, *sys.version_info[:2])
+
+# set once the cache was cleaned up by this process
+_CLEANED_UP = threading.Event()
+
+
+def is_template_cache_enabled() -> bool:
+    return GlobalConfig().template_cache_enabled
+
+
+def _cache_dir() -> Path:
+    return Path(GlobalConfig().config_dir, CACHE_DIR_NAME)
+
+
+def _cache_path(digest: str) -> Path:
+    return _cache_dir() / f"{digest}-{PARSER_VERSION}{CACHE_FILE_SUFFIX}"
+
+
+def load_template(digest: str) -> Optional[Any]:
+    """
+    Returns the parsed template cached for the content hash, or None when it is not cached
+
+    Parameters
+    ----------
+    digest: str
+        SHA-256 hash of the content of the template file
+
+    Returns
+    -------
+    Optional[Any]
+        The parsed template, or None
+    """
+    path = _cache_path(digest)
+    try:
+        with open(path, "rb") as cache_file:
+            # the cache is in the config directory of the user, which is only writable by the user, like the
+            # metadata.json and the samconfig files the CLI already trusts
+            template_dict = pickle.load(cache_file)  # nosec B301
+    except FileNotFoundError:
+        return None
+    except Exception as ex:  # pylint: disable=broad-except
+        LOG.debug("Ignoring unreadable cached template %s", path, exc_info=ex)
+        _remove(path)
+        return None
+
+    try:
+        # the modification time of an entry is its last use, which the clean up relies on
+        os.utime(path)
+    except OSError:
+        pass
+    LOG.debug("Loaded parsed template from cache %s", path)
+    return template_dict
+
+
+def store_template(digest: str, template_dict: Any) -> None:
+    """
+    Caches the parsed template for the content hash, then cleans the cache up once per process. Errors are logged
+    and ignored, the cache is only an optimization.
+
+    Parameters
+    ----------
+    digest: str
+        SHA-256 hash of the content of the template file
+    template_dict: Any
+        The parsed template
+    """
+    path = _cache_path(digest)
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # written to a temporary file first, so that concurrent invocations never read a partial entry
+        file_descriptor, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as cache_file:
+                pickle.dump(template_dict, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except BaseException:
+            _remove(Path(temp_path))
+            raise
+    except Exception as ex:  # pylint: disable=broad-except
+        LOG.debug("Unable to cache the parsed template in %s", path, exc_info=ex)
+        return
+
+    if not _CLEANED_UP.is_set():
+        # threads storing templates at the same time may both clean up, which only deletes the same entries twice
+        _CLEANED_UP.set()
+        clean_up()
+
+
+def clean_up(max_age: float = MAX_AGE_SECONDS, max_size: int = MAX_SIZE_BYTES) -> None:
+    """
+    Deletes the entries which were not used for max_age seconds, then the least recently used entries until the cache
+    is smaller than max_size bytes. Temporary files left by interrupted writes are deleted after max_age as well.
+    """
+    try:
+        candidates = list(_cache_dir().iterdir())
+    except OSError:
+        return
+
+    now = time.time()
+    entries: List[Tuple[float, int, Path]] = []
+    for path in candidates:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        if now - stat.st_mtime > max_age:
+            _remove(path)
+        elif path.name.endswith(CACHE_FILE_SUFFIX):
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total_size <= max_size:
+            break
+        _remove(path)
+        total_size -= size
+
+
+def _remove(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
@@ -0,0 +1,424 @@
+"""
+Delete several SAM stacks at once
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import click
+from botocore.exceptions import BotoCoreError, ClientError
+
+from samcli.commands.delete.delete_context import TEMPLATE_STAGE, create_delete_clients
+from samcli.commands.delete.exceptions import DeleteFailedError
+from samcli.commands.exceptions import UserException
+from samcli.lib.bootstrap.companion_stack.companion_stack_builder import CompanionStack
+from samcli.lib.delete.cfn_utils import CfnUtils
+from samcli.lib.package.artifact_exporter import Template
+from samcli.lib.package.ecr_uploader import ECRUploader
+from samcli.lib.package.local_files_utils import get_uploaded_s3_object_name
+from samcli.lib.package.s3_uploader import S3Uploader
+from samcli.lib.package.uploaders import Uploaders
+
+LOG = logging.getLogger(__name__)
+
+# Maximum number of keys of a S3 DeleteObjects call
+S3_DELETE_OBJECTS_BATCH_SIZE = 1000
+# Maximum number of images of an ECR BatchDeleteImage call
+ECR_BATCH_DELETE_IMAGE_BATCH_SIZE = 100
+
+DEFAULT_MAX_WORKERS = 8
+
+# The stacks being deleted are all polled in the same loop, with this delay between two rounds
+STACK_POLL_DELAY_SECONDS = 5
+STACK_DELETE_TIMEOUT_SECONDS = 60 * 60
+
+DELETE_COMPLETE = "DELETE_COMPLETE"
+DELETE_FAILED = "DELETE_FAILED"
+
+
+class _ArtifactBatches:
+    """
+    S3 objects and ECR images to delete, collected from the templates of all the stacks, so that they are deleted
+    with as few calls as possible
+    """
+
+    def __init__(self) -> None:
+        self.s3_objects: Dict[str, Set[str]] = {}
+        self.ecr_images: Dict[str, Set[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def add_s3_object(self, bucket: str, key: str) -> None:
+        with self._lock:
+            self.s3_objects.setdefault(bucket, set()).add(key)
+
+    def add_ecr_image(self, image_uri: str) -> None:
+        image = _parse_image_uri(image_uri)
+        if not image:
+            LOG.debug("Ignoring the image %s, which is not in an ECR repository", image_uri)
+            return
+        repository, image_id = image
+        with self._lock:
+            self.ecr_images.setdefault(repository, set()).add(image_id)
+
+
+def _parse_image_uri(image_uri: str) -> Optional[Tuple[str, Tuple[str, str]]]:
+    """
+    Returns the repository name and the (imageTag or imageDigest, value) image id of an ECR image URI
+    """
+    if not isinstance(image_uri, str) or "/" not in image_uri:
+        return None
+    repository_and_reference = image_uri.split("/", 1)[1]
+    if "@" in repository_and_reference:
+        repository, digest = repository_and_reference.split("@", 1)
+        return repository, ("imageDigest", digest)
+    if ":" in repository_and_reference:
+        repository, tag = repository_and_reference.rsplit(":", 1)
+        return repository, ("imageTag", tag)
+    return repository_and_reference, ("imageTag", "latest")
+
+
+def _chunks(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[index : index + size] for index in range(0, len(items), size)]
+
+
+class _BatchingS3Uploader(S3Uploader):
+    """
+    S3Uploader which collects the objects to delete instead of deleting them one at a time
+    """
+
+    def __init__(self, batches: _ArtifactBatches, **kwargs):
+        super().__init__(**kwargs)
+        self._batches = batches
+
+    def delete_artifact(self, remote_path: str, is_key: bool = False) -> bool:
+        if not self.bucket_name:
+            LOG.debug("Not deleting %s, the S3 bucket of the stack is unknown", remote_path)
+            return False
+        key = remote_path if is_key or not self.prefix else f"{self.prefix}/{remote_path}"
+        self._batches.add_s3_object(self.bucket_name, key)
+        return True
+
+
+class _BatchingECRUploader(ECRUploader):
+    """
+    ECRUploader which collects the images to delete instead of deleting them one at a time
+    """
+
+    def __init__(self, batches: _ArtifactBatches, **kwargs):
+        super().__init__(**kwargs)
+        self._batches = batches
+
+    def delete_artifact(self, image_uri: str, resource_id: str, property_name: str):
+        LOG.debug("Collecting image %s of %s.%s for deletion", image_uri, resource_id, property_name)
+        self._batches.add_ecr_image(image_uri)
+
+
+class BulkDeleteContext:
+    """
+    Deletes several stacks, their companion stacks and their artifacts. The command confirms the deletion beforehand,
+    the context itself never prompts.
+
+    The templates of the stacks are processed concurrently, and their S3 objects and ECR images are collected and
+    deleted in batches (S3 DeleteObjects and ECR BatchDeleteImage calls) once all the templates are processed. The
+    stacks are then all deleted at once, and polled in a single loop until they are deleted.
+    """
+
+    def __init__(
+        self,
+        stack_names: List[str],
+        region: Optional[str],
+        profile: Optional[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        # keeps the order of the stack names, without duplicates
+        self.stack_names = list(dict.fromkeys(stack_names))
+        self.region = region
+        self.profile = profile
+        self.max_workers = max_workers
+        self.cloudformation_client: Any = None
+        self.s3_client: Any = None
+        self.ecr_client: Any = None
+        self.cf_utils: Any = None
+        self._batches = _ArtifactBatches()
+
+    def __enter__(self):
+        self.cloudformation_client, self.s3_client, self.ecr_client = create_delete_clients(self.region, self.profile)
+        self.cf_utils = CfnUtils(self.cloudformation_client)
+        self.region = self.region or self.cloudformation_client.meta.config.region_name
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def run(self):
+        """
+        Deletes the stacks, and raises DeleteFailedError if some of them could not be deleted
+        """
+        failed: Dict[str, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self._collect_stack, self.stack_names))
+
+        stacks_to_delete: List[str] = []
+        for stack_name, (stacks, error) in zip(self.stack_names, results):
+            if error:
+                failed[stack_name] = error
+            stacks_to_delete.extend(stacks)
+
+        self._delete_s3_objects()
+        self._delete_ecr_images()
+
+        failed.update(self._delete_stacks(stacks_to_delete))
+
+        deleted = [stack_name for stack_name in stacks_to_delete if stack_name not in failed]
+        click.echo(f"\nDeleted {len(deleted)} stack(s) in the region {self.region}")
+        if failed:
+            for stack_name, reason in failed.items():
+                click.secho(f"\tFailed to delete {stack_name}: {reason}", fg="red")
+            raise DeleteFailedError(stack_name=", ".join(failed), msg="Some stacks could not be deleted")
+
+    def _collect_stack(self, stack_name: str) -> Tuple[List[str], Optional[str]]:
+        """
+        Collects the artifacts of the stack and of its ECR companion stack, and deletes the ECR repositories of the
+        companion stack
+
+        Returns
+        -------
+        Tuple[List[str], Optional[str]]
+            The names of the stacks to delete (none if the stack does not exist), and the reason why the stack can't
+            be deleted, if it can't
+        """
+        try:
+            if not self.cf_utils.can_delete_stack(stack_name=stack_name):
+                LOG.debug("Input stack %s does not exists on Cloudformation", stack_name)
+                click.echo(
+                    f"Error: The input stack {stack_name} does not exist on Cloudformation in the region {self.region}"
+                )
+                return [], None
+
+            cf_template = self.cf_utils.get_stack_template(stack_name, TEMPLATE_STAGE)
+            s3_uploader = _BatchingS3Uploader(self._batches, s3_client=self.s3_client, bucket_name=None, prefix=None)
+            template = self._template(cf_template, s3_uploader)
+
+            s3_info = template.get_s3_info()
+            s3_uploader.bucket_name = s3_info["s3_bucket"]
+            s3_uploader.prefix = s3_info["s3_prefix"]
+
+            template.delete(retain_resources=[])
+            if s3_uploader.bucket_name and s3_uploader.prefix:
+                s3_uploader.delete_prefix_artifacts()
+            elif s3_uploader.bucket_name:
+                s3_uploader.delete_artifact(
+                    remote_path=get_uploaded_s3_object_name(file_content=cf_template, extension="template")
+                )
+            else:
+                LOG.debug("Cannot delete the s3 objects of %s as its bucket is unknown", stack_name)
+
+            stacks = [stack_name]
+            companion_stack_name = CompanionStack(stack_name).stack_name
+            if self.cf_utils.can_delete_stack(stack_name=companion_stack_name):
+                click.echo(f"\tFound ECR Companion Stack {companion_stack_name}")
+                companion_template = self._template(
+                    self.cf_utils.get_stack_template(companion_stack_name, TEMPLATE_STAGE),
+                    _BatchingS3Uploader(self._batches, s3_client=self.s3_client, bucket_name=None, prefix=None),
+                )
+                # deletes the repositories of the companion stack, with their images
+                companion_template.delete(retain_resources=[])
+                stacks.append(companion_stack_name)
+            return stacks, None
+        except (UserException, ClientError, BotoCoreError) as ex:
+            # e.g. the S3 bucket of the stack is missing or denied, only this stack fails
+            LOG.debug("Unable to delete the artifacts of %s", stack_name, exc_info=ex)
+            return [], str(ex)
+
+    def _template(self, template_str: str, s3_uploader: S3Uploader) -> Template:
+        ecr_uploader = _BatchingECRUploader(
+            self._batches, docker_client=None, ecr_client=self.ecr_client, ecr_repo=None, ecr_repo_multi=None
+        )
+        return Template(
+            template_path=None,
+            parent_dir=None,
+            uploaders=Uploaders(s3_uploader, ecr_uploader),
+            code_signer=None,
+            template_str=template_str,
+        )
+
+    def _delete_s3_objects(self) -> None:
+        batches = [
+            (bucket, keys)
+            for bucket, bucket_keys in self._batches.s3_objects.items()
+            for keys in _chunks(sorted(bucket_keys), S3_DELETE_OBJECTS_BATCH_SIZE)
+        ]
+        if not batches:
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(lambda batch: self._delete_s3_batch(*batch), batches))
+
+    def _delete_s3_batch(self, bucket: str, keys: List[str]) -> None:
+        click.echo(f"\t- Deleting {len(keys)} S3 object(s) in the bucket {bucket}")
+        try:
+            response = self.s3_client.delete_objects(
+                Bucket=bucket, Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True}
+            )
+        except ClientError as ex:
+            click.secho(f"\tUnable to delete S3 objects in the bucket {bucket}: {ex}", fg="yellow")
+            return
+        for error in response.get("Errors", []):
+            click.secho(
+                f"\tUnable to delete the S3 object {error.get('Key')}: {error.get('Message')}",
+                fg="yellow",
+            )
+
+    def _delete_ecr_images(self) -> None:
+        batches = [
+            (repository, image_ids)
+            for repository, repository_image_ids in self._batches.ecr_images.items()
+            for image_ids in _chunks(sorted(repository_image_ids), ECR_BATCH_DELETE_IMAGE_BATCH_SIZE)
+        ]
+        if not batches:
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(lambda batch: self._delete_ecr_batch(*batch), batches))
+
+    def _delete_ecr_batch(self, repository: str, image_ids: List[Tuple[str, str]]) -> None:
+        click.echo(f"\t- Deleting {len(image_ids)} ECR image(s) in the repository {repository}")
+        try:
+            response = self.ecr_client.batch_delete_image(
+                repositoryName=repository, imageIds=[{kind: value} for kind, value in image_ids]
+            )
+        except ClientError as ex:
+            if ex.response.get("Error", {}).get("Code") == "RepositoryNotFoundException":
+                # deleted with the companion stack repositories
+                LOG.debug("The ECR repository %s is already deleted", repository)
+                return
+            click.secho(f"\tUnable to delete ECR images in the repository {repository}: {ex}", fg="yellow")
+            return
+        for failure in response.get("failures", []):
+            if failure.get("failureCode") == "ImageNotFound":
+                continue
+            click.secho(
+                f"\tUnable to delete the ECR image {failure.get('imageId')} in the repository {repository}: "
+                f"{failure.get('failureReason')}",
+                fg="yellow",
+            )
+
+    def _delete_stacks(self, stack_names: List[str]) -> Dict[str, str]:
+        """
+        Deletes the stacks and waits for all of them. The stacks which failed to delete are deleted once more, retaining
+        the resources which failed to delete, like the single stack deletion retains the ECR repositories.
+
+        Returns
+        -------
+        Dict[str, str]
+            The reason why each stack that could not be deleted failed
+        """
+        failed = self._delete_and_wait(stack_names)
+        retried = [stack_name for stack_name, status in failed.items() if status == DELETE_FAILED]
+        if retried:
+            LOG.debug("delete_stack resulted failed for %s and so re-try with retain_resources", retried)
+            retain_resources: Dict[str, List[str]] = {}
+            for stack_name in retried:
+                failed.pop(stack_name)
+                retain_resources[stack_name] = self._failed_resources(stack_name)
+                if retain_resources[stack_name]:
+                    click.secho(
+                        f"\tRetaining the resources of {stack_name} which could not be deleted: "
+                        f"{', '.join(retain_resources[stack_name])}",
+                        fg="yellow",
+                    )
+            failed.update(self._delete_and_wait(retried, retain_resources))
+        return {
+            stack_name: (f"status {reason}" if reason == DELETE_FAILED else reason)
+            for stack_name, reason in failed.items()
+        }
+
+    def _failed_resources(self, stack_name: str) -> List[str]:
+        """
+        Returns the logical ids of the resources of the stack which failed to delete
+        """
+        try:
+            paginator = self.cloudformation_client.get_paginator("list_stack_resources")
+            return [
+                resource["LogicalResourceId"]
+                for page in paginator.paginate(StackName=stack_name)
+                for resource in page.get("StackResourceSummaries", [])
+                if resource.get("ResourceStatus") == DELETE_FAILED
+            ]
+        except (ClientError, BotoCoreError) as ex:
+            LOG.debug("Unable to list the resources of %s", stack_name, exc_info=ex)
+            return []
+
+    def _delete_and_wait(
+        self, stack_names: List[str], retain_resources: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, str]:
+        stack_ids: Dict[str, str] = {}
+        failed: Dict[str, str] = {}
+        for stack_name in stack_names:
+            try:
+                # the stack id still describes the stack once it is deleted, unlike its name
+                stack_ids[stack_name] = self.cloudformation_client.describe_stacks(StackName=stack_name)["Stacks"][0][
+                    "StackId"
+                ]
+                click.echo(f"\t- Deleting Cloudformation stack {stack_name}")
+                self.cf_utils.delete_stack(
+                    stack_name=stack_name, retain_resources=(retain_resources or {}).get(stack_name)
+                )
+            except (ClientError, BotoCoreError, UserException) as ex:
+                LOG.debug("Unable to delete the stack %s", stack_name, exc_info=ex)
+                stack_ids.pop(stack_name, None)
+                failed[stack_name] = str(ex)
+        failed.update(self._wait_for_deletes(stack_ids))
+        return failed
+
+    def _wait_for_deletes(self, stack_ids: Dict[str, str]) -> Dict[str, str]:
+        """
+        Polls all the stacks being deleted in the same loop, until they are deleted, fail or the timeout is reached
+
+        Returns
+        -------
+        Dict[str, str]
+            The status of the stacks which failed to delete
+        """
+        pending = dict(stack_ids)
+        failed: Dict[str, str] = {}
+        poll_errors: Dict[str, str] = {}
+        deadline = time.monotonic() + STACK_DELETE_TIMEOUT_SECONDS
+        while pending:
+            for stack_name, stack_id in list(pending.items()):
+                try:
+                    status = self._stack_status(stack_id)
+                except (ClientError, BotoCoreError) as ex:
+                    # e.g. throttling or a network error, the stack is polled again in the next round
+                    LOG.debug("Failed to get the status of the stack %s, retrying", stack_name, exc_info=ex)
+                    poll_errors[stack_name] = str(ex)
+                    continue
+                poll_errors.pop(stack_name, None)
+                if status in (None, DELETE_COMPLETE):
+                    LOG.debug("Deleted Cloudformation stack: %s", stack_name)
+                    del pending[stack_name]
+                elif status == DELETE_FAILED:
+                    del pending[stack_name]
+                    failed[stack_name] = status
+            if not pending:
+                break
+            if time.monotonic() > deadline:
+                for stack_name in pending:
+                    reason = "timed out waiting for the deletion"
+                    if stack_name in poll_errors:
+                        reason += f", the last status check failed: {poll_errors[stack_name]}"
+                    failed[stack_name] = reason
+                break
+            time.sleep(STACK_POLL_DELAY_SECONDS)
+        return failed
+
+    def _stack_status(self, stack_id: str) -> Optional[str]:
+        try:
+            stacks = self.cloudformation_client.describe_stacks(StackName=stack_id).get("Stacks", [])
+        except ClientError as ex:
+            if "does not exist" in str(ex):
+                return None
+            raise
+        return stacks[0]["StackStatus"] if stacks else None
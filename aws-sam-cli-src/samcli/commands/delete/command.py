@@ -3,9 +3,10 @@ CLI command for "delete" command
 """
 
 import logging
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import click
+from click.core import ParameterSource
 
 from samcli.cli.cli_config_file import ConfigProvider, configuration_option, save_params_option
 from samcli.cli.main import aws_creds_options, common_options, pass_context, print_cmdline_args
@@ -35,6 +36,14 @@ LOG = logging.getLogger(__name__)
     required=False,
     help="The name of the AWS CloudFormation stack you want to delete. ",
 )
+@click.option(
+    "--stack-names",
+    multiple=True,
+    required=False,
+    help="The names of several AWS CloudFormation stacks to delete at once, along with their artifacts. "
+    "Repeat the option for each stack. SAM CLI asks once to confirm the deletion of all the stacks, unless "
+    "--no-prompts is specified, and reads the S3 bucket and prefix of each stack from its template.",
+)
 @click.option(
     "--no-prompts",
     help=("Specify this flag to allow SAM CLI to skip through the guided prompts."),
@@ -66,6 +75,7 @@ LOG = logging.getLogger(__name__)
 def cli(
     ctx,
     stack_name: str,
+    stack_names: Tuple[str, ...],
     no_prompts: bool,
     s3_bucket: str,
     s3_prefix: str,
@@ -77,6 +87,12 @@ def cli(
     `sam delete` command entry point
     """
 
+    if stack_names and click.get_current_context().get_parameter_source("stack_name") == ParameterSource.COMMANDLINE:
+        raise click.BadOptionUsage(
+            option_name="--stack-names",
+            message="Provide either --stack-name or --stack-names, not both.",
+        )
+
     # All logic must be implemented in the ``do_cli`` method. This helps with easy unit testing
     do_cli(
         stack_name=stack_name,
@@ -85,6 +101,7 @@ def cli(
         no_prompts=no_prompts,
         s3_bucket=s3_bucket,
         s3_prefix=s3_prefix,
+        stack_names=stack_names,
     )  # pragma: no cover
 
 
@@ -95,10 +112,16 @@ def do_cli(
     no_prompts: bool,
     s3_bucket: Optional[str],
     s3_prefix: Optional[str],
+    stack_names: Tuple[str, ...] = (),
 ):
     """
     Implementation of the ``cli`` method
     """
+    if stack_names:
+        # the stack name, S3 bucket and prefix read from the config file belong to the deployed stack, not to these
+        _bulk_delete(list(stack_names), region, profile, no_prompts)
+        return
+
     from samcli.commands.delete.delete_context import DeleteContext
 
     with DeleteContext(
@@ -110,3 +133,23 @@ def do_cli(
         s3_prefix=s3_prefix,
     ) as delete_context:
         delete_context.run()
+
+
+def _bulk_delete(stack_names: List[str], region: str, profile: str, no_prompts: bool):
+    from samcli.commands.delete.bulk_delete_context import BulkDeleteContext
+
+    if not no_prompts:
+        in_region = f" in the region {region}" if region else ""
+        delete_stacks = click.confirm(
+            click.style(
+                f"\tAre you sure you want to delete the stacks {', '.join(stack_names)}{in_region}"
+                " and their artifacts ?",
+                bold=True,
+            ),
+            default=False,
+        )
+        if not delete_stacks:
+            return
+
+    with BulkDeleteContext(stack_names=stack_names, region=region, profile=profile) as bulk_delete_context:
+        bulk_delete_context.run()
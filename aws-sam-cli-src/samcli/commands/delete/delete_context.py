@@ -3,7 +3,7 @@ Delete a SAM stack
 """
 
 import logging
-from typing import Optional
+from typing import Any, Optional, Tuple
 
 import click
 from botocore.exceptions import NoCredentialsError, NoRegionError
@@ -27,6 +27,33 @@ TEMPLATE_STAGE = "Original"
 LOG = logging.getLogger(__name__)
 
 
+def create_delete_clients(region: Optional[str], profile: Optional[str]) -> Tuple[Any, Any, Any]:
+    """
+    Creates the CloudFormation, S3 and ECR clients used by sam delete
+
+    Returns
+    -------
+    Tuple[Any, Any, Any]
+        The CloudFormation, S3 and ECR clients
+    """
+    client_provider = get_boto_client_provider_with_config(region=region, profile=profile)
+
+    try:
+        return client_provider("cloudformation"), client_provider("s3"), client_provider("ecr")
+    except NoCredentialsError as ex:
+        raise AWSServiceClientError(
+            "Unable to resolve credentials for the AWS SDK for Python client. "
+            "Please see their documentation for options to pass in credentials: "
+            "https://boto3.amazonaws.com/v1/documentation/api/latest/guide/configuration.html"
+        ) from ex
+    except NoRegionError as ex:
+        raise RegionError(
+            "Unable to resolve a region. "
+            "Please provide a region via the --region, via --profile or by the "
+            "AWS_DEFAULT_REGION environment variable."
+        ) from ex
+
+
 class DeleteContext:
     # TODO: Separate this context into 2 separate contexts guided and non-guided, just like deploy.
     def __init__(
@@ -76,24 +103,7 @@ class DeleteContext:
         """
         Initialize all the clients being used by sam delete.
         """
-        client_provider = get_boto_client_provider_with_config(region=self.region, profile=self.profile)
-
-        try:
-            cloudformation_client = client_provider("cloudformation")
-            s3_client = client_provider("s3")
-            ecr_client = client_provider("ecr")
-        except NoCredentialsError as ex:
-            raise AWSServiceClientError(
-                "Unable to resolve credentials for the AWS SDK for Python client. "
-                "Please see their documentation for options to pass in credentials: "
-                "https://boto3.amazonaws.com/v1/documentation/api/latest/guide/configuration.html"
-            ) from ex
-        except NoRegionError as ex:
-            raise RegionError(
-                "Unable to resolve a region. "
-                "Please provide a region via the --region, via --profile or by the "
-                "AWS_DEFAULT_REGION environment variable."
-            ) from ex
+        cloudformation_client, s3_client, ecr_client = create_delete_clients(self.region, self.profile)
 
         self.s3_uploader = S3Uploader(s3_client=s3_client, bucket_name=self.s3_bucket, prefix=self.s3_prefix)
         self.ecr_uploader = ECRUploader(docker_client=None, ecr_client=ecr_client, ecr_repo=None, ecr_repo_multi=None)
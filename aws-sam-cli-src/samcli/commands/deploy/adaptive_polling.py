@@ -0,0 +1,256 @@
+"""
+Adaptive polling of the CloudFormation stacks being deployed
+
+The deployer waits for its changeset every poll_delay seconds. While the changeset executes, it polls the stack
+events after sleeping its client_sleep, which fast_event_polls lowers to the shortest delay of the
+AdaptiveStackPoller. The poller hooks into the CloudFormation client, so that the stack event polls are paced:
+
+* the first polls of a stack, and the polls following new stack events, are faster than poll_delay
+* the delay between polls then grows past poll_delay while no new events show up, e.g. during long resource operations
+* the delays are jittered, so that concurrent deployments do not poll in lockstep
+
+All the CloudFormation calls of the process also go through a shared rate limiter, so that deploying several stacks
+at once does not get throttled. Its rate is configured with the SAM_CLI_CLOUDFORMATION_CALLS_PER_SECOND and
+SAM_CLI_CLOUDFORMATION_CALLS_BURST environment variables. The poller only relies on the botocore events of the client,
+so it can be exercised against a stubbed client (botocore Stubber or a local CloudFormation endpoint), with a fake
+clock and sleep.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+LOG = logging.getLogger(__name__)
+
+# The CloudFormation calls of the process are limited to this rate, with bursts of up to CALLS_BURST calls
+CALLS_PER_SECOND = 4.0
+CALLS_BURST = 8
+CALLS_PER_SECOND_ENV_VAR = "SAM_CLI_CLOUDFORMATION_CALLS_PER_SECOND"
+CALLS_BURST_ENV_VAR = "SAM_CLI_CLOUDFORMATION_CALLS_BURST"
+
+# The delay between polls starts at poll_delay / FAST_DELAY_DIVISOR and grows up to poll_delay * MAX_DELAY_MULTIPLIER
+FAST_DELAY_DIVISOR = 5
+MAX_DELAY_MULTIPLIER = 4
+BACKOFF_FACTOR = 1.5
+# Each delay is randomly lengthened by up to this ratio, the deployer already sleeps poll_delay between polls
+JITTER_RATIO = 0.2
+
+POLLED_OPERATION = "DescribeStackEvents"
+POLL_PARAMS_CONTEXT_KEY = "sam_cli_poll_params"
+
+
+class RateLimiter:
+    """
+    Token bucket shared by threads: acquire blocks until a call is allowed. Calls are granted in order, a call which
+    has to wait reserves its token so that later calls wait behind it.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Waits until a call is allowed
+
+        Returns
+        -------
+        float
+            The time waited, in seconds
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            LOG.debug("Waiting %.2fs before calling CloudFormation, to stay within %s calls/s", wait, self.rate)
+            self._sleep(wait)
+        return wait
+
+
+def _positive_env_value(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        parsed = float(value)
+    except ValueError:
+        parsed = 0
+    if parsed <= 0:
+        LOG.warning("Ignoring %s=%s, it is not a positive number, using %s", name, value, default)
+        return default
+    return parsed
+
+
+def rate_limiter_from_environment() -> RateLimiter:
+    """
+    Returns a rate limiter of the CloudFormation calls, configured by the SAM_CLI_CLOUDFORMATION_CALLS_PER_SECOND and
+    SAM_CLI_CLOUDFORMATION_CALLS_BURST environment variables
+    """
+    rate = _positive_env_value(CALLS_PER_SECOND_ENV_VAR, CALLS_PER_SECOND)
+    burst = max(1, int(_positive_env_value(CALLS_BURST_ENV_VAR, CALLS_BURST)))
+    return RateLimiter(rate, burst)
+
+
+SHARED_CLOUDFORMATION_RATE_LIMITER = rate_limiter_from_environment()
+
+
+class AdaptivePollSchedule:
+    """
+    Delays between the polls of a stack: starting at min_delay, multiplied by the backoff factor after each poll
+    which did not find new events, up to max_delay, and back to min_delay when new events show up
+    """
+
+    def __init__(
+        self,
+        min_delay: float,
+        max_delay: float,
+        backoff: float = BACKOFF_FACTOR,
+        jitter: float = JITTER_RATIO,
+        random_source: Callable[[], float] = random.random,
+    ):
+        self.min_delay = min_delay
+        self.max_delay = max(min_delay, max_delay)
+        self.backoff = backoff
+        self.jitter = jitter
+        self._random_source = random_source
+        self._delay = min_delay
+
+    def next_delay(self) -> float:
+        """
+        Returns the jittered delay before the next poll, and backs off the delay of the following one
+        """
+        delay = self._delay * (1 + self.jitter * self._random_source())
+        self._delay = min(self.max_delay, self._delay * self.backoff)
+        return delay
+
+    def reset(self) -> None:
+        self._delay = self.min_delay
+
+
+class _StackPolls:
+    def __init__(self, schedule: AdaptivePollSchedule):
+        self.schedule = schedule
+        self.last_poll: Optional[float] = None
+        self.latest_event_id: Optional[str] = None
+
+
+class AdaptiveStackPoller:
+    """
+    Paces the stack event polls of a CloudFormation client, and rate limits all its calls
+    """
+
+    def __init__(
+        self,
+        poll_delay: float,
+        rate_limiter: Optional[RateLimiter] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        random_source: Callable[[], float] = random.random,
+    ):
+        """
+        Parameters
+        ----------
+        poll_delay: float
+            The configured delay between polls (SAM_CLI_POLL_DELAY), the delays start below it and grow past it
+        rate_limiter: Optional[RateLimiter]
+            The rate limiter of the calls, shared by the whole process by default
+        clock, sleep, random_source
+            Time and randomness sources, which tests can replace
+        """
+        self.min_delay = poll_delay / FAST_DELAY_DIVISOR
+        self.max_delay = poll_delay * MAX_DELAY_MULTIPLIER
+        self._rate_limiter = rate_limiter or SHARED_CLOUDFORMATION_RATE_LIMITER
+        self._clock = clock
+        self._sleep = sleep
+        self._random_source = random_source
+        self._stacks: Dict[str, _StackPolls] = {}
+        self._lock = threading.Lock()
+
+    def register(self, client: Any) -> Any:
+        """
+        Hooks the poller into the CloudFormation client, and returns the client
+        """
+        client.meta.events.register("before-parameter-build.cloudformation", self._before_call)
+        client.meta.events.register(f"after-call.cloudformation.{POLLED_OPERATION}", self._after_poll)
+        return client
+
+    def _stack(self, stack_name: str) -> _StackPolls:
+        with self._lock:
+            stack = self._stacks.get(stack_name)
+            if stack is None:
+                stack = _StackPolls(
+                    AdaptivePollSchedule(self.min_delay, self.max_delay, random_source=self._random_source)
+                )
+                self._stacks[stack_name] = stack
+            return stack
+
+    def _before_call(self, model: Any, params: Dict, context: Optional[Dict] = None, **kwargs) -> None:
+        if model.name == POLLED_OPERATION:
+            if context is not None:
+                # the parameters of the call are not part of the after-call event
+                context[POLL_PARAMS_CONTEXT_KEY] = dict(params)
+            # the following pages of a poll are fetched right away
+            if params.get("StackName") and not params.get("NextToken"):
+                self._pace(self._stack(params["StackName"]))
+        self._rate_limiter.acquire()
+
+    def _pace(self, stack: _StackPolls) -> None:
+        delay = stack.schedule.next_delay()
+        now = self._clock()
+        if stack.last_poll is not None:
+            # the deployer sleeps between polls as well, only the rest of the delay is waited here
+            wait = stack.last_poll + delay - now
+            if wait > 0:
+                self._sleep(wait)
+                now += wait
+        stack.last_poll = now
+
+    def _after_poll(self, model: Any, parsed: Dict, context: Optional[Dict] = None, **kwargs) -> None:
+        params = (context or {}).get(POLL_PARAMS_CONTEXT_KEY)
+        stack_name = params.get("StackName") if params else None
+        events = parsed.get("StackEvents") if isinstance(parsed, dict) else None
+        if not stack_name or not events or params.get("NextToken"):
+            return
+        stack = self._stack(stack_name)
+        latest_event_id = events[0].get("EventId")
+        if latest_event_id != stack.latest_event_id:
+            if stack.latest_event_id is not None:
+                LOG.debug("New events for stack %s, polling faster", stack_name)
+            stack.latest_event_id = latest_event_id
+            stack.schedule.reset()
+
+
+@contextmanager
+def fast_event_polls(deployer: Any, poller: Optional[AdaptiveStackPoller]) -> Iterator[None]:
+    """
+    Lowers the sleep of the deployer before each stack event poll to the shortest delay of the poller, which waits
+    the rest of the delay. The changeset waiter of the deployer also uses its client_sleep, so the deployer is only
+    sped up while the changeset executes. Without a poller, the deployer keeps its sleep.
+    """
+    if poller is None:
+        yield
+        return
+    client_sleep = deployer.client_sleep
+    deployer.client_sleep = poller.min_delay
+    try:
+        yield
+    finally:
+        deployer.client_sleep = client_sleep
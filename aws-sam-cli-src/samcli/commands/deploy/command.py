@@ -4,8 +4,10 @@ CLI command for "deploy" command
 
 import logging
 import os
+from functools import wraps
 
 import click
+from click.core import ParameterSource
 
 from samcli.cli.cli_config_file import ConfigProvider, configuration_option, save_params_option
 from samcli.cli.main import aws_creds_options, common_options, pass_context, print_cmdline_args
@@ -36,11 +38,7 @@ from samcli.commands._utils.options import (
 )
 from samcli.commands.deploy.core.command import DeployCommand
 from samcli.commands.deploy.utils import sanitize_parameter_overrides
-from samcli.lib.bootstrap.bootstrap import manage_stack, print_managed_s3_bucket_info
-from samcli.lib.bootstrap.companion_stack.companion_stack_manager import sync_ecr_stack
-from samcli.lib.cli_validation.image_repository_validation import image_repository_validation
 from samcli.lib.telemetry.metric import track_command
-from samcli.lib.utils import osutils
 from samcli.lib.utils.version_checker import check_newer_version
 
 SHORT_HELP = "Deploy an AWS SAM application."
@@ -56,12 +54,39 @@ DESCRIPTION = """
   
   Set SAM_CLI_POLL_DELAY Environment Variable with a value of seconds in your shell to configure 
   how often SAM CLI checks the Stack state, which is useful when seeing throttling from CloudFormation.
+  SAM CLI checks more often while the Stack has new events, and less often while it has none, e.g. during
+  long resource operations. Set SAM_CLI_CLOUDFORMATION_CALLS_PER_SECOND and SAM_CLI_CLOUDFORMATION_CALLS_BURST
+  to configure the rate of the CloudFormation calls, 4 calls per second with bursts of 8 by default.
+
+  To deploy several stacks at once, list them in a file passed with --stacks-file. Stacks which do not depend
+  on each other's outputs are deployed concurrently, up to --max-concurrent-deploys at a time.
 """
 
 CONFIG_SECTION = "parameters"
+DEFAULT_MAX_CONCURRENT_DEPLOYS = 4
 LOG = logging.getLogger(__name__)
 
 
+def _image_repository_validation(func):
+    """
+    Validates the image repository options against the template, unless the stacks of a --stacks-file are deployed:
+    MultiStackDeployContext validates them against the template of each stack.
+
+    The validation parses the template, so it is only imported when the command runs, not to print its help.
+    """
+
+    @wraps(func)
+    def wrapped(*args, **kwargs):
+        if click.get_current_context().params.get("stacks_file"):
+            return func(*args, **kwargs)
+
+        from samcli.lib.cli_validation.image_repository_validation import image_repository_validation
+
+        return image_repository_validation()(func)(*args, **kwargs)
+
+    return wrapped
+
+
 @click.command(
     "deploy",
     short_help=SHORT_HELP,
@@ -85,6 +110,15 @@ LOG = logging.getLogger(__name__)
     is_eager=True,
     help="Specify this flag to allow SAM CLI to guide you through the deployment using guided prompts.",
 )
+@click.option(
+    "--stacks-file",
+    required=False,
+    is_eager=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="YAML or JSON file listing the stacks to deploy, with their template file, parameter overrides and the "
+    "stacks they depend on. The stacks are deployed in dependency order, independent stacks concurrently. "
+    "The other options apply to every stack.",
+)
 @template_click_option(include_build=True)
 @click.option(
     "--no-execute-changeset",
@@ -141,6 +175,14 @@ LOG = logging.getLogger(__name__)
     type=int,
     help="Maximum duration in minutes to wait for the deployment to complete.",
 )
+@click.option(
+    "--max-concurrent-deploys",
+    default=DEFAULT_MAX_CONCURRENT_DEPLOYS,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Maximum number of stacks of the --stacks-file deployed at the same time. The stack event tables of the "
+    "stacks deployed at the same time are interleaved, use 1 to keep them apart.",
+)
 @stack_name_option(callback=guided_deploy_stack_name)  # pylint: disable=E1120
 @s3_bucket_option(disable_callback=True)  # pylint: disable=E1120
 @image_repository_option
@@ -162,7 +204,7 @@ LOG = logging.getLogger(__name__)
 @aws_creds_options
 @common_options
 @save_params_option
-@image_repository_validation()
+@_image_repository_validation
 @pass_context
 @track_command
 @check_newer_version
@@ -200,10 +242,26 @@ def cli(
     disable_rollback,
     on_failure,
     max_wait_duration,
+    stacks_file,
+    max_concurrent_deploys,
 ):
     """
     `sam deploy` command entry point
     """
+    if stacks_file:
+        for option_name, value in (("--guided", guided), ("--confirm-changeset", confirm_changeset)):
+            if value:
+                raise click.BadOptionUsage(
+                    option_name=option_name,
+                    message=f"{option_name} can't be used with --stacks-file, the stacks are deployed without prompts.",
+                )
+        if click.get_current_context().get_parameter_source("template_file") == ParameterSource.COMMANDLINE:
+            raise click.BadOptionUsage(
+                option_name="--template-file",
+                message="Provide either --template-file or --stacks-file, not both. "
+                "The stacks file lists the template of each stack.",
+            )
+
     # All logic must be implemented in the ``do_cli`` method. This helps with easy unit testing
     do_cli(
         template_file,
@@ -236,6 +294,8 @@ def cli(
         disable_rollback,
         on_failure,
         max_wait_duration,
+        stacks_file=stacks_file,
+        max_concurrent_deploys=max_concurrent_deploys,
     )  # pragma: no cover
 
 
@@ -270,6 +330,8 @@ def do_cli(
     disable_rollback,
     on_failure,
     max_wait_duration,
+    stacks_file=None,
+    max_concurrent_deploys=DEFAULT_MAX_CONCURRENT_DEPLOYS,
 ):
     """
     Implementation of the ``cli`` method
@@ -278,6 +340,41 @@ def do_cli(
     from samcli.commands.deploy.exceptions import DeployResolveS3AndS3SetError
     from samcli.commands.deploy.guided_context import GuidedContext
     from samcli.commands.package.package_context import PackageContext
+    from samcli.lib.bootstrap.bootstrap import manage_stack, print_managed_s3_bucket_info
+    from samcli.lib.bootstrap.companion_stack.companion_stack_manager import sync_ecr_stack
+    from samcli.lib.utils import osutils
+
+    if stacks_file:
+        _deploy_stacks_file(
+            stacks_file,
+            max_concurrent_deploys,
+            region=region,
+            profile=profile,
+            resolve_s3=resolve_s3,
+            resolve_image_repos=resolve_image_repos,
+            deploy_options={
+                "s3_bucket": s3_bucket,
+                "image_repository": image_repository,
+                "image_repositories": image_repositories,
+                "force_upload": force_upload,
+                "s3_prefix": s3_prefix,
+                "kms_key_id": kms_key_id,
+                "parameter_overrides": parameter_overrides,
+                "capabilities": capabilities,
+                "no_execute_changeset": no_execute_changeset,
+                "role_arn": role_arn,
+                "notification_arns": notification_arns,
+                "fail_on_empty_changeset": fail_on_empty_changeset,
+                "use_json": use_json,
+                "tags": tags,
+                "metadata": metadata,
+                "signing_profiles": signing_profiles,
+                "disable_rollback": disable_rollback,
+                "on_failure": on_failure,
+                "max_wait_duration": max_wait_duration,
+            },
+        )
+        return
 
     if guided:
         # Allow for a guided deploy to prompt and save those details.
@@ -341,14 +438,7 @@ def do_cli(
         ) as package_context:
             package_context.run()
 
-        # 5s of sleep time between stack checks and describe stack events.
-        DEFAULT_POLL_DELAY = 5
-        try:
-            poll_delay = float(os.getenv("SAM_CLI_POLL_DELAY", str(DEFAULT_POLL_DELAY)))
-        except ValueError:
-            poll_delay = DEFAULT_POLL_DELAY
-        if poll_delay <= 0:
-            poll_delay = DEFAULT_POLL_DELAY
+        poll_delay = _get_poll_delay()
 
         with DeployContext(
             template_file=output_template_file.name,
@@ -378,3 +468,41 @@ def do_cli(
             max_wait_duration=max_wait_duration,
         ) as deploy_context:
             deploy_context.run()
+
+
+def _get_poll_delay():
+    # 5s of sleep time between stack checks and describe stack events.
+    DEFAULT_POLL_DELAY = 5
+    try:
+        poll_delay = float(os.getenv("SAM_CLI_POLL_DELAY", str(DEFAULT_POLL_DELAY)))
+    except ValueError:
+        poll_delay = DEFAULT_POLL_DELAY
+    if poll_delay <= 0:
+        poll_delay = DEFAULT_POLL_DELAY
+    return poll_delay
+
+
+def _deploy_stacks_file(
+    stacks_file, max_concurrent_deploys, region, profile, resolve_s3, resolve_image_repos, deploy_options
+):
+    from samcli.commands.deploy.exceptions import DeployResolveS3AndS3SetError
+    from samcli.commands.deploy.multi_stack_deploy import MultiStackDeployContext
+    from samcli.lib.bootstrap.bootstrap import manage_stack, print_managed_s3_bucket_info
+
+    if resolve_s3:
+        if bool(deploy_options["s3_bucket"]):
+            raise DeployResolveS3AndS3SetError()
+        # the managed bucket is resolved once, for all the stacks
+        deploy_options["s3_bucket"] = manage_stack(profile=profile, region=region)
+        print_managed_s3_bucket_info(deploy_options["s3_bucket"])
+
+    with MultiStackDeployContext(
+        stacks_file=stacks_file,
+        max_concurrent_deploys=max_concurrent_deploys,
+        deploy_options=deploy_options,
+        region=region,
+        profile=profile,
+        poll_delay=_get_poll_delay(),
+        resolve_image_repos=resolve_image_repos,
+    ) as multi_stack_deploy_context:
+        multi_stack_deploy_context.run()
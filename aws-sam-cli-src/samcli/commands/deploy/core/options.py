@@ -38,6 +38,8 @@ DEPLOYMENT_OPTIONS: List[str] = [
     "on_failure",
     "force_upload",
     "max_wait_duration",
+    "stacks_file",
+    "max_concurrent_deploys",
 ]
 
 CONFIGURATION_OPTION_NAMES: List[str] = ["config_env", "config_file"] + SAVE_PARAMS_OPTIONS
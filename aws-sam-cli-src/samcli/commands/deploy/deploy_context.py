@@ -23,6 +23,7 @@ import boto3
 import click
 
 from samcli.commands.deploy import exceptions as deploy_exceptions
+from samcli.commands.deploy.adaptive_polling import AdaptiveStackPoller, fast_event_polls
 from samcli.commands.deploy.auth_utils import auth_per_resource
 from samcli.commands.deploy.utils import (
     hide_noecho_parameter_overrides,
@@ -75,7 +76,14 @@ class DeployContext:
         poll_delay,
         on_failure,
         max_wait_duration,
+        cloudformation_client=None,
+        s3_client=None,
+        poller: Optional[AdaptiveStackPoller] = None,
     ):
+        """
+        The cloudformation_client, s3_client and poller are created by run() unless given, several deploy contexts
+        of the same process can share them. A given poller must already be registered on the cloudformation_client.
+        """
         self.template_file = template_file
         self.stack_name = stack_name
         self.s3_bucket = s3_bucket
@@ -108,6 +116,9 @@ class DeployContext:
         self.on_failure = FailureMode(on_failure) if on_failure else FailureMode.ROLLBACK
         self._max_template_size = 51200
         self.max_wait_duration = max_wait_duration
+        self._cloudformation_client = cloudformation_client
+        self._s3_client = s3_client
+        self._poller = poller
 
     def __enter__(self):
         return self
@@ -137,18 +148,27 @@ class DeployContext:
         if template_size > self._max_template_size and not self.s3_bucket:
             raise deploy_exceptions.DeployBucketRequiredError()
         boto_config = get_boto_config_with_user_agent()
-        cloudformation_client = boto3.client(
-            "cloudformation", region_name=self.region if self.region else None, config=boto_config
-        )
+        cloudformation_client = self._cloudformation_client
+        if cloudformation_client is None:
+            cloudformation_client = boto3.client(
+                "cloudformation", region_name=self.region if self.region else None, config=boto_config
+            )
 
         s3_client = None
         if self.s3_bucket:
-            s3_client = boto3.client("s3", region_name=self.region if self.region else None, config=boto_config)
+            s3_client = self._s3_client
+            if s3_client is None:
+                s3_client = boto3.client("s3", region_name=self.region if self.region else None, config=boto_config)
 
             self.s3_uploader = S3Uploader(
                 s3_client, self.s3_bucket, self.s3_prefix, self.kms_key_id, self.force_upload, self.no_progressbar
             )
 
+        # the deployer sleeps poll_delay, which is also the delay of its changeset waiter, until the changeset
+        # executes. The poller then paces the stack event polls, see fast_event_polls
+        if self._poller is None:
+            self._poller = AdaptiveStackPoller(self.poll_delay)
+            self._poller.register(cloudformation_client)
         self.deployer = Deployer(cloudformation_client, client_sleep=self.poll_delay)
 
         region = s3_client._client_config.region_name if s3_client else self.region  # pylint: disable=W0212
@@ -271,9 +291,15 @@ class DeployContext:
 
                 marker_time = self.deployer.get_last_event_time(stack_name, 0)
                 self.deployer.execute_changeset(result["Id"], stack_name, disable_rollback)
-                self.deployer.wait_for_execute(
-                    stack_name, changeset_type, disable_rollback, self.on_failure, marker_time, self.max_wait_duration
-                )
+                with fast_event_polls(self.deployer, self._poller):
+                    self.deployer.wait_for_execute(
+                        stack_name,
+                        changeset_type,
+                        disable_rollback,
+                        self.on_failure,
+                        marker_time,
+                        self.max_wait_duration,
+                    )
                 click.echo(self.MSG_EXECUTE_SUCCESS.format(stack_name=stack_name, region=region))
 
             except deploy_exceptions.ChangeEmptyError as ex:
@@ -288,17 +314,19 @@ class DeployContext:
 
         else:
             try:
-                result = self.deployer.sync(
-                    stack_name=stack_name,
-                    cfn_template=template_str,
-                    parameter_values=parameters,
-                    capabilities=capabilities,
-                    role_arn=role_arn,
-                    notification_arns=notification_arns,
-                    s3_uploader=s3_uploader,
-                    tags=tags,
-                    on_failure=self.on_failure,
-                )
+                # without a changeset, the deployer only sleeps between stack event polls
+                with fast_event_polls(self.deployer, self._poller):
+                    result = self.deployer.sync(
+                        stack_name=stack_name,
+                        cfn_template=template_str,
+                        parameter_values=parameters,
+                        capabilities=capabilities,
+                        role_arn=role_arn,
+                        notification_arns=notification_arns,
+                        s3_uploader=s3_uploader,
+                        tags=tags,
+                        on_failure=self.on_failure,
+                    )
                 LOG.debug(result)
 
             except deploy_exceptions.DeployFailedError as ex:
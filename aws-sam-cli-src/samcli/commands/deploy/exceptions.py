@@ -81,3 +81,13 @@ class DeployStackStatusMissingError(UserException):
     def __init__(self, stack_name):
         message_fmt = "Was not able to find a stack with the name: {msg}, please check your parameters and try again."
         super().__init__(message=message_fmt.format(msg=stack_name))
+
+
+class StacksFileError(UserException):
+    def __init__(self, stacks_file, msg):
+        self.stacks_file = stacks_file
+        self.msg = msg
+
+        message_fmt = "Invalid stacks file {stacks_file}: {msg}"
+
+        super().__init__(message=message_fmt.format(stacks_file=self.stacks_file, msg=self.msg))
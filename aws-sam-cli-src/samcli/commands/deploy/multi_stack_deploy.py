@@ -0,0 +1,525 @@
+"""
+Deploy several SAM stacks at once, described by a stacks file
+
+The stacks file lists the stacks to deploy, in YAML or JSON:
+
+    stacks:
+      - stack_name: network
+        template_file: network/template.yaml
+      - stack_name: api
+        template_file: api/.aws-sam/build/template.yaml
+        parameter_overrides:
+          Stage: prod
+          VpcId:
+            StackOutput: network.VpcId
+        tags:
+          team: api
+      - stack_name: dashboards
+        template_file: dashboards.yaml
+        depends_on: [api]
+
+The template files are relative to the directory of the stacks file. A parameter override given as
+{"StackOutput": "<stack name>.<output key>"} is the output of another stack of the file, which is then deployed first,
+like the stacks listed in depends_on. The other stacks are deployed concurrently, in one process sharing the AWS
+clients, so that the credentials and the clients are only set up once.
+
+The progress display is the start and finish line of each stack, numbered over all the stacks, and the summary. The
+changeset and stack event tables of each deployment are still printed by its deployer as they come, so the tables of
+concurrent deployments are interleaved; --max-concurrent-deploys 1 keeps them apart.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import boto3
+import click
+import yaml
+
+from samcli.commands._utils.template import get_template_artifacts_format
+from samcli.commands.deploy.adaptive_polling import AdaptiveStackPoller
+from samcli.commands.deploy.exceptions import DeployFailedError, StacksFileError
+from samcli.commands.exceptions import UserException
+from samcli.lib.providers.provider import ResourceIdentifier, get_resource_full_path_by_id
+from samcli.lib.providers.sam_function_provider import SamFunctionProvider
+from samcli.lib.providers.sam_stack_provider import SamLocalStackProvider
+from samcli.lib.utils.boto_utils import get_boto_config_with_user_agent
+from samcli.lib.utils.packagetype import IMAGE
+from samcli.yamlhelper import yaml_parse
+
+LOG = logging.getLogger(__name__)
+
+STACK_OUTPUT_REFERENCE = "StackOutput"
+
+DEPLOYED = "DEPLOYED"
+FAILED = "FAILED"
+SKIPPED = "SKIPPED"
+
+
+@dataclass
+class StackEntry:
+    """
+    A stack of the stacks file
+    """
+
+    stack_name: str
+    template_file: str
+    parameter_overrides: Dict[str, str] = field(default_factory=dict)
+    # parameter name -> (stack name, output key)
+    output_references: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    depends_on: Set[str] = field(default_factory=set)
+    tags: Optional[Dict[str, str]] = None
+    capabilities: Optional[List[str]] = None
+    s3_prefix: Optional[str] = None
+    image_repositories: Optional[Dict[str, str]] = None
+
+    @property
+    def dependencies(self) -> Set[str]:
+        return self.depends_on | {stack_name for stack_name, _ in self.output_references.values()}
+
+
+def _string_mapping(stacks_file: str, stack_name: str, key: str, value: Any) -> Optional[Dict[str, str]]:
+    if value is None:
+        return None
+    if not isinstance(value, dict):
+        raise StacksFileError(stacks_file, f"{key} of the stack {stack_name} must be a mapping")
+    return {str(name): str(item) for name, item in value.items()}
+
+
+def _string_list(stacks_file: str, stack_name: str, key: str, value: Any) -> Optional[List[str]]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, list):
+        raise StacksFileError(stacks_file, f"{key} of the stack {stack_name} must be a list")
+    return [str(item) for item in value]
+
+
+def _parse_entry(stacks_file: str, base_dir: str, entry: Any) -> StackEntry:
+    if not isinstance(entry, dict) or not entry.get("stack_name") or not entry.get("template_file"):
+        raise StacksFileError(stacks_file, "each stack must have a stack_name and a template_file")
+    stack_name = str(entry["stack_name"])
+    template_file = os.path.abspath(os.path.join(base_dir, str(entry["template_file"])))
+    if not os.path.isfile(template_file):
+        raise StacksFileError(stacks_file, f"the template {template_file} of the stack {stack_name} does not exist")
+
+    parameter_overrides: Dict[str, str] = {}
+    output_references: Dict[str, Tuple[str, str]] = {}
+    overrides = entry.get("parameter_overrides") or {}
+    if not isinstance(overrides, dict):
+        raise StacksFileError(stacks_file, f"parameter_overrides of the stack {stack_name} must be a mapping")
+    for parameter, value in overrides.items():
+        if isinstance(value, dict):
+            reference = value.get(STACK_OUTPUT_REFERENCE)
+            if len(value) != 1 or not isinstance(reference, str) or "." not in reference:
+                raise StacksFileError(
+                    stacks_file,
+                    f"the parameter {parameter} of the stack {stack_name} must be a value or "
+                    f"{{{STACK_OUTPUT_REFERENCE}: <stack name>.<output key>}}",
+                )
+            output_stack, output_key = reference.split(".", 1)
+            output_references[str(parameter)] = (output_stack, output_key)
+        else:
+            parameter_overrides[str(parameter)] = str(value)
+
+    return StackEntry(
+        stack_name=stack_name,
+        template_file=template_file,
+        parameter_overrides=parameter_overrides,
+        output_references=output_references,
+        depends_on=set(_string_list(stacks_file, stack_name, "depends_on", entry.get("depends_on")) or []),
+        tags=_string_mapping(stacks_file, stack_name, "tags", entry.get("tags")),
+        capabilities=_string_list(stacks_file, stack_name, "capabilities", entry.get("capabilities")),
+        s3_prefix=str(entry["s3_prefix"]) if entry.get("s3_prefix") else None,
+        image_repositories=_string_mapping(
+            stacks_file, stack_name, "image_repositories", entry.get("image_repositories")
+        ),
+    )
+
+
+def read_stacks_file(stacks_file: str) -> List[StackEntry]:
+    """
+    Reads and validates the stacks file: the stack names are unique, the templates exist, and the dependencies are
+    stacks of the file without cycles
+
+    Parameters
+    ----------
+    stacks_file: str
+        Path of the YAML or JSON stacks file
+
+    Returns
+    -------
+    List[StackEntry]
+        The stacks, in the order of the file
+    """
+    try:
+        with open(stacks_file, "r") as handle:
+            content = yaml_parse(handle.read())
+    except OSError as ex:
+        raise StacksFileError(stacks_file, str(ex)) from ex
+    except (ValueError, yaml.YAMLError) as ex:
+        raise StacksFileError(stacks_file, f"unable to parse the file, {ex}") from ex
+
+    stacks = content.get("stacks") if isinstance(content, dict) else None
+    if not isinstance(stacks, list) or not stacks:
+        raise StacksFileError(stacks_file, "the file must have a non-empty list of stacks")
+
+    base_dir = os.path.dirname(os.path.abspath(stacks_file))
+    entries = [_parse_entry(stacks_file, base_dir, entry) for entry in stacks]
+
+    names = [entry.stack_name for entry in entries]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise StacksFileError(stacks_file, f"the stacks {', '.join(duplicates)} are listed more than once")
+    for entry in entries:
+        unknown = sorted(entry.dependencies - set(names))
+        if unknown:
+            raise StacksFileError(
+                stacks_file, f"the stack {entry.stack_name} depends on {', '.join(unknown)}, not in the file"
+            )
+
+    cycle = _find_cycle(entries)
+    if cycle:
+        raise StacksFileError(stacks_file, f"the stacks depend on each other: {' -> '.join(cycle)}")
+    return entries
+
+
+def _find_cycle(entries: List[StackEntry]) -> Optional[List[str]]:
+    """
+    Returns the stack names of a dependency cycle, or None when the dependencies are a DAG
+    """
+    dependencies = {entry.stack_name: sorted(entry.dependencies) for entry in entries}
+    visited: Set[str] = set()
+
+    for root, root_dependencies in dependencies.items():
+        if root in visited:
+            continue
+        # iterative depth-first search, the path holds the stacks being visited
+        path: List[str] = [root]
+        iterators = [iter(root_dependencies)]
+        while iterators:
+            dependency = next(iterators[-1], None)
+            if dependency is None:
+                visited.add(path.pop())
+                iterators.pop()
+            elif dependency in path:
+                return path[path.index(dependency) :] + [dependency]
+            elif dependency not in visited:
+                path.append(dependency)
+                iterators.append(iter(dependencies[dependency]))
+    return None
+
+
+class _DeployProgress:
+    """
+    Single progress display of the stacks being deployed, safe to use from the deploying threads. It covers the start
+    and finish lines of the stacks, not the changeset and stack event tables printed by their deployers.
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+        self._done = 0
+        self._lock = threading.Lock()
+
+    def started(self, stack_name: str) -> None:
+        self._echo(f"\n\t- Deploying stack {stack_name}")
+
+    def finished(self, stack_name: str, status: str, detail: str = "") -> None:
+        with self._lock:
+            self._done += 1
+            done = self._done
+        color = {DEPLOYED: "green", FAILED: "red"}.get(status, "yellow")
+        suffix = f": {detail}" if detail else ""
+        self._echo(click.style(f"\n\t[{done}/{self.total}] {stack_name} {status}{suffix}", fg=color))
+
+    def _echo(self, message: str) -> None:
+        with self._lock:
+            click.echo(message)
+
+
+class MultiStackDeployContext:
+    """
+    Deploys the stacks of a stacks file, each stack once the stacks it depends on are deployed, at most
+    max_concurrent_deploys at a time
+    """
+
+    def __init__(
+        self,
+        stacks_file: str,
+        max_concurrent_deploys: int,
+        deploy_options: Dict[str, Any],
+        region: Optional[str],
+        profile: Optional[str],
+        poll_delay: float,
+        resolve_image_repos: bool = False,
+    ):
+        """
+        Parameters
+        ----------
+        stacks_file: str
+            Path of the stacks file
+        max_concurrent_deploys: int
+            Maximum number of stacks deployed at the same time
+        deploy_options: Dict[str, Any]
+            Arguments of the PackageContext and DeployContext shared by all the stacks (s3_bucket, capabilities, ...),
+            the stacks file overrides the stack specific ones
+        region, profile: Optional[str]
+            AWS region and profile of the deployments
+        poll_delay: float
+            Delay between the checks of a stack state
+        resolve_image_repos: bool
+            Whether to create the ECR repositories of the image functions of each stack
+        """
+        self.stacks_file = stacks_file
+        self.max_concurrent_deploys = max(1, max_concurrent_deploys)
+        self.deploy_options = deploy_options
+        self.region = region
+        self.profile = profile
+        self.poll_delay = poll_delay
+        self.resolve_image_repos = resolve_image_repos
+        self.entries: List[StackEntry] = []
+        self.statuses: Dict[str, str] = {}
+        self._outputs: Dict[str, Dict[str, str]] = {}
+        self._cloudformation_client = None
+        self._s3_client = None
+        self._poller: Optional[AdaptiveStackPoller] = None
+        self._progress: Optional[_DeployProgress] = None
+
+    def __enter__(self):
+        self.entries = read_stacks_file(self.stacks_file)
+        self._validate_options()
+
+        region_name = self.region if self.region else None
+        boto_config = get_boto_config_with_user_agent()
+        # boto3 clients are thread safe, the deploys share them and the poller pacing their stack event polls
+        self._cloudformation_client = boto3.client("cloudformation", region_name=region_name, config=boto_config)
+        self._poller = AdaptiveStackPoller(self.poll_delay)
+        self._poller.register(self._cloudformation_client)
+        if self.deploy_options.get("s3_bucket"):
+            self._s3_client = boto3.client("s3", region_name=region_name, config=boto_config)
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def _validate_options(self) -> None:
+        """
+        Validates the options of every stack before deploying any, like sam deploy validates the options of its
+        template: the outputs of the referenced stacks exist, and the image functions have an ECR repository
+        """
+        if self.deploy_options.get("no_execute_changeset"):
+            referencing = [entry.stack_name for entry in self.entries if entry.output_references]
+            if referencing:
+                raise StacksFileError(
+                    self.stacks_file,
+                    f"the stacks {', '.join(referencing)} take parameters from {STACK_OUTPUT_REFERENCE} references, "
+                    "which can't be resolved with --no-execute-changeset as the referenced stacks are not deployed",
+                )
+
+        image_repository = self.deploy_options.get("image_repository")
+        for entry in self.entries:
+            image_repositories = entry.image_repositories or self.deploy_options.get("image_repositories")
+            if bool(image_repository) + bool(image_repositories) + bool(self.resolve_image_repos) > 1:
+                raise StacksFileError(
+                    self.stacks_file,
+                    f"only one of --image-repository, --image-repositories (or the image_repositories of the stack) "
+                    f"and --resolve-image-repos can be provided for the stack {entry.stack_name}",
+                )
+            if image_repository or self.resolve_image_repos:
+                continue
+            if IMAGE not in get_template_artifacts_format(template_file=entry.template_file):
+                continue
+            if not image_repositories:
+                raise StacksFileError(
+                    self.stacks_file,
+                    f"the stack {entry.stack_name} has image functions, add its image_repositories, or provide "
+                    "--image-repository or --resolve-image-repos",
+                )
+            if not self._all_image_functions_have_repositories(entry, image_repositories):
+                raise StacksFileError(
+                    self.stacks_file,
+                    "incomplete list of function logical ids in the image_repositories of the stack "
+                    f"{entry.stack_name}",
+                )
+
+    def _all_image_functions_have_repositories(self, entry: StackEntry, image_repositories: Dict[str, str]) -> bool:
+        stacks, _ = SamLocalStackProvider.get_stacks(entry.template_file, parameter_overrides=entry.parameter_overrides)
+        function_provider = SamFunctionProvider(stacks, ignore_code_extraction_warnings=True)
+        image_functions = {
+            function.full_path for function in function_provider.get_all() if function.packagetype == IMAGE
+        }
+        repository_functions = {
+            get_resource_full_path_by_id(stacks, ResourceIdentifier(function_id)) for function_id in image_repositories
+        }
+        return image_functions == repository_functions
+
+    def run(self):
+        """
+        Deploys the stacks, the dependents of a stack which failed are skipped
+        """
+        entries = {entry.stack_name: entry for entry in self.entries}
+        pending = dict(entries)
+        running: Dict[Future, str] = {}
+        self._progress = _DeployProgress(len(entries))
+        click.echo(
+            f"\n\tDeploying {len(entries)} stack(s), up to {self.max_concurrent_deploys} at a time, "
+            f"from {self.stacks_file}"
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_deploys) as executor:
+            while pending or running:
+                self._skip_dependents_of_failures(pending)
+                for stack_name in [name for name, entry in pending.items() if self._is_ready(entry)]:
+                    if len(running) >= self.max_concurrent_deploys:
+                        break
+                    entry = pending.pop(stack_name)
+                    running[executor.submit(self._deploy_stack, entry)] = stack_name
+                if not running:
+                    # the dependencies are a DAG, nothing is left once the dependents of failures are skipped
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    stack_name = running.pop(future)
+                    try:
+                        self._outputs[stack_name] = future.result()
+                        self.statuses[stack_name] = DEPLOYED
+                        self._progress.finished(stack_name, DEPLOYED)
+                    except Exception as ex:  # pylint: disable=broad-except
+                        LOG.debug("Unable to deploy the stack %s", stack_name, exc_info=ex)
+                        self.statuses[stack_name] = FAILED
+                        self._progress.finished(stack_name, FAILED, str(ex))
+
+        self._print_summary()
+        failed = [name for name in entries if self.statuses.get(name) != DEPLOYED]
+        if failed:
+            raise DeployFailedError(
+                stack_name=", ".join(failed), msg="the stacks were not deployed, see the output above for the causes"
+            )
+
+    def _is_ready(self, entry: StackEntry) -> bool:
+        return all(self.statuses.get(dependency) == DEPLOYED for dependency in entry.dependencies)
+
+    def _skip_dependents_of_failures(self, pending: Dict[str, StackEntry]) -> None:
+        skipped = True
+        while skipped:
+            skipped = False
+            for stack_name, entry in list(pending.items()):
+                failed = sorted(
+                    dependency
+                    for dependency in entry.dependencies
+                    if self.statuses.get(dependency) in (FAILED, SKIPPED)
+                )
+                if failed:
+                    del pending[stack_name]
+                    self.statuses[stack_name] = SKIPPED
+                    if self._progress:
+                        self._progress.finished(stack_name, SKIPPED, f"depends on {', '.join(failed)}")
+                    skipped = True
+
+    def _parameter_overrides(self, entry: StackEntry) -> Dict[str, str]:
+        parameter_overrides = dict(self.deploy_options.get("parameter_overrides") or {})
+        parameter_overrides.update(entry.parameter_overrides)
+        for parameter, (stack_name, output_key) in entry.output_references.items():
+            outputs = self._outputs.get(stack_name, {})
+            if output_key not in outputs:
+                raise UserException(f"The stack {stack_name} has no output {output_key} for the parameter {parameter}")
+            parameter_overrides[parameter] = outputs[output_key]
+        return parameter_overrides
+
+    def _deploy_stack(self, entry: StackEntry) -> Dict[str, str]:
+        """
+        Packages and deploys a stack, and returns its outputs
+        """
+        from samcli.commands.deploy.deploy_context import DeployContext
+        from samcli.commands.package.package_context import PackageContext
+        from samcli.lib.bootstrap.companion_stack.companion_stack_manager import sync_ecr_stack
+        from samcli.lib.utils import osutils
+
+        if self._progress:
+            self._progress.started(entry.stack_name)
+        options = self.deploy_options
+        parameter_overrides = self._parameter_overrides(entry)
+        s3_prefix = entry.s3_prefix or options.get("s3_prefix")
+        image_repositories = entry.image_repositories or options.get("image_repositories")
+        if self.resolve_image_repos:
+            image_repositories = sync_ecr_stack(
+                entry.template_file,
+                entry.stack_name,
+                self.region,
+                options.get("s3_bucket"),
+                s3_prefix,
+                image_repositories,
+            )
+
+        with osutils.tempfile_platform_independent() as output_template_file:
+            with PackageContext(
+                template_file=entry.template_file,
+                s3_bucket=options.get("s3_bucket"),
+                s3_prefix=s3_prefix,
+                image_repository=options.get("image_repository"),
+                image_repositories=image_repositories,
+                output_template_file=output_template_file.name,
+                kms_key_id=options.get("kms_key_id"),
+                use_json=options.get("use_json"),
+                force_upload=options.get("force_upload"),
+                no_progressbar=True,
+                metadata=options.get("metadata"),
+                on_deploy=True,
+                region=self.region,
+                profile=self.profile,
+                signing_profiles=options.get("signing_profiles"),
+                parameter_overrides=parameter_overrides,
+            ) as package_context:
+                package_context.run()
+
+            with DeployContext(
+                template_file=output_template_file.name,
+                stack_name=entry.stack_name,
+                s3_bucket=options.get("s3_bucket"),
+                image_repository=options.get("image_repository"),
+                image_repositories=image_repositories,
+                force_upload=options.get("force_upload"),
+                no_progressbar=True,
+                s3_prefix=s3_prefix,
+                kms_key_id=options.get("kms_key_id"),
+                parameter_overrides=parameter_overrides,
+                capabilities=entry.capabilities or options.get("capabilities"),
+                no_execute_changeset=options.get("no_execute_changeset"),
+                role_arn=options.get("role_arn"),
+                notification_arns=options.get("notification_arns"),
+                fail_on_empty_changeset=options.get("fail_on_empty_changeset"),
+                tags={**(options.get("tags") or {}), **(entry.tags or {})},
+                region=self.region,
+                profile=self.profile,
+                confirm_changeset=False,
+                signing_profiles=options.get("signing_profiles"),
+                use_changeset=True,
+                disable_rollback=options.get("disable_rollback"),
+                poll_delay=self.poll_delay,
+                on_failure=options.get("on_failure"),
+                max_wait_duration=options.get("max_wait_duration"),
+                cloudformation_client=self._cloudformation_client,
+                s3_client=self._s3_client,
+                poller=self._poller,
+            ) as deploy_context:
+                deploy_context.run()
+
+        return self._stack_outputs(entry.stack_name)
+
+    def _stack_outputs(self, stack_name: str) -> Dict[str, str]:
+        if not any(stack_name in entry.dependencies for entry in self.entries):
+            return {}
+        response = self._cloudformation_client.describe_stacks(StackName=stack_name)  # type: ignore
+        stacks = response.get("Stacks") or [{}]
+        return {output["OutputKey"]: output.get("OutputValue", "") for output in stacks[0].get("Outputs") or []}
+
+    def _print_summary(self) -> None:
+        click.echo("\n\tDeployment summary:")
+        for entry in self.entries:
+            status = self.statuses.get(entry.stack_name, SKIPPED)
+            color = {DEPLOYED: "green", FAILED: "red"}.get(status, "yellow")
+            click.echo(click.style(f"\t\t{entry.stack_name}: {status}", fg=color))
@@ -0,0 +1,16 @@
+"""
+Container modes of the local commands, kept apart from the invoke context so that the command options can be defined
+without importing the invoke machinery
+"""
+
+from enum import Enum
+
+
+class ContainersInitializationMode(Enum):
+    EAGER = "EAGER"
+    LAZY = "LAZY"
+
+
+class ContainersMode(Enum):
+    WARM = "WARM"
+    COLD = "COLD"
@@ -6,12 +6,13 @@ import errno
 import json
 import logging
 import os
-from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, TextIO, Tuple, Type, cast
 
+from samcli.cli.startup_profiler import startup_phase
 from samcli.commands._utils.template import TemplateFailedParsingException, TemplateNotFoundException
 from samcli.commands.exceptions import ContainersInitializationException
+from samcli.commands.local.cli_common.containers_mode import ContainersInitializationMode, ContainersMode
 from samcli.commands.local.cli_common.user_exceptions import DebugContextException, InvokeContextException
 from samcli.commands.local.lib.debug_context import DebugContext
 from samcli.commands.local.lib.local_lambda import LocalLambdaRunner
@@ -46,16 +47,6 @@ class NoFunctionIdentifierProvidedException(InvokeContextException):
     """
 
 
-class ContainersInitializationMode(Enum):
-    EAGER = "EAGER"
-    LAZY = "LAZY"
-
-
-class ContainersMode(Enum):
-    WARM = "WARM"
-    COLD = "COLD"
-
-
 class InvokeContext:
     """
     Sets up a context to invoke Lambda functions locally by parsing all command line arguments necessary for the
@@ -243,31 +234,32 @@ class InvokeContext:
         :returns InvokeContext: Returns this object
         """
 
-        self._stacks = self._get_stacks()
+        with startup_phase("provider_setup"):
+            self._stacks = self._get_stacks()
 
-        _function_providers_class: Dict[ContainersMode, Type[SamFunctionProvider]] = {
-            ContainersMode.WARM: RefreshableSamFunctionProvider,
-            ContainersMode.COLD: SamFunctionProvider,
-        }
+            _function_providers_class: Dict[ContainersMode, Type[SamFunctionProvider]] = {
+                ContainersMode.WARM: RefreshableSamFunctionProvider,
+                ContainersMode.COLD: SamFunctionProvider,
+            }
 
-        _function_providers_args: Dict[ContainersMode, List[Any]] = {
-            ContainersMode.WARM: [self._stacks, self._parameter_overrides, self._global_parameter_overrides],
-            ContainersMode.COLD: [self._stacks],
-        }
+            _function_providers_args: Dict[ContainersMode, List[Any]] = {
+                ContainersMode.WARM: [self._stacks, self._parameter_overrides, self._global_parameter_overrides],
+                ContainersMode.COLD: [self._stacks],
+            }
 
-        # don't resolve the code URI immediately if we passed in docker vol by passing True for use_raw_codeuri
-        # this way at the end the code URI will get resolved against the basedir option
-        if self._docker_volume_basedir:
-            _function_providers_args[self._containers_mode].append(True)
+            # don't resolve the code URI immediately if we passed in docker vol by passing True for use_raw_codeuri
+            # this way at the end the code URI will get resolved against the basedir option
+            if self._docker_volume_basedir:
+                _function_providers_args[self._containers_mode].append(True)
 
-        _function_providers_kwargs: Dict[str, Any] = {}
+            _function_providers_kwargs: Dict[str, Any] = {}
 
-        if self._function_logical_ids:
-            _function_providers_kwargs["function_logical_ids"] = self._function_logical_ids
+            if self._function_logical_ids:
+                _function_providers_kwargs["function_logical_ids"] = self._function_logical_ids
 
-        self._function_provider = _function_providers_class[self._containers_mode](
-            *_function_providers_args[self._containers_mode], **_function_providers_kwargs
-        )
+            self._function_provider = _function_providers_class[self._containers_mode](
+                *_function_providers_args[self._containers_mode], **_function_providers_kwargs
+            )
 
         # Validate function logical IDs after provider is initialized
         self._validate_function_logical_ids()
@@ -13,8 +13,8 @@ from samcli.commands._utils.options import (
     parameter_override_click_option,
     template_click_option,
 )
-from samcli.commands.local.cli_common.invoke_context import ContainersInitializationMode
-from samcli.local.docker.container import DEFAULT_CONTAINER_HOST_INTERFACE
+from samcli.commands.local.cli_common.containers_mode import ContainersInitializationMode
+from samcli.local.docker.constants import DEFAULT_CONTAINER_HOST_INTERFACE
 
 
 def get_application_dir():
@@ -2,12 +2,14 @@
 Context object used by sync command
 """
 
+import json
 import logging
+import os
 import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Optional, cast
+from typing import Dict, List, Optional, cast
 
 import tomlkit
 from tomlkit.items import Item
@@ -20,6 +22,10 @@ LOG = logging.getLogger(__name__)
 
 
 DEFAULT_SYNC_STATE_FILE_NAME = "sync.toml"
+# updates made since sync.toml was last written, one JSON object per line
+DEFAULT_SYNC_STATE_JOURNAL_FILE_NAME = "sync.journal"
+# sync.toml is rewritten once the journal has more entries than this, or than the number of resources in the state
+MIN_JOURNAL_ENTRIES_BEFORE_COMPACTION = 100
 
 SYNC_STATE = "sync_state"
 RESOURCE_SYNC_STATES = "resource_sync_states"
@@ -150,12 +156,56 @@ def _toml_document_to_sync_state(toml_document: Dict) -> Optional[SyncState]:
     return sync_state
 
 
+def _sync_state_update_to_journal_entry(resource_id: Optional[str], sync_state: SyncState) -> str:
+    """
+    Returns the journal line recording the latest update of a resource, or of the infra sync time if resource_id is None
+    """
+    if resource_id is None:
+        latest_infra_sync_time = cast(datetime, sync_state.latest_infra_sync_time)
+        return json.dumps({LATEST_INFRA_SYNC_TIME: latest_infra_sync_time.isoformat()}) + "\n"
+    resource_sync_state = sync_state.resource_sync_states[resource_id]
+    return (
+        json.dumps(
+            {
+                "resource_id": resource_id,
+                HASH: resource_sync_state.hash_value,
+                SYNC_TIME: resource_sync_state.sync_time.isoformat(),
+            }
+        )
+        + "\n"
+    )
+
+
+def _apply_journal_entries(sync_state: SyncState, journal_lines: List[str]) -> int:
+    """
+    Applies the updates of the journal to the sync state, and returns the number of applied updates.
+    A process stopped while appending to the journal leaves a partial last line, which is ignored.
+    """
+    applied_entries = 0
+    for journal_line in journal_lines:
+        try:
+            entry = json.loads(journal_line)
+            if LATEST_INFRA_SYNC_TIME in entry:
+                sync_state.latest_infra_sync_time = datetime.fromisoformat(entry[LATEST_INFRA_SYNC_TIME])
+            else:
+                sync_state.resource_sync_states[entry["resource_id"]] = ResourceSyncState(
+                    entry[HASH], datetime.fromisoformat(entry[SYNC_TIME])
+                )
+        except (ValueError, KeyError, TypeError):
+            LOG.debug("Ignoring invalid sync state journal entry %s", journal_line)
+            continue
+        applied_entries += 1
+    return applied_entries
+
+
 class SyncContext:
     _current_state: SyncState
     _previous_state: Optional[SyncState]
     _build_dir: Path
     _cache_dir: Path
     _file_path: Path
+    _journal_path: Path
+    _journal_entries: int
     skip_deploy_sync: bool
 
     def __init__(
@@ -171,6 +221,8 @@ class SyncContext:
         self._build_dir = Path(build_dir)
         self._cache_dir = Path(cache_dir)
         self._file_path = Path(build_dir).parent.joinpath(DEFAULT_SYNC_STATE_FILE_NAME)
+        self._journal_path = Path(build_dir).parent.joinpath(DEFAULT_SYNC_STATE_JOURNAL_FILE_NAME)
+        self._journal_entries = 0
 
     def __enter__(self) -> "SyncContext":
         with _lock:
@@ -183,6 +235,11 @@ class SyncContext:
         if self._previous_state and self._previous_state.dependency_layer != self._current_state.dependency_layer:
             self._cleanup_build_folders()
 
+        # the journal only records the updates of resources, sync.toml is written first so that it records the
+        # dependency_layer of this execution, even if it stops before writing sync.toml at the end
+        with _lock:
+            self._write()
+
         return self
 
     def __exit__(self, *args) -> None:
@@ -191,12 +248,12 @@ class SyncContext:
 
     def update_infra_sync_time(self) -> None:
         """
-        Updates the last infra sync time and stores it in the TOML file.
+        Updates the last infra sync time and records it in the sync state journal.
         """
         with _lock:
             LOG.debug("Updating latest_infra_sync_time in sync state")
             self._current_state.update_infra_sync_time()
-            self._write()
+            self._append_to_journal(None)
 
     def get_latest_infra_sync_time(self) -> Optional[datetime]:
         """
@@ -230,7 +287,7 @@ class SyncContext:
         with _lock:
             LOG.debug("Updating resource_sync_state for resource %s with hash %s", resource_id, hash_value)
             self._current_state.update_resource_sync_state(resource_id, hash_value)
-            self._write()
+            self._append_to_journal(resource_id)
 
     def get_resource_latest_sync_hash(self, resource_id: str) -> Optional[str]:
         """
@@ -257,20 +314,59 @@ class SyncContext:
             )
             return resource_sync_state.hash_value
 
+    def _append_to_journal(self, resource_id: Optional[str]) -> None:
+        """
+        Records the latest update of the resource (or of the infra sync time if resource_id is None) in the journal,
+        instead of writing the whole state to sync.toml, which is only rewritten once the journal gets long.
+        """
+        if self._journal_entries >= max(
+            MIN_JOURNAL_ENTRIES_BEFORE_COMPACTION, len(self._current_state.resource_sync_states)
+        ):
+            self._write()
+            return
+
+        with open(self._journal_path, "a") as journal:
+            journal.write(_sync_state_update_to_journal_entry(resource_id, self._current_state))
+        self._journal_entries += 1
+
     def _write(self) -> None:
-        with open(self._file_path, "w+") as file:
+        """
+        Writes the whole state to sync.toml and empties the journal. sync.toml is replaced atomically, and the journal
+        only emptied afterwards, so that a stopped process leaves either state behind, and never a partial file.
+        """
+        temp_file_path = self._file_path.with_name(self._file_path.name + ".tmp")
+        # the first execution writes it before anything is built
+        self._file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_file_path, "w+") as file:
             file.write(tomlkit.dumps(_sync_state_to_toml_document(self._current_state)))
+        os.replace(temp_file_path, self._file_path)
+
+        if self._journal_entries or self._journal_path.exists():
+            self._journal_path.unlink(missing_ok=True)
+        self._journal_entries = 0
 
     def _read(self) -> None:
         try:
             with open(self._file_path) as file:
                 toml_document = cast(Dict, tomlkit.loads(file.read()))
             self._previous_state = _toml_document_to_sync_state(toml_document)
-            if self._previous_state:
-                self._current_state.resource_sync_states = self._previous_state.resource_sync_states
-                self._current_state.latest_infra_sync_time = self._previous_state.latest_infra_sync_time
         except OSError:
-            LOG.debug("Missing previous sync state, will create a new file at the end of this execution")
+            LOG.debug("Missing previous sync state, will create a new file")
+
+        try:
+            with open(self._journal_path) as journal:
+                journal_lines = journal.readlines()
+        except OSError:
+            journal_lines = []
+        if journal_lines:
+            # updates of a previous execution which stopped before writing sync.toml
+            if not self._previous_state:
+                self._previous_state = SyncState(self._current_state.dependency_layer, dict(), None)
+            self._journal_entries = _apply_journal_entries(self._previous_state, journal_lines)
+
+        if self._previous_state:
+            self._current_state.resource_sync_states = self._previous_state.resource_sync_states
+            self._current_state.latest_infra_sync_time = self._previous_state.latest_infra_sync_time
 
     def _cleanup_build_folders(self) -> None:
         """
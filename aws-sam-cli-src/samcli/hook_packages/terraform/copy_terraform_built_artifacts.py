@@ -10,7 +10,14 @@ It consists of 5 steps:
 5. parse the output to locate the built artifact, and move it to the SAM CLI
 build artifact directory (find_and_copy_assets)
 
-Note: This script intentionally does not use Python3 specific syntax.
+When the SAM_CLI_TERRAFORM_BATCH_BUILD environment variable is set to 1, steps 1 to 4 run once for all the
+SAM CLI Metadata resources of the project (apply_all_targets_once), and the other functions of the same build
+reuse the output. A build is identified by the SAM_CLI_TERRAFORM_BATCH_BUILD_ID environment variable, set by SAM CLI
+for every `sam build` of a Terraform project; without it, each function applies its own target.
+
+Note: This script runs with the python command found by the prepare hook, Python 3.7 or above, outside of the SAM CLI
+package: it only imports the standard library and the zip helpers copied next to it. Features of later Python
+versions, e.g. os.copy_file_range, are only used when they are available.
 
 """
 
@@ -42,16 +49,23 @@ Note: This script intentionally does not use Python3 specific syntax.
 # pylint: skip-file
 
 import argparse
+import errno
+import getpass
+import hashlib
 import json
 import logging
+import mmap
 import os
 import re
 import shutil
+import stat
 import subprocess
 import sys
+import tempfile
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
-from zip import unzip  # type: ignore
+from zip import extract_member, set_permissions, unzip  # type: ignore
 
 LOG = logging.getLogger(__name__)
 
@@ -67,6 +81,32 @@ TF_ENVIRONMENT_VARIABLES = [
     "TF_CLI_ARGS_apply",
 ]
 
+# Set this environment variable to "1" to apply all the SAM CLI Metadata resources in a single terraform apply
+BATCH_BUILD_ENV_VAR = "SAM_CLI_TERRAFORM_BATCH_BUILD"
+# Identifier of the `sam build` invocation, the batched output is only shared between the functions of one build
+BATCH_BUILD_ID_ENV_VAR = "SAM_CLI_TERRAFORM_BATCH_BUILD_ID"
+# List of all the SAM CLI Metadata resources addresses, generated next to this script
+SAM_METADATA_TARGETS_FILENAME = "sam_metadata_targets.json"
+# Directory in the build directory where the batched terraform output is shared between the functions
+BATCH_BUILD_STATE_DIRNAME = ".sam_terraform_batch"
+BATCH_BUILD_STATE_FILENAME = "state.json"
+BATCH_BUILD_INDEX_FILENAME = "terraform_out.index"
+BATCH_BUILD_OUTPUT_FILENAME = "terraform_out.json"
+# Directory in the temporary directory where the indexes of the --json payloads are cached, suffixed by the user id.
+# The directory is only used if it is private to the user, and keeps the most recently used indexes.
+JSON_INDEX_CACHE_DIRNAME = "sam_terraform_show_index"
+JSON_INDEX_CACHE_MAX_ENTRIES = 16
+BATCH_BUILD_LOCK_FILENAME = "lock"
+
+# Number of threads copying or unzipping the built artifacts, defaults to the ThreadPoolExecutor default
+COPY_WORKERS_ENV_VAR = "SAM_CLI_TERRAFORM_COPY_WORKERS"
+# Set this environment variable to "1" to hard link the built artifacts instead of copying them, when possible.
+# Hard linked artifacts share their content with the build output, changing one in place changes the other.
+COPY_HARDLINKS_ENV_VAR = "SAM_CLI_TERRAFORM_COPY_HARDLINKS"
+# Archives with fewer members are extracted in the current thread
+PARALLEL_UNZIP_MIN_MEMBERS = 64
+COPY_FILE_RANGE_CHUNK_SIZE = 64 * 1024 * 1024
+
 
 class ResolverException(Exception):
     """
@@ -188,27 +228,350 @@ class Searcher(object):
         """
         Search by applying all resolvers against structured data.
         """
+        if isinstance(data, ResourceIndex):
+            return self.search_index(data)
 
         for resolver in self.resolvers:
             data = resolver.resolve(data)
         return data
 
+    def search_index(self, resource_index):
+        """
+        Search a resource index. When the expression selects a resource by address, e.g.
+        |values|root_module|resources|[?address=="aws_lambda_function.func"]|values, the resource is looked up in the
+        index and the resolvers following the address condition are applied to it. Other expressions are searched
+        against the whole terraform output.
+        """
+        for position, resolver in enumerate(self.resolvers):
+            if (
+                isinstance(resolver, ListConditionResolver)
+                and resolver.key == "address"
+                and position > 0
+                and isinstance(self.resolvers[position - 1], KeyResolver)
+                and self.resolvers[position - 1].key == "resources"
+            ):
+                data = resource_index.get_resource(resolver.value)
+                for remaining_resolver in self.resolvers[position + 1 :]:
+                    data = remaining_resolver.resolve(data)
+                return data
+
+        LOG.info("The expression does not select a resource by address, searching the whole terraform output")
+        return self.search(resource_index.load_data())
+
+
+class ResourceIndex(object):
+    """
+    The resources of a `terraform show -json` output, indexed by address and stored in a file.
+
+    The file starts with a line holding a JSON object that maps each resource address to the offset and length of the
+    resource JSON in the rest of the file. Looking a resource up only decodes the offsets and that resource, through a
+    memory map of the file, instead of the whole terraform output.
+
+    load_data returns the whole terraform output, for the expressions which do not select a resource by address.
+    """
+
+    def __init__(self, index_path, load_data):
+        self.index_path = index_path
+        self.load_data = load_data
+        self._offsets = None
+
+    @staticmethod
+    def write(data_object, index_path, load_data):
+        """
+        Indexes the resources of all the modules of the terraform output, and writes the index file atomically.
+        """
+        resources = []
+        modules = [data_object.get("values", {}).get("root_module", {})] if isinstance(data_object, dict) else []
+        while modules:
+            module = modules.pop()
+            if not isinstance(module, dict):
+                continue
+            resources.extend(resource for resource in module.get("resources", []) if isinstance(resource, dict))
+            modules.extend(module.get("child_modules", []))
+
+        offsets = {}
+        body = []
+        position = 0
+        for resource in resources:
+            encoded_resource = json.dumps(resource).encode("utf-8")
+            offsets[resource.get("address")] = [position, len(encoded_resource)]
+            body.append(encoded_resource)
+            position += len(encoded_resource)
+
+        temp_index_path = "{}.{}.tmp".format(index_path, os.getpid())
+        with open(temp_index_path, "wb") as index_file:
+            index_file.write(json.dumps(offsets).encode("utf-8") + b"\n")
+            for encoded_resource in body:
+                index_file.write(encoded_resource)
+        os.replace(temp_index_path, index_path)
+        return ResourceIndex(index_path, load_data)
+
+    def get_resource(self, address):
+        """
+        Returns the resource with the given address, an empty dict if there is none like ListConditionResolver.
+        """
+        with open(self.index_path, "rb") as index_file:
+            header = index_file.readline()
+            if self._offsets is None:
+                self._offsets = json.loads(header)
+            offset = self._offsets.get(address)
+            if offset is None:
+                return {}
+            body_start = len(header)
+            with mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ) as index_map:
+                start = body_start + offset[0]
+                return json.loads(index_map[start : start + offset[1]])
+
+
+def parse_terraform_out(terraform_out):
+    """
+    Parses the output of `terraform show -json`, exits if it is not valid JSON.
+    """
+    try:
+        return json.loads(terraform_out)
+    except ValueError:
+        LOG.error("Parsing JSON from terraform out unsuccessful!", exc_info=True)
+        cli_exit()
+
+
+def get_json_index_cache_dir():
+    """
+    Returns the directory caching the indexes of the --json payloads, or None if it can not be used. The directory is
+    private to the current user: it is not used when another user owns it or can access it, so that nobody else can
+    plant an index.
+    """
+    user_id = str(os.getuid()) if hasattr(os, "getuid") else getpass.getuser()
+    cache_dir = os.path.join(tempfile.gettempdir(), "{}-{}".format(JSON_INDEX_CACHE_DIRNAME, user_id))
+    try:
+        if not os.path.lexists(cache_dir):
+            os.mkdir(cache_dir, 0o700)
+        cache_dir_stat = os.lstat(cache_dir)
+    except OSError:
+        LOG.debug("Could not create the terraform output index cache %s", cache_dir, exc_info=True)
+        return None
+
+    if not stat.S_ISDIR(cache_dir_stat.st_mode):
+        LOG.debug("Not caching the terraform output index, %s is not a directory", cache_dir)
+        return None
+    if hasattr(os, "getuid") and (cache_dir_stat.st_uid != os.getuid() or cache_dir_stat.st_mode & 0o077):
+        LOG.debug("Not caching the terraform output index, %s is not private to the user", cache_dir)
+        return None
+    return cache_dir
+
+
+def evict_json_indexes(cache_dir, max_entries=JSON_INDEX_CACHE_MAX_ENTRIES):
+    """
+    Deletes the least recently used indexes of the cache, keeping max_entries of them.
+    """
+    indexes = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(".index"):
+            index_path = os.path.join(cache_dir, name)
+            try:
+                indexes.append((os.stat(index_path).st_mtime, index_path))
+            except OSError:
+                continue
+
+    indexes.sort(reverse=True)
+    for _, index_path in indexes[max_entries:]:
+        try:
+            os.remove(index_path)
+        except OSError:
+            LOG.debug("Could not evict the cached terraform output index %s", index_path, exc_info=True)
+
+
+def load_cached_json_index(json_str):
+    """
+    Returns the data of a --json payload. When several functions are built from the same payload, the first one
+    parses it and caches an index of its resources, keyed by the payload hash, for the others.
+    """
+    payload = json_str.encode("utf-8")
+    cache_dir = get_json_index_cache_dir()
+    if cache_dir is None:
+        LOG.info("Parsing terraform output")
+        return parse_terraform_out(payload)
+
+    index_path = os.path.join(cache_dir, hashlib.sha256(payload).hexdigest() + ".index")
+    if os.path.exists(index_path):
+        LOG.info("Using the cached index of the terraform output")
+        try:
+            # the modification time is the last use of the index, which the eviction relies on
+            os.utime(index_path)
+        except OSError:
+            pass
+        return ResourceIndex(index_path, lambda: parse_terraform_out(payload))
+
+    LOG.info("Parsing terraform output")
+    data_object = parse_terraform_out(payload)
+    try:
+        ResourceIndex.write(data_object, index_path, lambda: data_object)
+        evict_json_indexes(cache_dir)
+    except OSError:
+        LOG.debug("Could not cache the index of the terraform output", exc_info=True)
+    return data_object
+
+
+def load_terraform_out_file(output_path):
+    """
+    Reads and parses the terraform output saved by the batched apply.
+    """
+    with open(output_path, "rb") as output_file:
+        return parse_terraform_out(output_file.read())
+
+
+def get_copy_workers():
+    """
+    Returns the number of threads to copy the built artifacts with, None for the ThreadPoolExecutor default.
+    """
+    try:
+        workers = int(os.environ.get(COPY_WORKERS_ENV_VAR, ""))
+    except ValueError:
+        return None
+    return workers if workers > 0 else None
+
 
 def copytree(src, dst):
     """Modified copytree method
     Note: before python3.8 there is no `dir_exists_ok` argument, therefore
     this function explicitly creates one if it does not exist.
+
+    The directories are created first, then the files are copied by a pool of threads. Files whose size and
+    modification time did not change since they were last copied to dst are skipped.
+    """
+    # os.walk yields nothing for a missing path or a file, fail like shutil.copytree instead of copying nothing
+    if not os.path.isdir(src):
+        raise NotADirectoryError(errno.ENOTDIR, "Not a directory", src)
+
+    use_hardlinks = os.environ.get(COPY_HARDLINKS_ENV_VAR, "") == "1"
+    copy_jobs = []
+    for root, _, files in os.walk(src, followlinks=True):
+        dst_root = os.path.normpath(os.path.join(dst, os.path.relpath(root, src)))
+        if not os.path.exists(dst_root):
+            os.makedirs(dst_root)
+        for name in files:
+            copy_jobs.append((os.path.join(root, name), os.path.join(dst_root, name), use_hardlinks))
+
+    with ThreadPoolExecutor(max_workers=get_copy_workers()) as executor:
+        # consume the results to raise the first error
+        list(executor.map(lambda copy_job: copy_file(*copy_job), copy_jobs))
+
+
+def copy_file(src, dst, use_hardlinks=False):
+    """
+    Copies the file content and metadata from src to dst, like shutil.copy2.
+
+    The copy is skipped if dst has the same size and modification time as src. On the same file system, the file is
+    hard linked if use_hardlinks is set, or copied with copy_file_range, which lets the file system share the data
+    blocks (reflinks) when it supports it.
+    """
+    src_stat = os.stat(src)
+    try:
+        dst_stat = os.stat(dst)
+    except OSError:
+        dst_stat = None
+
+    if dst_stat is not None and stat.S_ISREG(dst_stat.st_mode):
+        if os.path.samestat(src_stat, dst_stat) or (
+            dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime_ns == src_stat.st_mtime_ns
+        ):
+            return
+
+    same_file_system = dst_stat is not None and dst_stat.st_dev == src_stat.st_dev
+    if dst_stat is None:
+        same_file_system = os.stat(os.path.dirname(dst)).st_dev == src_stat.st_dev
+
+    if use_hardlinks and same_file_system:
+        try:
+            if dst_stat is not None:
+                os.remove(dst)
+            os.link(src, dst)
+            return
+        except OSError:
+            LOG.debug("Could not hard link %s to %s, copying it instead", src, dst)
+            dst_stat = None
+    elif dst_stat is not None and dst_stat.st_nlink > 1:
+        # do not write through a hard link left by a previous build, it would change the other file too
+        os.remove(dst)
+
+    if not (same_file_system and _copy_file_range(src, dst, src_stat.st_size)):
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
+def _copy_file_range(src, dst, size):
     """
-    if not os.path.exists(dst):
-        os.makedirs(dst)
-    for item in os.listdir(src):
-        src_item = os.path.join(src, item)
-        dst_item = os.path.join(dst, item)
-        if os.path.isdir(src_item):
-            # recursively call itself.
-            copytree(src_item, dst_item)
+    Copies the file content in the kernel with copy_file_range, returns False if it is not supported.
+    """
+    if not hasattr(os, "copy_file_range"):
+        return False
+    try:
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            copied = 0
+            while copied < size:
+                chunk = os.copy_file_range(
+                    src_file.fileno(), dst_file.fileno(), min(COPY_FILE_RANGE_CHUNK_SIZE, size - copied)
+                )
+                if chunk == 0:
+                    break
+                copied += chunk
+        return copied == size
+    except OSError:
+        return False
+
+
+def unzip_in_parallel(zip_file_path, output_dir):
+    """
+    Unzips the archive like zip.unzip, extracting the members with a pool of threads. Each thread reads the archive
+    through its own handle, and zlib releases the GIL while decompressing.
+    """
+    with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
+        file_infos = zip_ref.infolist()
+
+    if len(file_infos) < PARALLEL_UNZIP_MIN_MEMBERS:
+        unzip(zip_file_path, output_dir)
+        return
+
+    # create the directories upfront, so that the threads do not race creating them
+    directory_infos = []
+    for file_info in file_infos:
+        member_dir = _get_zip_member_path(output_dir, file_info.filename)
+        if file_info.is_dir():
+            directory_infos.append(file_info)
         else:
-            shutil.copy2(src_item, dst_item)
+            member_dir = os.path.dirname(member_dir)
+        if not os.path.isdir(member_dir):
+            os.makedirs(member_dir)
+
+    workers = get_copy_workers() or min(32, (os.cpu_count() or 1) + 4)
+    chunks = [file_infos[index::workers] for index in range(workers)]
+
+    def extract_chunk(chunk):
+        with zipfile.ZipFile(zip_file_path, "r") as chunk_zip_ref:
+            for chunk_file_info in chunk:
+                if chunk_file_info.is_dir():
+                    continue
+                extracted_path = extract_member(chunk_file_info, output_dir, chunk_zip_ref)
+                if not os.path.islink(extracted_path):
+                    set_permissions(chunk_file_info, extracted_path)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(extract_chunk, [chunk for chunk in chunks if chunk]))
+
+    # set the directories permissions last, read-only directories would reject the extracted files
+    for directory_info in directory_infos:
+        set_permissions(directory_info, _get_zip_member_path(output_dir, directory_info.filename))
+
+
+def _get_zip_member_path(output_dir, member_name):
+    """
+    Returns the path a member is extracted to, sanitized the same way ZipFile.extract does.
+    """
+    arcname = member_name.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = [part for part in arcname.split(os.path.sep) if part and part not in (os.path.curdir, os.path.pardir)]
+    return os.path.join(output_dir, *parts)
 
 
 def cli_exit():
@@ -264,7 +627,7 @@ def find_and_copy_assets(directory_path, expression, data_object):
 
     try:
         if zipfile.is_zipfile(abs_attribute_path):
-            unzip(abs_attribute_path, directory_path)
+            unzip_in_parallel(abs_attribute_path, directory_path)
         else:
             copytree(abs_attribute_path, directory_path)
     except OSError as ex:
@@ -286,6 +649,192 @@ def create_backend_override():
         cli_exit()
 
 
+def apply_target(target):
+    """
+    Applies the given SAM CLI Metadata resource, and returns the terraform output.
+    """
+    LOG.info("Create TF backend override")
+    create_backend_override()
+
+    LOG.info("Running `terraform init` with backend override")
+    subprocess.check_call(["terraform", "init", "-reconfigure", "-input=false", "-force-copy"])
+
+    LOG.info("Running `terraform apply` on the target '%s'", target)
+    subprocess.check_call(["terraform", "apply", "-target", target, "-replace", target, "-auto-approve"])
+
+    LOG.info("Generating terraform output")
+    return subprocess.check_output(["terraform", "show", "-json"])
+
+
+def read_batch_targets():
+    """
+    Returns the addresses of all the SAM CLI Metadata resources of the project, or None if they are not known.
+    """
+    targets_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), SAM_METADATA_TARGETS_FILENAME)
+    try:
+        with open(targets_path, "r") as targets_file:
+            targets = json.load(targets_file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(targets, list) or not targets:
+        return None
+    return [str(target) for target in targets]
+
+
+class BatchBuildLock(object):
+    """
+    Inter-process lock on a file, serializing the functions of a parallel build around the batched apply.
+    """
+
+    def __init__(self, lock_path):
+        self.lock_path = lock_path
+        self.lock_file = None
+
+    def __enter__(self):
+        self.lock_file = open(self.lock_path, "a+")
+        if os.name == "nt":
+            import msvcrt
+
+            self.lock_file.seek(0)
+            while True:
+                try:
+                    # LK_LOCK gives up after 10 seconds, keep waiting while another function applies
+                    msvcrt.locking(self.lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            import fcntl
+
+            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                self.lock_file.seek(0)
+                msvcrt.locking(self.lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self.lock_file.close()
+
+
+def apply_all_targets_once(target, targets, directory_path, build_id):
+    """
+    Applies all the SAM CLI Metadata resources of the project in a single terraform apply, the first time a function
+    of the build needs it, and returns the terraform output, or the index of its resources.
+
+    The output is shared through the build directory, the parent of the function artifacts directory, and only
+    between the functions of the same build. Each target consumes the shared output once; once the batch of the build
+    ran, a target built again, or shared by several functions, is applied alone. A failed apply is recorded, and the
+    other functions of the build fail without applying the batch again.
+
+    The batch replaces every target, so it also rebuilds the functions that `sam build --cached` does not build.
+
+    Parameters:
+    -----------
+    target: str
+        Address of the SAM CLI Metadata resource of the function being built
+    targets: list
+        Addresses of all the SAM CLI Metadata resources of the project
+    directory_path: str
+        The artifacts directory of the function being built
+    build_id: str
+        Identifier of the `sam build` invocation
+    """
+    state_dir = os.path.join(os.path.dirname(directory_path), BATCH_BUILD_STATE_DIRNAME)
+    if not os.path.exists(state_dir):
+        os.makedirs(state_dir)
+    state_path = os.path.join(state_dir, BATCH_BUILD_STATE_FILENAME)
+    index_path = os.path.join(state_dir, BATCH_BUILD_INDEX_FILENAME)
+    output_path = os.path.join(state_dir, BATCH_BUILD_OUTPUT_FILENAME)
+
+    with BatchBuildLock(os.path.join(state_dir, BATCH_BUILD_LOCK_FILENAME)):
+        state = None
+        try:
+            with open(state_path, "r") as state_file:
+                state = json.load(state_file)
+        except (OSError, ValueError):
+            pass
+        if not isinstance(state, dict) or state.get("build_id") != build_id or state.get("targets") != targets:
+            # left behind by another build, possibly a failed one, its output must not be reused
+            state = None
+
+        if state and state.get("failed"):
+            LOG.error("The batched terraform apply of this build failed, not applying it again for '%s'", target)
+            cli_exit()
+
+        if state and target in state.get("pending", []):
+            LOG.info("Reusing the terraform output of the batched apply for the target '%s'", target)
+            data_object = ResourceIndex(index_path, lambda: load_terraform_out_file(output_path))
+            pending = [pending_target for pending_target in state["pending"] if pending_target != target]
+        elif state:
+            # the batch of this build already ran and consumed the output of this target, apply it alone
+            LOG.info("The batched apply of this build already ran, applying the target '%s' alone", target)
+            try:
+                return parse_terraform_out(apply_targets([target]))
+            except (OSError, subprocess.CalledProcessError):
+                LOG.error("Running terraform apply on '%s' failed!", target, exc_info=True)
+                cli_exit()
+        else:
+            try:
+                terraform_out = apply_targets(targets)
+            except (OSError, subprocess.CalledProcessError):
+                LOG.error("The batched terraform apply failed!", exc_info=True)
+                remove_batch_output(index_path, output_path)
+                with open(state_path, "w") as state_file:
+                    json.dump({"build_id": build_id, "targets": targets, "failed": True}, state_file)
+                cli_exit()
+            data_object = parse_terraform_out(terraform_out)
+            # the other functions of the build look their resource up in the index, instead of parsing the output,
+            # which is kept for the expressions that do not select a resource by address
+            with open(output_path, "wb") as output_file:
+                output_file.write(terraform_out)
+            ResourceIndex.write(data_object, index_path, lambda: data_object)
+            pending = [pending_target for pending_target in targets if pending_target != target]
+
+        # the state is kept once every target consumed the output, it records that the batch of this build ran. The
+        # index is left in place for the functions still reading it, the next batch replaces it
+        with open(state_path, "w") as state_file:
+            json.dump({"build_id": build_id, "targets": targets, "pending": pending}, state_file)
+
+    return data_object
+
+
+def apply_targets(targets):
+    """
+    Applies the given SAM CLI Metadata resources in a single terraform apply, and returns the terraform output.
+    """
+    LOG.info("Create TF backend override")
+    create_backend_override()
+
+    LOG.info("Running `terraform init` with backend override")
+    subprocess.check_call(["terraform", "init", "-reconfigure", "-input=false", "-force-copy"])
+
+    LOG.info("Running `terraform apply` on the %d SAM CLI Metadata resources", len(targets))
+    apply_command = ["terraform", "apply"]
+    for batch_target in targets:
+        apply_command += ["-target", batch_target, "-replace", batch_target]
+    subprocess.check_call(apply_command + ["-auto-approve"])
+
+    LOG.info("Generating terraform output")
+    return subprocess.check_output(["terraform", "show", "-json"])
+
+
+def remove_batch_output(*paths):
+    """
+    Removes the output of the previous batch, so that nothing is read from it after a failed apply.
+    """
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
 def validate_environment_variables():
     """
     Validate that the Terraform environment variables do not contain blocked arguments.
@@ -360,28 +909,29 @@ if __name__ == "__main__":
         LOG.error("One of --target and --json must be provided.")
         cli_exit()
 
+    data_object = None
     if target:
-        LOG.info("Create TF backend override")
-        create_backend_override()
-
-        LOG.info("Running `terraform init` with backend override")
-        subprocess.check_call(["terraform", "init", "-reconfigure", "-input=false", "-force-copy"])
-
-        LOG.info("Running `terraform apply` on the target '%s'", target)
-        subprocess.check_call(["terraform", "apply", "-target", target, "-replace", target, "-auto-approve"])
-
-        LOG.info("Generating terraform output")
-        terraform_out = subprocess.check_output(["terraform", "show", "-json"])
+        batch_build_id = os.environ.get(BATCH_BUILD_ID_ENV_VAR, "")
+        batch_targets = None
+        if os.environ.get(BATCH_BUILD_ENV_VAR, "") == "1":
+            batch_targets = read_batch_targets()
+            if batch_targets and not batch_build_id:
+                LOG.info("The build is not identified by %s, applying the target alone", BATCH_BUILD_ID_ENV_VAR)
+        if batch_targets and batch_build_id and target in batch_targets:
+            data_object = apply_all_targets_once(target, batch_targets, directory_path, batch_build_id)
+        else:
+            terraform_out = apply_target(target)
 
     if json_str:
-        terraform_out = json_str
-
-    LOG.info("Parsing terraform output")
-    try:
-        data_object = json.loads(terraform_out)
-    except ValueError:
-        LOG.error("Parsing JSON from terraform out unsuccessful!", exc_info=True)
-        cli_exit()
+        data_object = load_cached_json_index(json_str)
+
+    if data_object is None:
+        LOG.info("Parsing terraform output")
+        try:
+            data_object = json.loads(terraform_out)
+        except ValueError:
+            LOG.error("Parsing JSON from terraform out unsuccessful!", exc_info=True)
+            cli_exit()
 
     LOG.info("Find and copy built assets")
     find_and_copy_assets(directory_path, expression, data_object)
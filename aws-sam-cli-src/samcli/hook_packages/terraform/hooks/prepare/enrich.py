@@ -8,9 +8,11 @@ import json
 import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from json.decoder import JSONDecodeError
 from subprocess import CalledProcessError, run
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
 
 from samcli.hook_packages.terraform.hooks.prepare.constants import (
     CFN_CODE_PROPERTIES,
@@ -73,15 +75,15 @@ def enrich_resources_and_generate_makefile(
         the project root directory where terraform configurations, src code, and other modules exist
     """
 
-    python_command_name = _get_python_command_name()
-
     resources_types_enrichment_functions = {
         "ZIP_LAMBDA_FUNCTION": _enrich_zip_lambda_function,
         "IMAGE_LAMBDA_FUNCTION": _enrich_image_lambda_function,
         "LAMBDA_LAYER": _enrich_lambda_layer,
     }
 
-    makefile_rules = []
+    # the cfn resources to enrich, in the order of the sam metadata resources, grouped by logical id
+    enrichment_jobs: Dict[str, List[Tuple[Callable, SamMetadataResource, Dict]]] = {}
+    makefile_rule_resources: List[Tuple[SamMetadataResource, str]] = []
     for sam_metadata_resource in sam_metadata_resources:
         # enrich resource
         resource_type = get_sam_metadata_planned_resource_value_attribute(
@@ -100,6 +102,14 @@ def enrich_resources_and_generate_makefile(
             sam_metadata_resource, cfn_resources, lambda_resources_to_code_map
         )
         for cfn_resource, logical_id in lambda_resources:
+            enrichment_jobs.setdefault(logical_id, []).append(
+                (enrichment_function, sam_metadata_resource, cfn_resource)
+            )
+            makefile_rule_resources.append((sam_metadata_resource, logical_id))
+
+    def enrich(logical_id: str) -> None:
+        # the enrichments of the same cfn resource run in order, so that the last sam metadata resource wins
+        for enrichment_function, sam_metadata_resource, cfn_resource in enrichment_jobs[logical_id]:
             enrichment_function(
                 sam_metadata_resource.resource,
                 cfn_resource,
@@ -109,15 +119,28 @@ def enrich_resources_and_generate_makefile(
                 project_root_dir,
             )
 
-            # get makefile rule for resource
-            makefile_rule = generate_makefile_rule_for_lambda_resource(
-                sam_metadata_resource, logical_id, terraform_application_dir, python_command_name, output_directory_path
-            )
-            makefile_rules.append(makefile_rule)
+    # enriching resolves the source code paths and checks them on the file system, which is done concurrently for the
+    # different cfn resources. Results are collected in order, so that the first failing resource is reported.
+    # The python command probe runs alongside them.
+    with ThreadPoolExecutor() as executor:
+        python_command_probe = executor.submit(_get_python_command_name)
+        for enrichment in [executor.submit(enrich, logical_id) for logical_id in enrichment_jobs]:
+            enrichment.result()
+        python_command_name = python_command_probe.result()
+
+    makefile_rules = []
+    sam_metadata_targets = []
+    for sam_metadata_resource, logical_id in makefile_rule_resources:
+        # get makefile rule for resource
+        makefile_rule = generate_makefile_rule_for_lambda_resource(
+            sam_metadata_resource, logical_id, terraform_application_dir, python_command_name, output_directory_path
+        )
+        makefile_rules.append(makefile_rule)
+        sam_metadata_targets.append(sam_metadata_resource.resource.get("address", ""))
 
     # generate makefile
     LOG.debug("Generate Makefile in %s", output_directory_path)
-    generate_makefile(makefile_rules, output_directory_path)
+    generate_makefile(makefile_rules, output_directory_path, sam_metadata_targets)
 
 
 def _enrich_zip_lambda_function(
@@ -673,9 +696,11 @@ def _validate_referenced_resource_matches_sam_metadata_type(
         )
 
 
+@lru_cache(maxsize=1)
 def _get_python_command_name() -> str:
     """
-    Verify that python is installed and return the name of the python command
+    Verify that python is installed and return the name of the python command. The result is cached for the process,
+    as the probe starts a subprocess for every candidate command.
 
     Returns
     -------
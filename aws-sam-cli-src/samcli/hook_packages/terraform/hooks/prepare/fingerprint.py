@@ -0,0 +1,320 @@
+"""
+Fingerprinting of a Terraform project, used to make the prepare hook incremental
+
+Three fingerprints are computed for a project:
+
+* ``sources``: the Terraform configuration (``.tf``, ``.tf.json``, ``.tfvars`` files, local modules), the dependency
+  lock file, the local state, the Terraform and provider versions and the environment variables Terraform reads.
+  When it is unchanged, the previously generated plan is still valid.
+* ``init``: the dependency lock file, the installed modules and the provider, module and backend declarations.
+  When it is unchanged, ``terraform init`` does not need to run again.
+* ``translate``: the SAM CLI version and the paths the translation depends on. When it and ``sources`` are
+  unchanged, the previously generated metadata file is still valid.
+
+The incremental prepare is disabled by default, because a remote state, or data sources read from the cloud, can
+change without any local file changing. Set SAM_CLI_TERRAFORM_PREPARE_CACHE=1 to reuse the plan and the metadata file
+of an unchanged project, or SAM_CLI_TERRAFORM_PREPARE_CACHE=init to only skip ``terraform init`` and always generate
+the plan again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from subprocess import PIPE, run
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from samcli import __version__ as samcli_version
+
+LOG = logging.getLogger(__name__)
+
+# Set this environment variable to "1" to reuse the plan of an unchanged project, or to "init" to only skip
+# terraform init. The full prepare hook runs otherwise
+TERRAFORM_PREPARE_CACHE_ENV_VAR = "SAM_CLI_TERRAFORM_PREPARE_CACHE"
+TERRAFORM_PREPARE_CACHE_ENABLED = "1"
+TERRAFORM_PREPARE_CACHE_INIT_ONLY = "init"
+
+PREPARE_FINGERPRINT_FILE = "prepare_fingerprint.json"
+PLAN_CACHE_FILE = "terraform_plan.json"
+
+TERRAFORM_DATA_DIR = ".terraform"
+TERRAFORM_LOCK_FILE = ".terraform.lock.hcl"
+TERRAFORM_MODULES_MANIFEST = os.path.join("modules", "modules.json")
+TERRAFORM_ENVIRONMENT_FILE = "environment"
+TERRAFORM_STATE_FILE = "terraform.tfstate"
+
+TERRAFORM_SOURCE_SUFFIXES = (".tf", ".tf.json", ".tfvars", ".tfvars.json")
+
+# Environment variables which change the plan generated by Terraform
+FINGERPRINTED_ENVIRONMENT_PREFIXES = ("TF_VAR_", "TF_CLI_ARGS")
+FINGERPRINTED_ENVIRONMENT_VARIABLES = (
+    "TF_WORKSPACE",
+    "TF_DATA_DIR",
+    "AWS_PROFILE",
+    "AWS_REGION",
+    "AWS_DEFAULT_REGION",
+)
+
+# Declarations that require running terraform init again when they change
+INIT_DECLARATION_PATTERN = re.compile(
+    r"^\s*(?:source|version|required_version|backend|cloud)\b.*$|^\s*\"?(?:source|version)\"?\s*:.*$",
+    re.MULTILINE,
+)
+
+
+class PrepareFingerprint(NamedTuple):
+    sources: str
+    init: str
+    translate: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return dict(self._asdict())
+
+
+def is_prepare_cache_enabled() -> bool:
+    """
+    Returns
+    -------
+    bool
+        True if the incremental prepare was enabled through the SAM_CLI_TERRAFORM_PREPARE_CACHE environment variable
+    """
+    return os.environ.get(TERRAFORM_PREPARE_CACHE_ENV_VAR) in (
+        TERRAFORM_PREPARE_CACHE_ENABLED,
+        TERRAFORM_PREPARE_CACHE_INIT_ONLY,
+    )
+
+
+def is_plan_cache_enabled() -> bool:
+    """
+    Returns
+    -------
+    bool
+        True if the plan of an unchanged project is reused (SAM_CLI_TERRAFORM_PREPARE_CACHE=1). It is generated again
+        on every run otherwise, as the remote state or data sources can change independently of the project files
+    """
+    return os.environ.get(TERRAFORM_PREPARE_CACHE_ENV_VAR) == TERRAFORM_PREPARE_CACHE_ENABLED
+
+
+def compute_fingerprint(
+    terraform_application_dir: str, project_root_dir: str, output_dir_path: str, plan_file: Optional[str] = None
+) -> PrepareFingerprint:
+    """
+    Computes the fingerprint of the Terraform project
+
+    Parameters
+    ----------
+    terraform_application_dir: str
+        The Terraform application root module directory
+    project_root_dir: str
+        The project root directory
+    output_dir_path: str
+        The directory where the metadata file is generated, excluded from the fingerprinted sources
+    plan_file: Optional[str]
+        The plan file provided by the customer, if any. It replaces the Terraform sources in the fingerprint.
+
+    Returns
+    -------
+    PrepareFingerprint
+        The fingerprint of the project
+    """
+    source_files = _collect_source_files(terraform_application_dir, output_dir_path)
+    data_dir = os.path.join(terraform_application_dir, os.environ.get("TF_DATA_DIR", TERRAFORM_DATA_DIR))
+    modules_manifest = os.path.join(data_dir, TERRAFORM_MODULES_MANIFEST)
+
+    sources = hashlib.sha256()
+    if plan_file:
+        _update_with_file(sources, plan_file)
+    else:
+        for source_file in source_files:
+            _update_with_file(sources, source_file, os.path.relpath(source_file, terraform_application_dir))
+        for module_file in _collect_external_module_files(modules_manifest, terraform_application_dir):
+            _update_with_file(sources, module_file, module_file)
+        _update_with_file(sources, os.path.join(data_dir, TERRAFORM_ENVIRONMENT_FILE))
+        # providers upgraded through the lock file, or a local state changed by terraform apply, change the plan
+        _update_with_file(sources, os.path.join(terraform_application_dir, TERRAFORM_LOCK_FILE))
+        _update_with_file(sources, os.path.join(terraform_application_dir, TERRAFORM_STATE_FILE))
+        sources.update(_terraform_versions(terraform_application_dir).encode("utf-8"))
+        _update_with_environment(sources)
+
+    init = hashlib.sha256()
+    _update_with_file(init, os.path.join(terraform_application_dir, TERRAFORM_LOCK_FILE))
+    _update_with_file(init, modules_manifest)
+    for source_file in source_files:
+        if source_file.endswith((".tf", ".tf.json")):
+            init.update(_read_init_declarations(source_file).encode("utf-8"))
+    init.update(os.environ.get("TF_CLI_ARGS_init", "").encode("utf-8"))
+
+    translate = hashlib.sha256()
+    for value in (samcli_version, terraform_application_dir, project_root_dir, output_dir_path):
+        translate.update(value.encode("utf-8"))
+        translate.update(b"\0")
+
+    return PrepareFingerprint(sources.hexdigest(), init.hexdigest(), translate.hexdigest())
+
+
+def load_cached_fingerprint(output_dir_path: str) -> Optional[PrepareFingerprint]:
+    """
+    Loads the fingerprint stored by the previous prepare run, None if there is none or it can't be read
+    """
+    fingerprint_path = os.path.join(output_dir_path, PREPARE_FINGERPRINT_FILE)
+    try:
+        with open(fingerprint_path, "r") as fingerprint_file:
+            cached = json.load(fingerprint_file)
+        return PrepareFingerprint(**{field: str(cached[field]) for field in PrepareFingerprint._fields})
+    except (OSError, ValueError, TypeError, KeyError) as ex:
+        LOG.debug("No usable prepare fingerprint found at %s: %s", fingerprint_path, ex)
+        return None
+
+
+def save_fingerprint(output_dir_path: str, fingerprint: PrepareFingerprint) -> None:
+    """
+    Stores the fingerprint of the project next to the metadata file
+    """
+    _write_private_file(os.path.join(output_dir_path, PREPARE_FINGERPRINT_FILE), fingerprint.to_dict())
+
+
+def load_cached_plan(output_dir_path: str) -> Optional[dict]:
+    """
+    Loads the Terraform plan JSON stored by the previous prepare run, None if there is none or it can't be read
+    """
+    plan_path = os.path.join(output_dir_path, PLAN_CACHE_FILE)
+    try:
+        with open(plan_path, "r") as plan_cache_file:
+            return dict(json.load(plan_cache_file))
+    except (OSError, ValueError, TypeError) as ex:
+        LOG.debug("No usable cached Terraform plan found at %s: %s", plan_path, ex)
+        return None
+
+
+def save_cached_plan(output_dir_path: str, tf_json: dict) -> None:
+    """
+    Stores the Terraform plan JSON next to the metadata file. The plan can contain sensitive values, so the file is
+    only readable by the current user.
+    """
+    _write_private_file(os.path.join(output_dir_path, PLAN_CACHE_FILE), tf_json)
+
+
+def clear_cache(output_dir_path: str) -> None:
+    """
+    Removes the stored fingerprint, so that the next prepare run starts from scratch
+    """
+    try:
+        os.remove(os.path.join(output_dir_path, PREPARE_FINGERPRINT_FILE))
+    except FileNotFoundError:
+        pass
+
+
+def _write_private_file(path: str, content: dict) -> None:
+    file_descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(file_descriptor, "w") as private_file:
+        json.dump(content, private_file)
+
+
+def _collect_source_files(terraform_application_dir: str, output_dir_path: str) -> List[str]:
+    """
+    Returns the sorted list of the Terraform configuration files under the application directory, skipping hidden
+    directories (e.g. .terraform, .git) and the output directory
+    """
+    excluded_dir = os.path.normpath(output_dir_path)
+    source_files = []
+    for root, dirs, files in os.walk(terraform_application_dir):
+        dirs[:] = sorted(
+            directory
+            for directory in dirs
+            if not directory.startswith(".") and os.path.normpath(os.path.join(root, directory)) != excluded_dir
+        )
+        source_files.extend(
+            os.path.join(root, name) for name in sorted(files) if name.endswith(TERRAFORM_SOURCE_SUFFIXES)
+        )
+    return source_files
+
+
+def _collect_external_module_files(modules_manifest: str, terraform_application_dir: str) -> List[str]:
+    """
+    Returns the Terraform configuration files of the local modules living outside of the application directory, as
+    listed in the modules manifest written by terraform init. Remote modules are covered by the manifest itself.
+    """
+    try:
+        with open(modules_manifest, "r") as manifest_file:
+            modules = json.load(manifest_file).get("Modules") or []
+    except (OSError, ValueError, AttributeError):
+        return []
+
+    application_dir = os.path.normpath(terraform_application_dir)
+    module_dirs = set()
+    for module in modules:
+        module_dir = module.get("Dir") if isinstance(module, dict) else None
+        if not module_dir:
+            continue
+        module_dir = os.path.normpath(os.path.join(terraform_application_dir, module_dir))
+        if os.path.commonpath([application_dir, module_dir]) != application_dir:
+            module_dirs.add(module_dir)
+
+    module_files = []
+    for module_dir in sorted(module_dirs):
+        try:
+            names = sorted(os.listdir(module_dir))
+        except OSError:
+            continue
+        module_files.extend(
+            os.path.join(module_dir, name) for name in names if name.endswith(TERRAFORM_SOURCE_SUFFIXES)
+        )
+    return module_files
+
+
+def _terraform_versions(terraform_application_dir: str) -> str:
+    """
+    Returns the versions of Terraform and of the providers selected for the project, as reported by
+    `terraform version -json`, or an empty string if they can't be read
+    """
+    try:
+        result = run(
+            ["terraform", "version", "-json"], check=False, stdout=PIPE, stderr=PIPE, cwd=terraform_application_dir
+        )
+        versions = json.loads(result.stdout)
+        return json.dumps(
+            {
+                "terraform_version": versions.get("terraform_version"),
+                "provider_selections": versions.get("provider_selections"),
+            },
+            sort_keys=True,
+        )
+    except (OSError, ValueError, AttributeError) as ex:
+        LOG.debug("Unable to read the Terraform and provider versions: %s", ex)
+        return ""
+
+
+def _read_init_declarations(source_file: str) -> str:
+    try:
+        with open(source_file, "r", encoding="utf-8", errors="replace") as tf_file:
+            content = tf_file.read()
+    except OSError:
+        return ""
+    return "\n".join(match.group(0).strip() for match in INIT_DECLARATION_PATTERN.finditer(content))
+
+
+def _update_with_file(digest, path: str, name: Optional[str] = None) -> None:
+    digest.update((name or path).encode("utf-8"))
+    digest.update(b"\0")
+    try:
+        with open(path, "rb") as hashed_file:
+            for chunk in iter(lambda: hashed_file.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        digest.update(b"<missing>")
+    digest.update(b"\0")
+
+
+def _update_with_environment(digest) -> None:
+    for name, value in _fingerprinted_environment(os.environ.items()):
+        digest.update("{}={}".format(name, value).encode("utf-8"))
+        digest.update(b"\0")
+
+
+def _fingerprinted_environment(environment: Iterable) -> List:
+    return sorted(
+        (name, value)
+        for name, value in environment
+        if name.startswith(FINGERPRINTED_ENVIRONMENT_PREFIXES) or name in FINGERPRINTED_ENVIRONMENT_VARIABLES
+    )
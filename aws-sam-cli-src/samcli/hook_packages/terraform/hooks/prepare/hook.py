@@ -8,10 +8,23 @@ import json
 import logging
 import os
 from pathlib import Path
-from subprocess import CalledProcessError, run
+from subprocess import PIPE, CalledProcessError, run
 from typing import Any, Dict
 
 from samcli.hook_packages.terraform.hooks.prepare.constants import CFN_CODE_PROPERTIES
+from samcli.hook_packages.terraform.hooks.prepare.fingerprint import (
+    TERRAFORM_DATA_DIR,
+    TERRAFORM_PREPARE_CACHE_ENV_VAR,
+    clear_cache,
+    compute_fingerprint,
+    is_plan_cache_enabled,
+    is_prepare_cache_enabled,
+    load_cached_fingerprint,
+    load_cached_plan,
+    save_cached_plan,
+    save_fingerprint,
+)
+from samcli.hook_packages.terraform.hooks.prepare.plan_json import load_plan_json
 from samcli.hook_packages.terraform.hooks.prepare.translate import translate_to_cfn
 from samcli.lib.hook.exceptions import (
     PrepareHookException,
@@ -102,13 +115,48 @@ def prepare(params: dict) -> dict:
         LOG.info("Skipping preparation stage, the metadata file already exists at %s", metadata_file_path)
     else:
         try:
+            fingerprint = None
+            cached_fingerprint = None
+            if is_prepare_cache_enabled():
+                fingerprint = compute_fingerprint(
+                    terraform_application_dir, project_root_dir, output_dir_path, plan_file
+                )
+                cached_fingerprint = load_cached_fingerprint(output_dir_path)
+
+            reuse_plan = bool(fingerprint and is_plan_cache_enabled())
+            if reuse_plan and fingerprint == cached_fingerprint and os.path.exists(metadata_file_path):
+                LOG.warning(
+                    "Terraform project is unchanged since the last preparation, reusing the metadata file at %s. "
+                    "Changes to a remote state or to data sources are not detected, unset %s to generate the plan "
+                    "again.",
+                    metadata_file_path,
+                    TERRAFORM_PREPARE_CACHE_ENV_VAR,
+                )
+                return {"iac_applications": {"MainApplication": {"metadata_file": metadata_file_path}}}
+
+            tf_json = None
+            if reuse_plan and cached_fingerprint and fingerprint.sources == cached_fingerprint.sources:
+                tf_json = load_cached_plan(output_dir_path)
+                if tf_json is not None:
+                    LOG.warning(
+                        "Terraform project is unchanged since the last preparation, reusing the Terraform plan. "
+                        "Changes to a remote state or to data sources are not detected, unset %s to generate the "
+                        "plan again.",
+                        TERRAFORM_PREPARE_CACHE_ENV_VAR,
+                    )
+
             # initialize terraform application
-            if not plan_file:
-                tf_json = _generate_plan_file(skip_prepare_infra, terraform_application_dir)
-            else:
+            if tf_json is None and not plan_file:
+                skip_init = bool(
+                    fingerprint
+                    and cached_fingerprint
+                    and fingerprint.init == cached_fingerprint.init
+                    and os.path.isdir(os.path.join(terraform_application_dir, TERRAFORM_DATA_DIR))
+                )
+                tf_json = _generate_plan_file(skip_prepare_infra, terraform_application_dir, skip_init)
+            elif tf_json is None:
                 LOG.info(f"Using provided plan file: {plan_file}")
-                with open(plan_file, "r") as f:
-                    tf_json = json.load(f)
+                tf_json = load_plan_json(plan_file)
 
             # convert terraform to cloudformation
             LOG.info("Generating metadata file")
@@ -126,10 +174,20 @@ def prepare(params: dict) -> dict:
             if not os.path.exists(output_dir_path):
                 os.makedirs(output_dir_path, exist_ok=True)
 
+            # drop the previous fingerprint first, so that a failure below never leaves a stale cache behind
+            if fingerprint:
+                clear_cache(output_dir_path)
+
             LOG.info("Finished generating metadata file. Storing in %s", metadata_file_path)
             with open(metadata_file_path, "w+") as metadata_file:
                 json.dump(cfn_dict, metadata_file)
 
+            if fingerprint:
+                # a customer provided plan file is already on disk, there is no need to keep a copy of it
+                if not plan_file:
+                    save_cached_plan(output_dir_path, tf_json)
+                save_fingerprint(output_dir_path, fingerprint)
+
         except OSError as e:
             raise PrepareHookException(f"OSError: {e}") from e
 
@@ -161,7 +219,7 @@ def _update_resources_paths(cfn_resources: Dict[str, Any], terraform_application
                     resource["Properties"][attribute] = str(Path(terraform_application_dir).joinpath(original_path))
 
 
-def _generate_plan_file(skip_prepare_infra: bool, terraform_application_dir: str) -> dict:
+def _generate_plan_file(skip_prepare_infra: bool, terraform_application_dir: str, skip_init: bool = False) -> dict:
     """
     Call the relevant Terraform commands to generate, load and return the Terraform plan file
     which the AWS SAM CLI will then parse to extract the fields required to run local emulators.
@@ -172,6 +230,9 @@ def _generate_plan_file(skip_prepare_infra: bool, terraform_application_dir: str
             Flag to skip skip prepare hook if we already have the metadata file. Default is False.
     terraform_application_dir: str
             The path where the hook can find the TF application.
+    skip_init: bool
+            Skip terraform init, as providers and modules did not change since the last preparation. If creating the
+            plan fails, the application is initialized and the plan created again.
     Returns
     -------
     dict
@@ -185,6 +246,12 @@ def _generate_plan_file(skip_prepare_infra: bool, terraform_application_dir: str
         if skip_prepare_infra
         else "Initializing Terraform application"
     )
+    if skip_init:
+        try:
+            return _run_plan_and_show(terraform_application_dir)
+        except (CalledProcessError, LoadingPatternError) as e:
+            LOG.debug("Creating the terraform plan without initializing the application failed: %s", e)
+
     LOG.info(log_msg)
     try:
         invoke_subprocess_with_loading_pattern(
@@ -195,25 +262,7 @@ def _generate_plan_file(skip_prepare_infra: bool, terraform_application_dir: str
             is_running_terraform_command=True,
         )
 
-        # get json output of terraform plan
-        LOG.info("Creating terraform plan and getting JSON output")
-        with osutils.tempfile_platform_independent() as temp_file:
-            invoke_subprocess_with_loading_pattern(
-                # input false to avoid SAM CLI to stuck in case if the
-                # Terraform project expects input, and customer does not provide it.
-                command_args={
-                    "args": ["terraform", "plan", "-out", temp_file.name, "-input=false"],
-                    "cwd": terraform_application_dir,
-                },
-                is_running_terraform_command=True,
-            )
-
-            result = run(
-                ["terraform", "show", "-json", temp_file.name],
-                check=True,
-                capture_output=True,
-                cwd=terraform_application_dir,
-            )
+        return _run_plan_and_show(terraform_application_dir)
     except CalledProcessError as e:
         stderr_output = str(e.stderr)
 
@@ -237,7 +286,45 @@ def _generate_plan_file(skip_prepare_infra: bool, terraform_application_dir: str
             raise TerraformCloudException(TF_CLOUD_HELP_MESSAGE)
         raise PrepareHookException(f"Error occurred when invoking a process:\n{e}") from e
 
-    return dict(json.loads(result.stdout))
+
+def _run_plan_and_show(terraform_application_dir: str) -> dict:
+    """
+    Creates the terraform plan of an initialized application and returns its JSON output
+
+    Parameters
+    ----------
+    terraform_application_dir: str
+            The path where the hook can find the TF application.
+    Returns
+    -------
+    dict
+        The Terraform plan file in JSON format
+    """
+    # get json output of terraform plan
+    LOG.info("Creating terraform plan and getting JSON output")
+    with osutils.tempfile_platform_independent() as temp_file, osutils.tempfile_platform_independent() as json_file:
+        invoke_subprocess_with_loading_pattern(
+            # input false to avoid SAM CLI to stuck in case if the
+            # Terraform project expects input, and customer does not provide it.
+            command_args={
+                "args": ["terraform", "plan", "-out", temp_file.name, "-input=false"],
+                "cwd": terraform_application_dir,
+            },
+            is_running_terraform_command=True,
+        )
+
+        # the JSON plan of large projects can be hundreds of MB, write it to a file instead of capturing it, so that
+        # only the sections used by the hook are loaded in memory
+        run(
+            ["terraform", "show", "-json", temp_file.name],
+            check=True,
+            stdout=json_file,
+            stderr=PIPE,
+            cwd=terraform_application_dir,
+        )
+        json_file.flush()
+
+        return load_plan_json(json_file.name)
 
 
 def _validate_environment_variables() -> None:
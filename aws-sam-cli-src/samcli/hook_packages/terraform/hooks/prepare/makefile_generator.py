@@ -4,6 +4,7 @@ Terraform Makefile and make rule generation
 This module generates the Makefile for the project and the rules for each of the Lambda functions found
 """
 
+import json
 import logging
 import os
 import shutil
@@ -21,6 +22,8 @@ LOG = logging.getLogger(__name__)
 TERRAFORM_BUILD_SCRIPT = "copy_terraform_built_artifacts.py"
 ZIP_UTILS_MODULE = "zip.py"
 TF_BACKEND_OVERRIDE_FILENAME = "z_samcli_backend_override"
+# read by the build script to apply all the sam metadata resources at once, see SAM_CLI_TERRAFORM_BATCH_BUILD
+SAM_METADATA_TARGETS_FILENAME = "sam_metadata_targets.json"
 
 
 def generate_makefile_rule_for_lambda_resource(
@@ -65,6 +68,7 @@ def generate_makefile_rule_for_lambda_resource(
 def generate_makefile(
     makefile_rules: List[str],
     output_directory_path: str,
+    sam_metadata_targets: Optional[List[str]] = None,
 ) -> None:
     """
     Generates a makefile with the given rules in the given directory
@@ -75,6 +79,9 @@ def generate_makefile(
         the list of rules to write in the Makefile
     output_directory_path: str
         the output directory path to write the generated makefile
+    sam_metadata_targets: Optional[List[str]]
+        the addresses of the sam metadata resources the rules apply, used by the build script to apply them all in a
+        single terraform apply
     """
 
     # create output directory if it doesn't exist
@@ -96,6 +103,9 @@ def generate_makefile(
     ZIP_UTILS_MODULE_script_path = os.path.join(samcli_root_path, "local", "lambdafn", ZIP_UTILS_MODULE)
     shutil.copy(ZIP_UTILS_MODULE_script_path, output_directory_path)
 
+    # list the sam metadata resources for the batched build
+    _generate_sam_metadata_targets_file(sam_metadata_targets or [], output_directory_path)
+
     # create makefile
     makefile_path = os.path.join(output_directory_path, "Makefile")
     with open(makefile_path, "w+") as makefile:
@@ -118,6 +128,23 @@ def _generate_backend_override_file(output_directory_path: str):
         f.write(override_content)
 
 
+def _generate_sam_metadata_targets_file(sam_metadata_targets: List[str], output_directory_path: str):
+    """
+    Generates the file listing the addresses of the sam metadata resources built by the Makefile rules
+
+    Parameters
+    ----------
+    sam_metadata_targets: List[str]
+        the addresses of the sam metadata resources
+    output_directory_path: str
+        the output directory path to write the generated file
+    """
+    targets_file_path = os.path.join(output_directory_path, SAM_METADATA_TARGETS_FILENAME)
+    with open(targets_file_path, "w+") as f:
+        # keep the order stable, and each target once, even if it builds several functions
+        json.dump(list(dict.fromkeys(sam_metadata_targets)), f)
+
+
 def _build_makerule_python_command(
     python_command_name: str,
     output_dir: str,
@@ -0,0 +1,144 @@
+"""
+Loading of the `terraform show -json` output
+
+The JSON plan of a large workspace can be hundreds of MB, most of it in the prior state and resource changes sections
+that the prepare hook does not use. Instead of decoding the whole document, the top level object is scanned in place
+through a memory map, and only the sections the hook needs are decoded.
+"""
+
+import json
+import logging
+import mmap
+import re
+from typing import Collection, Dict
+
+LOG = logging.getLogger(__name__)
+
+# Top level sections of the JSON plan used to translate the Terraform project
+PLAN_SECTIONS_USED_BY_HOOK = ("planned_values", "configuration", "variables")
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# everything up to, and including, the next bracket outside of a string. Strings are matched as a whole so that
+# brackets inside of them are skipped, and the pattern is unambiguous so that it never backtracks.
+_UP_TO_NEXT_BRACKET = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*[\[\]{}]', re.DOTALL)
+_SCALAR_END = re.compile(rb"[,}\] \t\n\r]")
+
+_QUOTE = ord('"')
+_OPENING_BRACKETS = (ord("{"), ord("["))
+
+
+def load_plan_json(plan_json_path: str, sections: Collection[str] = PLAN_SECTIONS_USED_BY_HOOK) -> Dict:
+    """
+    Loads the given top level sections of a JSON plan file, without decoding the other sections
+
+    Parameters
+    ----------
+    plan_json_path: str
+        Path of the file with the output of `terraform show -json`
+    sections: Collection[str]
+        Top level keys of the plan to load
+
+    Returns
+    -------
+    dict
+        The plan, reduced to the requested sections
+
+    Raises
+    ------
+    ValueError
+        When the file is not a JSON object
+    """
+    with open(plan_json_path, "rb") as plan_json_file:
+        try:
+            plan_json_buffer = mmap.mmap(plan_json_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can not be memory mapped
+            return _load_sections_from_document(plan_json_file.read(), sections)
+
+        with plan_json_buffer:
+            return _load_sections(plan_json_buffer, sections)
+
+
+def _load_sections_from_document(document: bytes, sections: Collection[str]) -> Dict:
+    plan = json.loads(document)
+    if not isinstance(plan, dict):
+        raise ValueError("The Terraform plan JSON output is not an object")
+    return {key: value for key, value in plan.items() if key in sections}
+
+
+def _load_sections(buffer, sections: Collection[str]) -> Dict:
+    """
+    Scans the top level object in the buffer, and decodes the values of the requested keys only
+    """
+    result = {}
+    position = _skip_whitespace(buffer, 0)
+    _expect(buffer, position, b"{")
+    position = _skip_whitespace(buffer, position + 1)
+    if buffer[position : position + 1] == b"}":
+        return result
+
+    while True:
+        key_match = _STRING.match(buffer, position)
+        if key_match is None:
+            raise ValueError(f"Expected a key in the Terraform plan JSON output at position {position}")
+        key = json.loads(key_match.group())
+
+        position = _skip_whitespace(buffer, key_match.end())
+        _expect(buffer, position, b":")
+        value_start = _skip_whitespace(buffer, position + 1)
+        value_end = _find_value_end(buffer, value_start)
+
+        if key in sections:
+            result[key] = json.loads(buffer[value_start:value_end])
+        else:
+            LOG.debug("Skipping the %s section of the Terraform plan", key)
+
+        position = _skip_whitespace(buffer, value_end)
+        separator = buffer[position : position + 1]
+        if separator == b"}":
+            return result
+        _expect(buffer, position, b",")
+        position = _skip_whitespace(buffer, position + 1)
+
+
+def _find_value_end(buffer, position: int) -> int:
+    """
+    Returns the position right after the JSON value starting at the given position
+    """
+    if position >= len(buffer):
+        raise ValueError("Unexpected end of the Terraform plan JSON output")
+
+    first_character = buffer[position]
+    if first_character == _QUOTE:
+        string_match = _STRING.match(buffer, position)
+        if string_match is None:
+            raise ValueError(f"Unterminated string in the Terraform plan JSON output at position {position}")
+        return string_match.end()
+
+    if first_character in _OPENING_BRACKETS:
+        depth = 0
+        for token in _UP_TO_NEXT_BRACKET.finditer(buffer, position):
+            if buffer[token.end() - 1] in _OPENING_BRACKETS:
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 0:
+                return token.end()
+        raise ValueError(f"Unterminated value in the Terraform plan JSON output at position {position}")
+
+    scalar_end = _SCALAR_END.search(buffer, position)
+    return scalar_end.start() if scalar_end else len(buffer)
+
+
+def _skip_whitespace(buffer, position: int) -> int:
+    whitespace = _WHITESPACE.match(buffer, position)
+    return whitespace.end() if whitespace else position
+
+
+def _expect(buffer, position: int, expected: bytes) -> None:
+    if buffer[position : position + 1] != expected:
+        raise ValueError(
+            f"Expected {expected.decode()} in the Terraform plan JSON output at position {position}, "
+            f"found {buffer[position:position + 1]!r}"
+        )
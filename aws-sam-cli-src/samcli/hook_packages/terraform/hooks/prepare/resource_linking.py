@@ -6,7 +6,7 @@ e.g. linking layers to functions
 import logging
 import re
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Type, Union
+from typing import Callable, Dict, List, Optional, Tuple, Type, Union
 
 from samcli.hook_packages.terraform.hooks.prepare.constants import TF_AWS_API_GATEWAY_REST_API
 from samcli.hook_packages.terraform.hooks.prepare.exceptions import (
@@ -87,6 +87,19 @@ DATA_RESOURCE_ADDRESS_PREFIX = "data."
 LOG = logging.getLogger(__name__)
 
 
+def _get_cached_resolution(
+    module: TFModule, key: Tuple[str, str]
+) -> Optional[List[Union[ConstantValue, ResolvedReference]]]:
+    """
+    Returns a copy of the values of the module output or variable resolved earlier in the translation, if any.
+    Resolving a value walks through the parent and child modules, and every linking function resolves the same
+    outputs and variables again, so the results are kept on the module, see TFModule.resolved_values.
+    """
+    cached = module.resolved_values.get(key)
+    # callers extend the returned list, hand them a copy
+    return list(cached) if cached is not None else None
+
+
 def _default_tf_destination_value_id_extractor(value: str) -> str:
     """
     The default function to extract the Terraform destination resource id from the linking property value. The logic of
@@ -165,9 +178,12 @@ class ResourceLinkingPair:
 
 class ResourceLinker:
     _resource_pair: ResourceLinkingPair
+    # destination linking field value -> (destination logical id, destination resource type)
+    _destination_linking_attributes_mapping: Optional[Dict[str, Tuple[str, str]]]
 
     def __init__(self, resource_pair):
         self._resource_pair = resource_pair
+        self._destination_linking_attributes_mapping = None
 
     def link_resources(self) -> None:
         """
@@ -331,6 +347,41 @@ class ResourceLinker:
             self._resource_pair.tf_destination_value_extractor_from_link_field_value_function(value) for value in values
         ]
 
+        child_resources_linking_attributes_logical_id_mapping = self._get_destination_linking_attributes_mapping()
+
+        dest_resources: List[ReferenceType] = [
+            (
+                LogicalIdReference(
+                    value=child_resources_linking_attributes_logical_id_mapping[value][0],
+                    resource_type=child_resources_linking_attributes_logical_id_mapping[value][1],
+                )
+                if value in child_resources_linking_attributes_logical_id_mapping
+                else ExistingResourceReference(value)
+            )
+            for value in values
+        ]
+
+        if not dest_resources:
+            LOG.debug("Skipping linking call back, no destination resources discovered.")
+            return
+
+        LOG.debug("The value of the source resource linking field after mapping %s", dest_resources)
+        self._resource_pair.cfn_resource_update_call_back_function(cfn_resource, dest_resources)
+
+    def _get_destination_linking_attributes_mapping(self) -> Dict[str, Tuple[str, str]]:
+        """
+        Builds the map between the destination resources linking field values, and the resources' logical ids and
+        types. The destination resources do not change while linking, so the map is built once for the resource pair
+        and reused for every applied source resource.
+
+        Returns
+        --------
+        Dict[str, Tuple[str, str]]:
+            The destination linking field values mapped to the destination resources logical ids and types
+        """
+        if self._destination_linking_attributes_mapping is not None:
+            return self._destination_linking_attributes_mapping
+
         # build map between the destination linking field property values, and resources' logical ids
         expected_destinations_map = {
             expected_destination.terraform_resource_type_prefix: expected_destination.terraform_attribute_name
@@ -357,24 +408,8 @@ class ResourceLinker:
             child_resources_linking_attributes_logical_id_mapping,
         )
 
-        dest_resources: List[ReferenceType] = [
-            (
-                LogicalIdReference(
-                    value=child_resources_linking_attributes_logical_id_mapping[value][0],
-                    resource_type=child_resources_linking_attributes_logical_id_mapping[value][1],
-                )
-                if value in child_resources_linking_attributes_logical_id_mapping
-                else ExistingResourceReference(value)
-            )
-            for value in values
-        ]
-
-        if not dest_resources:
-            LOG.debug("Skipping linking call back, no destination resources discovered.")
-            return
-
-        LOG.debug("The value of the source resource linking field after mapping %s", dest_resources)
-        self._resource_pair.cfn_resource_update_call_back_function(cfn_resource, dest_resources)
+        self._destination_linking_attributes_mapping = child_resources_linking_attributes_logical_id_mapping
+        return child_resources_linking_attributes_logical_id_mapping
 
     def _process_resolved_resources(
         self,
@@ -822,6 +857,11 @@ def _resolve_module_output(module: TFModule, output_name: str) -> List[Union[Con
     List[Union[ConstantValue, ResolvedReference]]
         A list of resolved values
     """
+    cache_key = ("output", output_name)
+    cached_results = _get_cached_resolution(module, cache_key)
+    if cached_results is not None:
+        return cached_results
+
     results: List[Union[ConstantValue, ResolvedReference]] = []
 
     output = module.outputs.get(output_name)
@@ -902,12 +942,18 @@ def _resolve_module_output(module: TFModule, output_name: str) -> List[Union[Con
 
                 results.append(ResolvedReference(reference, module.full_address))
 
+    module.resolved_values[cache_key] = list(results)
     return results
 
 
 def _resolve_module_variable(module: TFModule, variable_name: str) -> List[Union[ConstantValue, ResolvedReference]]:
     # return a list of the values that resolve the passed variable
     # name in the input module.
+    cache_key = ("variable", variable_name)
+    cached_results = _get_cached_resolution(module, cache_key)
+    if cached_results is not None:
+        return cached_results
+
     results: List[Union[ConstantValue, ResolvedReference]] = []
 
     LOG.debug("Resolving module variable for module (%s) and variable (%s)", module.module_name, variable_name)
@@ -957,6 +1003,7 @@ def _resolve_module_variable(module: TFModule, variable_name: str) -> List[Union
             else:
                 raise InvalidResourceLinkingException("Resource linking entered an invalid state.")
 
+    module.resolved_values[cache_key] = list(results)
     return results
 
 
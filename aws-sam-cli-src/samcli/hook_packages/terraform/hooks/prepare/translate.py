@@ -6,6 +6,7 @@ This method contains the logic required to translate the `terraform show` JSON o
 
 import hashlib
 import logging
+from collections import deque
 from typing import Any, Dict, Iterator, List, Tuple, Type, Union
 
 from samcli.hook_packages.terraform.hooks.prepare.constants import (
@@ -90,65 +91,53 @@ def _get_modules(root_module: dict, root_tf_module: TFModule) -> Iterator[Tuple[
     Tuple[dict, TFModule]
         A tuple of the current module's planned values and TFModule representation of configuration values
     """
-    queue = [(root_module, root_tf_module)]
+    queue = deque([(root_module, root_tf_module)])
 
     while queue:
-        modules = queue.pop(0)
+        modules = queue.popleft()
 
         yield modules
 
         _add_child_modules_to_queue(*modules, queue)
 
 
-def _check_unresolvable_values(root_module: dict, root_tf_module: TFModule) -> None:
+def _check_unresolvable_values(
+    translated_properties: dict, property_builder_mapping: PropertyBuilderMapping, config_resource: TFResource
+) -> bool:
     """
-    Checks the planned values and configuration values if there are any properties
-    that are unresolved, or unknown, until the Terraform project is applied.
+    Checks if any of the translated properties of a resource is unresolved, or unknown, until the Terraform project
+    is applied, and warns about it. A property is unresolved when the planned values do not have it, but the
+    configuration values do.
 
     Parameters
     ----------
-    root_module: dict
-        The root level planned values dictionary
-    root_tf_module: TFModule
-        The TFModule class representation of the configuration values
-    """
-
-    for curr_module, curr_tf_module in _get_modules(root_module, root_tf_module):
-        # iterate over resources for current module
-        for resource in curr_module.get("resources", []):
-            resource_type = resource.get("type")
-            resource_name = resource.get("name")
-            resource_mode = resource.get("mode")
-
-            resource_mapper = RESOURCE_TRANSLATOR_MAPPING.get(resource_type)
-            if not resource_mapper:
-                continue
+    translated_properties: dict
+        The CloudFormation properties translated from the planned values of the resource
+    property_builder_mapping: PropertyBuilderMapping
+        A mapping of the CloudFormation property name to a function for building that property
+    config_resource: TFResource
+        The terraform configuration resource
 
-            resource_values = resource.get("values")
-            resource_address = (
-                f"data.{resource_type}.{resource_name}"
-                if resource_mode == "data"
-                else f"{resource_type}.{resource_name}"
+    Returns
+    -------
+    bool
+        True if an unresolvable property was found, and the warning was logged
+    """
+    for cfn_property_name, prop_builder in property_builder_mapping.items():
+        if translated_properties.get(cfn_property_name):
+            continue
+
+        config_values = prop_builder(config_resource.attributes, config_resource)
+        if config_values:
+            LOG.warning(
+                Colored().color_log(
+                    msg="\nUnresolvable attributes discovered in project, run terraform apply to resolve them.\n",
+                    color=Colors.WARNING,
+                ),
+                extra=dict(markup=True),
             )
-
-            config_resource_address = get_configuration_address(resource_address)
-            config_resource = curr_tf_module.resources[config_resource_address]
-
-            for prop_builder in resource_mapper.property_builder_mapping.values():
-                planned_values = prop_builder(resource_values, config_resource)
-                config_values = prop_builder(config_resource.attributes, config_resource)
-
-                if config_values and not planned_values:
-                    LOG.warning(
-                        Colored().color_log(
-                            msg="\nUnresolvable attributes discovered in project, "
-                            "run terraform apply to resolve them.\n",
-                            color=Colors.WARNING,
-                        ),
-                        extra=dict(markup=True),
-                    )
-
-                    return
+            return True
+    return False
 
 
 def translate_to_cfn(
@@ -200,7 +189,8 @@ def translate_to_cfn(
 
     resource_property_mapping: Dict[str, ResourceProperties] = get_resource_property_mapping()
 
-    _check_unresolvable_values(root_module, root_tf_module)
+    # the unresolvable values warning is logged once, so the check stops after the first finding
+    unresolvable_values_found = False
 
     # create and iterate over queue of modules to handle child modules
     for curr_module, curr_tf_module in _get_modules(root_module, root_tf_module):
@@ -275,6 +265,10 @@ def translate_to_cfn(
             translated_properties = _translate_properties(
                 resource_values, resource_translator.property_builder_mapping, config_resource
             )
+            if not unresolvable_values_found:
+                unresolvable_values_found = _check_unresolvable_values(
+                    translated_properties, resource_translator.property_builder_mapping, config_resource
+                )
             translated_resource: Dict = {
                 "Type": resource_translator.cfn_name,
                 "Properties": translated_properties,
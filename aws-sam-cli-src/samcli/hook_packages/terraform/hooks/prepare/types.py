@@ -2,7 +2,7 @@
 
 from abc import ABC
 from copy import deepcopy
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 
 from samcli.hook_packages.terraform.hooks.prepare.utilities import get_configuration_address
@@ -37,6 +37,10 @@ class TFModule:
     resources: Dict[str, "TFResource"]
     child_modules: Dict[str, "TFModule"]
     outputs: Dict[str, Expression]
+    # ("output" or "variable", name) -> values resolved so far, the module tree is built for a single translation
+    resolved_values: Dict[Tuple[str, str], List[Union[ConstantValue, ResolvedReference]]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
 
     # current module's + all child modules' resources
     def get_all_resources(self) -> List["TFResource"]:
@@ -0,0 +1,101 @@
+"""
+Matching of request and response mimetypes against the BinaryMediaTypes of an Api
+"""
+
+import threading
+from typing import Dict, FrozenSet, Iterable, Optional, Union
+
+ANY_MEDIA_TYPE = "*/*"
+
+
+class BinaryMediaTypeMatcher:
+    """
+    Compiled form of an Api's BinaryMediaTypes. Media types are split in three tiers:
+
+    * ``*/*`` which matches every mimetype
+    * exact media types, e.g. ``image/png``
+    * wildcard subtypes, e.g. ``image/*``
+
+    The result for every distinct mimetype is memoized, so each request only pays for a dict lookup.
+    """
+
+    # Bound on the memoized mimetypes, which come from request and response headers
+    _MAX_CACHED_MIMETYPES = 1024
+
+    def __init__(self, binary_media_types: Optional[Iterable[str]]):
+        """
+        Parameters
+        ----------
+        binary_media_types Iterable[str]
+            BinaryMediaTypes of the Api, as parsed from the template
+        """
+        media_types = {_normalize(media_type) for media_type in binary_media_types or [] if media_type}
+
+        self.matches_any: bool = ANY_MEDIA_TYPE in media_types
+        self.exact_types: FrozenSet[str] = frozenset(
+            media_type for media_type in media_types if not media_type.endswith("/*")
+        )
+        self.wildcard_types: FrozenSet[str] = frozenset(
+            media_type[:-2] for media_type in media_types if media_type.endswith("/*") and media_type != ANY_MEDIA_TYPE
+        )
+
+        self._cache: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def matches(self, mimetype: Optional[str]) -> bool:
+        """
+        Checks if the given mimetype is one of the binary media types
+
+        Parameters
+        ----------
+        mimetype str
+            Mimetype of a request or a response, parameters (e.g. charset) are ignored
+
+        Returns
+        -------
+        bool
+            True if the mimetype is binary for this Api
+        """
+        if self.matches_any:
+            return True
+        if not mimetype:
+            return False
+
+        cached = self._cache.get(mimetype)
+        if cached is not None:
+            return cached
+
+        normalized = _normalize(mimetype)
+        result = normalized in self.exact_types or normalized.split("/", 1)[0] in self.wildcard_types
+
+        with self._lock:
+            if len(self._cache) >= self._MAX_CACHED_MIMETYPES:
+                self._cache.clear()
+            self._cache[mimetype] = result
+        return result
+
+
+def get_binary_media_type_matcher(
+    binary_types: Union[BinaryMediaTypeMatcher, Optional[Iterable[str]]],
+) -> BinaryMediaTypeMatcher:
+    """
+    Returns the given matcher, or compiles one from a list of binary media types
+
+    Parameters
+    ----------
+    binary_types BinaryMediaTypeMatcher or list(str)
+        Either an already compiled matcher, or the BinaryMediaTypes of an Api
+
+    Returns
+    -------
+    BinaryMediaTypeMatcher
+        Matcher for the binary media types
+    """
+    if isinstance(binary_types, BinaryMediaTypeMatcher):
+        return binary_types
+    return BinaryMediaTypeMatcher(binary_types)
+
+
+def _normalize(mimetype: str) -> str:
+    # Mimetypes are case insensitive, and parameters such as charset do not take part in the match
+    return mimetype.split(";", 1)[0].strip().lower()
@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from time import time
 from typing import Any, Dict
 
+from samcli.local.apigw.binary_media_types import get_binary_media_type_matcher
 from samcli.local.apigw.path_converter import PathConverter
 from samcli.local.apigw.route import Route
 from samcli.local.events.api_event import (
@@ -31,7 +32,7 @@ def construct_v1_event(
 
     :param request flask_request: Flask Request
     :param port: the port number
-    :param binary_types: list of binary types
+    :param binary_types: list of binary types, or the BinaryMediaTypeMatcher compiled from it
     :param stage_name: Optional, the stage name string
     :param stage_variables: Optional, API Gateway Stage Variables
     :param api_type: Optional, the type of api payload being constructed
@@ -114,7 +115,7 @@ def construct_v2_event_http(
 
     :param request flask_request: Flask Request
     :param port: the port number
-    :param binary_types: list of binary types
+    :param binary_types: list of binary types, or the BinaryMediaTypeMatcher compiled from it
     :param stage_name: Optional, the stage name string
     :param stage_variables: Optional, API Gateway Stage Variables
     :param route_key: Optional, the route key for the route
@@ -185,18 +186,13 @@ def _query_string_params(flask_request):
     query_string_dict = {}
     multi_value_query_string_dict = {}
 
-    # Flask returns an ImmutableMultiDict so convert to a dictionary that becomes
-    # a dict(str: list) then iterate over
+    # Flask returns an ImmutableMultiDict, lists() walks it once yielding every key with all of its values
     for query_string_key, query_string_list in flask_request.args.lists():
-        query_string_value_length = len(query_string_list)
-
         # if the list is empty, default to empty string
-        if not query_string_value_length:
-            query_string_dict[query_string_key] = ""
-            multi_value_query_string_dict[query_string_key] = [""]
-        else:
-            query_string_dict[query_string_key] = query_string_list[-1]
-            multi_value_query_string_dict[query_string_key] = query_string_list
+        values = query_string_list or [""]
+
+        query_string_dict[query_string_key] = values[-1]
+        multi_value_query_string_dict[query_string_key] = values
 
     return query_string_dict, multi_value_query_string_dict
 
@@ -251,9 +247,12 @@ def _event_headers(flask_request, port):
 
     # Multi-value request headers is not really supported by Flask.
     # See https://github.com/pallets/flask/issues/850
-    for header_key in flask_request.headers.keys():
-        headers_dict[header_key] = flask_request.headers.get(header_key)
-        multi_value_headers_dict[header_key] = flask_request.headers.getlist(header_key)
+    # Iterating the headers walks the WSGI environ once. Looking every key up again with get() and getlist()
+    # would walk it once per key, which is quadratic in the number of headers.
+    for header_key, header_value in flask_request.headers.items():
+        multi_value_headers_dict.setdefault(header_key, []).append(header_value)
+        # keep the first value, as headers.get() would
+        headers_dict.setdefault(header_key, header_value)
 
     headers_dict["X-Forwarded-Proto"] = flask_request.scheme
     multi_value_headers_dict["X-Forwarded-Proto"] = [flask_request.scheme]
@@ -279,10 +278,8 @@ def _event_http_cookies(flask_request):
         Returns a list of cookies
 
     """
-    cookies = []
-    for cookie_key in flask_request.cookies.keys():
-        cookies.append(f"{cookie_key}={flask_request.cookies.get(cookie_key)}")
-    return cookies
+    # items() yields the first value of every cookie name, as cookies.get() would
+    return [f"{cookie_key}={cookie_value}" for cookie_key, cookie_value in flask_request.cookies.items()]
 
 
 def _event_http_headers(flask_request, port):
@@ -304,8 +301,9 @@ def _event_http_headers(flask_request, port):
     headers = {}
     # Multi-value request headers is not really supported by Flask.
     # See https://github.com/pallets/flask/issues/850
-    for header_key in flask_request.headers.keys():
-        headers[header_key] = flask_request.headers.get(header_key)
+    # Single pass over the WSGI environ, keeping the first value of each header as headers.get() would
+    for header_key, header_value in flask_request.headers.items():
+        headers.setdefault(header_key, header_value)
 
     headers["X-Forwarded-Proto"] = flask_request.scheme
     headers["X-Forwarded-Port"] = str(port)
@@ -318,8 +316,8 @@ def _should_base64_encode(binary_types, request_mimetype):
 
     Parameters
     ----------
-    binary_types list(basestring)
-        Corresponds to self.binary_types (aka. what is parsed from SAM Template
+    binary_types list(basestring) or BinaryMediaTypeMatcher
+        Corresponds to self.binary_types (aka. what is parsed from SAM Template), or the matcher compiled from it
     request_mimetype str
         Mimetype for the request
 
@@ -328,4 +326,4 @@ def _should_base64_encode(binary_types, request_mimetype):
         True if the data should be encoded to Base64 otherwise False
 
     """
-    return request_mimetype in binary_types or "*/*" in binary_types
+    return get_binary_media_type_matcher(binary_types).matches(request_mimetype)
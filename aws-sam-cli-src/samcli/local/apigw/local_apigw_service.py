@@ -21,6 +21,7 @@ from samcli.lib.telemetry.event import EventName, EventTracker, UsedFeature
 from samcli.lib.utils.stream_writer import StreamWriter
 from samcli.local.apigw.authorizers.authorizer import Authorizer
 from samcli.local.apigw.authorizers.lambda_authorizer import LambdaAuthorizer
+from samcli.local.apigw.binary_media_types import BinaryMediaTypeMatcher, get_binary_media_type_matcher
 from samcli.local.apigw.event_constructor import construct_v1_event, construct_v2_event_http
 from samcli.local.apigw.exceptions import (
     AuthorizerUnauthorizedRequest,
@@ -32,7 +33,8 @@ from samcli.local.apigw.exceptions import (
 from samcli.local.apigw.path_converter import PathConverter
 from samcli.local.apigw.route import Route
 from samcli.local.apigw.service_error_responses import ServiceErrorResponses
-from samcli.local.docker.exceptions import DockerContainerCreationFailedException
+from samcli.local.apigw.static_files import StaticFileHandler
+from samcli.local.docker.exceptions import ContainerThrottledException, DockerContainerCreationFailedException
 from samcli.local.events.api_event import (
     ContextHTTP,
     ContextIdentity,
@@ -41,6 +43,7 @@ from samcli.local.events.api_event import (
 )
 from samcli.local.lambdafn.exceptions import FunctionNotFound
 from samcli.local.services.base_local_service import BaseLocalService, LambdaOutputParser
+from samcli.local.services.invoke_metrics import timed_phase
 
 LOG = logging.getLogger(__name__)
 
@@ -99,6 +102,8 @@ class LocalApigwService(BaseLocalService):
         self.lambda_runner = lambda_runner
         self.static_dir = static_dir
         self._dict_of_routes: Dict[str, Route] = {}
+        # compiled once, used to decide both request encoding and response decoding
+        self._binary_media_type_matcher = BinaryMediaTypeMatcher(api.binary_media_types)
         self.stderr = stderr
 
         self._click_session_id = None
@@ -133,10 +138,16 @@ class LocalApigwService(BaseLocalService):
         # Prevent the dev server from emitting headers that will make the browser cache response by default
         self._app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 0
 
+        # Browsers still revalidate every asset, so serve them with ETags, ranges and precompressed siblings
+        if self._app.has_static_folder:
+            self._app.view_functions["static"] = StaticFileHandler(self._app.static_folder).serve
+
         # This will normalize all endpoints and strip any trailing '/'
         self._app.url_map.strict_slashes = False
         default_route = None
 
+        self._setup_invoke_metrics("start-api")
+
         for api_gateway_route in self.api.routes:
             if api_gateway_route.path == "$default":
                 default_route = api_gateway_route
@@ -464,7 +475,7 @@ class LocalApigwService(BaseLocalService):
             return construct_v2_event_http(
                 flask_request=flask_request,
                 port=self.port,
-                binary_types=self.api.binary_media_types,
+                binary_types=self._binary_media_type_matcher,
                 stage_name=self.api.stage_name,
                 stage_variables=self.api.stage_variables,
                 route_key=route_key,
@@ -476,7 +487,7 @@ class LocalApigwService(BaseLocalService):
         return construct_v1_event(
             flask_request=flask_request,
             port=self.port,
-            binary_types=self.api.binary_media_types,
+            binary_types=self._binary_media_type_matcher,
             stage_name=self.api.stage_name,
             stage_variables=self.api.stage_variables,
             operation_name=route_key,
@@ -679,11 +690,12 @@ class LocalApigwService(BaseLocalService):
             return ServiceErrorResponses.missing_lambda_auth_identity_sources()
 
         try:
-            route_lambda_event = self._generate_lambda_event(request, route, method, endpoint)
-            auth_lambda_event = None
+            with timed_phase("event_construction"):
+                route_lambda_event = self._generate_lambda_event(request, route, method, endpoint)
+                auth_lambda_event = None
 
-            if lambda_authorizer:
-                auth_lambda_event = self._generate_lambda_authorizer_event(request, route, lambda_authorizer)
+                if lambda_authorizer:
+                    auth_lambda_event = self._generate_lambda_authorizer_event(request, route, lambda_authorizer)
         except UnicodeDecodeError as error:
             LOG.error("UnicodeDecodeError while processing HTTP request: %s", error)
             return ServiceErrorResponses.lambda_failure_response()
@@ -693,13 +705,19 @@ class LocalApigwService(BaseLocalService):
             auth_service_error = None
 
             if lambda_authorizer:
-                self._invoke_parse_lambda_authorizer(lambda_authorizer, auth_lambda_event, route_lambda_event, route)
+                with timed_phase("authorizer"):
+                    self._invoke_parse_lambda_authorizer(
+                        lambda_authorizer, auth_lambda_event, route_lambda_event, route
+                    )
         except AuthorizerUnauthorizedRequest as ex:
             auth_service_error = ServiceErrorResponses.lambda_authorizer_unauthorized()
             lambda_authorizer_exception = ex
         except InvalidLambdaAuthorizerResponse as ex:
             auth_service_error = ServiceErrorResponses.lambda_failure_response()
             lambda_authorizer_exception = ex
+        except ContainerThrottledException as ex:
+            auth_service_error = ServiceErrorResponses.too_many_requests()
+            lambda_authorizer_exception = ex
         except FunctionNotFound as ex:
             lambda_authorizer_exception = ex
 
@@ -738,7 +756,8 @@ class LocalApigwService(BaseLocalService):
             tenant_id = request.headers.get("X-Amz-Tenant-Id")
 
             # invoke the route's Lambda function
-            lambda_response = self._invoke_lambda_function(route.function_name, route_lambda_event, tenant_id)
+            with timed_phase("lambda_invoke"):
+                lambda_response = self._invoke_lambda_function(route.function_name, route_lambda_event, tenant_id)
         except TenantIdValidationError as e:
             response_data = jsonify({"message": str(e)})
             endpoint_service_error = make_response(response_data, 400)  # HTTP 400 Bad Request
@@ -752,6 +771,9 @@ class LocalApigwService(BaseLocalService):
             endpoint_service_error = ServiceErrorResponses.lambda_body_failure_response()
         except DockerContainerCreationFailedException as ex:
             endpoint_service_error = ServiceErrorResponses.container_creation_failed(ex.message)
+        except ContainerThrottledException as ex:
+            LOG.warning("Function %s was throttled: %s", route.function_name, str(ex))
+            endpoint_service_error = ServiceErrorResponses.too_many_requests()
         except MissingFunctionNameException as ex:
             endpoint_service_error = ServiceErrorResponses.lambda_failure_response(
                 f"Failed to execute endpoint. Got an invalid function name ({str(ex)})",
@@ -761,16 +783,17 @@ class LocalApigwService(BaseLocalService):
             return endpoint_service_error
 
         try:
-            if route.event_type == Route.HTTP and (
-                not route.payload_format_version or route.payload_format_version == "2.0"
-            ):
-                (status_code, headers, body) = self._parse_v2_payload_format_lambda_output(
-                    lambda_response, self.api.binary_media_types, request
-                )
-            else:
-                (status_code, headers, body) = self._parse_v1_payload_format_lambda_output(
-                    lambda_response, self.api.binary_media_types, request, route.event_type
-                )
+            with timed_phase("output_parse"):
+                if route.event_type == Route.HTTP and (
+                    not route.payload_format_version or route.payload_format_version == "2.0"
+                ):
+                    (status_code, headers, body) = self._parse_v2_payload_format_lambda_output(
+                        lambda_response, self._binary_media_type_matcher, request
+                    )
+                else:
+                    (status_code, headers, body) = self._parse_v1_payload_format_lambda_output(
+                        lambda_response, self._binary_media_type_matcher, request, route.event_type
+                    )
         except LambdaResponseParseException as ex:
             LOG.error("Invalid lambda response received: %s", ex)
             return ServiceErrorResponses.lambda_failure_response()
@@ -859,7 +882,7 @@ class LocalApigwService(BaseLocalService):
         Parses the output from the Lambda Container
 
         :param str lambda_output: Output from Lambda Invoke
-        :param binary_types: list of binary types
+        :param binary_types: list of binary types, or the BinaryMediaTypeMatcher compiled from it
         :param flask_request: flash request object
         :param event_type: determines the route event type
         :return: Tuple(int, dict, str, bool)
@@ -962,7 +985,7 @@ class LocalApigwService(BaseLocalService):
         Parses the output from the Lambda Container. V2 Payload Format means that the event_type is only HTTP
 
         :param str lambda_output: Output from Lambda Invoke
-        :param binary_types: list of binary types
+        :param binary_types: list of binary types, or the BinaryMediaTypeMatcher compiled from it
         :param flask_request: flash request object
         :return: Tuple(int, dict, str, bool)
         """
@@ -1049,8 +1072,8 @@ class LocalApigwService(BaseLocalService):
 
         Parameters
         ----------
-        binary_types list(basestring)
-            Corresponds to self.binary_types (aka. what is parsed from SAM Template
+        binary_types list(basestring) or BinaryMediaTypeMatcher
+            Corresponds to self.binary_types (aka. what is parsed from SAM Template), or the matcher compiled from it
         flask_request flask.request
             Flask request
         lamba_response_headers werkzeug.datastructures.Headers
@@ -1064,9 +1087,12 @@ class LocalApigwService(BaseLocalService):
 
         """
         best_match_mimetype = flask_request.accept_mimetypes.best_match(lamba_response_headers.get_all("Content-Type"))
-        is_best_match_in_binary_types = best_match_mimetype in binary_types or "*/*" in binary_types
 
-        return best_match_mimetype and is_best_match_in_binary_types and is_base_64_encoded
+        return (
+            best_match_mimetype
+            and get_binary_media_type_matcher(binary_types).matches(best_match_mimetype)
+            and is_base_64_encoded
+        )
 
     @staticmethod
     def _merge_response_headers(headers, multi_headers):
@@ -13,12 +13,14 @@ class ServiceErrorResponses:
     _LAMBDA_FAILURE = {"message": "Internal server error"}
     _MISSING_LAMBDA_AUTH_IDENTITY_SOURCES = {"message": "Unauthorized"}
     _LAMBDA_AUTHORIZER_NOT_AUTHORIZED = {"message": "User is not authorized to access this resource"}
+    _TOO_MANY_REQUESTS = {"message": "Too Many Requests"}
 
     HTTP_STATUS_CODE_500 = 500
     HTTP_STATUS_CODE_501 = 501
     HTTP_STATUS_CODE_502 = 502
     HTTP_STATUS_CODE_403 = 403
     HTTP_STATUS_CODE_401 = 401
+    HTTP_STATUS_CODE_429 = 429
 
     @staticmethod
     def lambda_authorizer_unauthorized() -> Response:
@@ -110,3 +112,15 @@ class ServiceErrorResponses:
         """
         response_data = jsonify({"message": message})
         return make_response(response_data, ServiceErrorResponses.HTTP_STATUS_CODE_501)
+
+    @staticmethod
+    def too_many_requests(*args):
+        """
+        Constructs a Flask Response for when the Lambda function is throttled because its
+        container is busy and the request queue is full
+
+        :return: a Flask Response
+        """
+        LOG.debug("Lambda function throttled %s", args)
+        response_data = jsonify(ServiceErrorResponses._TOO_MANY_REQUESTS)
+        return make_response(response_data, ServiceErrorResponses.HTTP_STATUS_CODE_429)
@@ -0,0 +1,167 @@
+"""
+Serves the static files of sam local start-api
+"""
+
+import logging
+import mimetypes
+import os
+import stat
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from flask import request, send_file
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+LOG = logging.getLogger(__name__)
+
+# Precompressed siblings of a static file, in order of preference, as (Content-Encoding, file extension)
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class _StaticFileStat(NamedTuple):
+    path: str
+    mtime_ns: int
+    size: int
+    etag: str
+
+
+class _StaticFileEntry(NamedTuple):
+    file: _StaticFileStat
+    mimetype: str
+    # Content-Encoding of the file itself, e.g. gzip for a requested .gz file
+    encoding: Optional[str]
+    # Content-Encoding -> stat of the precompressed sibling
+    variants: Dict[str, _StaticFileStat]
+
+
+class StaticFileHandler:
+    """
+    Serves files from the static directory of start-api. Compared with the default Flask static view this
+
+    * derives ETags from the modification time and size of the file, instead of hashing or re-reading it
+    * answers conditional requests (If-None-Match/If-Modified-Since) with 304 and byte ranges with 206
+    * serves precompressed ``.br``/``.gz`` siblings to clients accepting those encodings
+
+    The file body is sent through ``wsgi.file_wrapper`` when the WSGI server provides one, which lets servers
+    supporting it transfer the file with sendfile.
+    """
+
+    def __init__(self, static_folder: str):
+        """
+        Parameters
+        ----------
+        static_folder str
+            Absolute path of the directory from which to serve static files
+        """
+        self.static_folder = static_folder
+        self._entries: Dict[str, _StaticFileEntry] = {}
+        self._lock = threading.Lock()
+
+    def serve(self, filename: str):
+        """
+        Flask view function serving ``filename`` from the static folder
+
+        Parameters
+        ----------
+        filename str
+            Path of the requested file, relative to the static folder
+
+        Returns
+        -------
+        flask.Response
+            Response with the file, or an empty 304/206/416 response depending on the request headers
+
+        Raises
+        ------
+        werkzeug.exceptions.NotFound
+            When the file is outside of the static folder or does not exist
+        """
+        path = safe_join(self.static_folder, filename)
+        if path is None:
+            raise NotFound()
+
+        entry = self._get_entry(path)
+        if entry is None:
+            raise NotFound()
+
+        served, encoding = self._select_variant(entry)
+        # each encoding is a different representation of the file, so it needs its own ETag
+        etag = "{}-{}".format(served.etag, encoding) if encoding else served.etag
+        response = send_file(
+            served.path,
+            mimetype=entry.mimetype,
+            download_name=os.path.basename(entry.file.path),
+            conditional=True,
+            etag=etag,
+            last_modified=served.mtime_ns / 1_000_000_000,
+        )
+
+        if encoding or entry.encoding:
+            # like the default Flask static view, a requested .gz/.br file is served with its encoding, so that
+            # clients decompress it instead of receiving the compressed bytes as text
+            response.headers["Content-Encoding"] = encoding or entry.encoding
+        if entry.variants:
+            response.vary.add("Accept-Encoding")
+        return response
+
+    def _get_entry(self, path: str) -> Optional[_StaticFileEntry]:
+        """
+        Returns the cached entry of the file, refreshed when the file changed since it was cached
+        """
+        file_stat = _stat_file(path)
+        if file_stat is None:
+            with self._lock:
+                self._entries.pop(path, None)
+            return None
+
+        entry = self._entries.get(path)
+        if entry and entry.file.mtime_ns == file_stat.mtime_ns and entry.file.size == file_stat.size:
+            return entry
+
+        mimetype, file_encoding = mimetypes.guess_type(path)
+        variants = {}
+        # a file which is already encoded is served as is
+        if not file_encoding:
+            for encoding, extension in PRECOMPRESSED_ENCODINGS:
+                variant_stat = _stat_file(path + extension)
+                # ignore stale siblings, which were not regenerated after the file changed
+                if variant_stat and variant_stat.mtime_ns >= file_stat.mtime_ns:
+                    variants[encoding] = variant_stat
+
+        entry = _StaticFileEntry(file_stat, mimetype or "application/octet-stream", file_encoding, variants)
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+
+    def _select_variant(self, entry: _StaticFileEntry) -> Tuple[_StaticFileStat, Optional[str]]:
+        """
+        Picks the precompressed sibling preferred by the client, falling back to the file itself
+        """
+        if not entry.variants:
+            return entry.file, None
+
+        accept_encodings = request.accept_encodings
+        for encoding, _ in PRECOMPRESSED_ENCODINGS:
+            variant = entry.variants.get(encoding)
+            if variant is None or accept_encodings[encoding] <= 0:
+                continue
+            # the sibling may have been regenerated or removed since it was cached
+            current = _stat_file(variant.path)
+            if current is not None:
+                return current, encoding
+
+        return entry.file, None
+
+
+def _stat_file(path: str) -> Optional[_StaticFileStat]:
+    try:
+        file_stat = os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+    if not stat.S_ISREG(file_stat.st_mode):
+        return None
+
+    etag = "{:x}-{:x}".format(file_stat.st_mtime_ns, file_stat.st_size)
+    return _StaticFileStat(path, file_stat.st_mtime_ns, file_stat.st_size, etag)
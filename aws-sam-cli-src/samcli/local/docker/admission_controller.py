@@ -0,0 +1,222 @@
+"""
+Admission control for the requests sent to a running Lambda container
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from samcli.local.docker.exceptions import ContainerThrottledException
+from samcli.local.services.invoke_metrics import INVOKE_METRICS, MetricFamily, timed_phase
+
+LOG = logging.getLogger(__name__)
+
+# Maximum number of requests allowed to wait for a busy container, unset or negative means unbounded
+CONTAINER_MAX_QUEUE_DEPTH_ENV_VAR = "SAM_CLI_CONTAINER_MAX_QUEUE_DEPTH"
+# Maximum number of seconds a request waits for a busy container, unset or negative means no timeout
+CONTAINER_QUEUE_TIMEOUT_ENV_VAR = "SAM_CLI_CONTAINER_QUEUE_TIMEOUT"
+
+
+def _read_limit(env_var: str, cast):
+    value = os.environ.get(env_var)
+    if value is None or value == "":
+        return None
+    try:
+        limit = cast(value)
+    except (TypeError, ValueError):
+        LOG.warning("Invalid %s value: %s, ignoring it", env_var, value)
+        return None
+    return limit if limit >= 0 else None
+
+
+class ContainerAdmissionController:
+    """
+    Admits up to ``max_concurrency`` concurrent requests into a container, and queues the rest. When the queue is
+    full, or a request waited longer than the queue timeout, the request is rejected with a
+    ContainerThrottledException, the same way Lambda throttles invocations with TooManyRequestsException.
+
+    The queue length, in flight requests, throttles and queue wait times are reported as metrics on the local
+    services metrics endpoint.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        function_name: str = "unknown",
+        max_queue_depth: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+    ):
+        """
+        Parameters
+        ----------
+        max_concurrency int
+            Number of requests the container can handle at the same time
+        function_name str
+            Name of the function running in the container, used as the metrics label
+        max_queue_depth int
+            Optional. Maximum number of requests waiting for the container. Defaults to the
+            SAM_CLI_CONTAINER_MAX_QUEUE_DEPTH environment variable, unbounded if it is not set
+        queue_timeout float
+            Optional. Maximum number of seconds a request waits for the container. Defaults to the
+            SAM_CLI_CONTAINER_QUEUE_TIMEOUT environment variable, no timeout if it is not set
+        """
+        self.max_concurrency = max_concurrency
+        self.function_name = function_name
+        self.max_queue_depth = (
+            max_queue_depth if max_queue_depth is not None else _read_limit(CONTAINER_MAX_QUEUE_DEPTH_ENV_VAR, int)
+        )
+        self.queue_timeout = (
+            queue_timeout if queue_timeout is not None else _read_limit(CONTAINER_QUEUE_TIMEOUT_ENV_VAR, float)
+        )
+
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._queued = 0
+        self._throttled = 0
+        self._wait_count = 0
+        self._wait_sum = 0.0
+        self._wait_max = 0.0
+
+        INVOKE_METRICS.register_collector(self)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_length(self) -> int:
+        return self._queued
+
+    @contextmanager
+    def admit(self, request_description: str = "") -> Iterator[None]:
+        """
+        Waits for a free slot in the container, and releases it when the wrapped block exits
+
+        Parameters
+        ----------
+        request_description str
+            Optional. Description of the request, used for debug logging
+
+        Raises
+        ------
+        ContainerThrottledException
+            When the queue is full or the request waited longer than the queue timeout
+        """
+        with timed_phase("admission_wait"):
+            self._acquire(request_description)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify()
+
+    def _acquire(self, request_description: str) -> None:
+        with self._condition:
+            if self._in_flight < self.max_concurrency and not self._queued:
+                self._in_flight += 1
+                self._record_wait(0.0)
+                LOG.debug(
+                    "Function %s (in flight: %d/%d) - ALLOWED request (%s)",
+                    self.function_name,
+                    self._in_flight,
+                    self.max_concurrency,
+                    request_description,
+                )
+                return
+
+            if self.max_queue_depth is not None and self._queued >= self.max_queue_depth:
+                self._throttled += 1
+                raise ContainerThrottledException(
+                    f"Rate Exceeded. Function {self.function_name} has {self._queued} queued requests, "
+                    f"the maximum queue depth is {self.max_queue_depth}"
+                )
+
+            LOG.debug(
+                "Function %s (in flight: %d/%d, queued: %d) - QUEUED request (%s)",
+                self.function_name,
+                self._in_flight,
+                self.max_concurrency,
+                self._queued,
+                request_description,
+            )
+            self._queued += 1
+            start = time.monotonic()
+            try:
+                admitted = self._condition.wait_for(
+                    lambda: self._in_flight < self.max_concurrency, timeout=self.queue_timeout
+                )
+            finally:
+                self._queued -= 1
+
+            waited = time.monotonic() - start
+            self._record_wait(waited)
+            if not admitted:
+                self._throttled += 1
+                raise ContainerThrottledException(
+                    f"Rate Exceeded. Request to function {self.function_name} waited {waited:.3f} seconds "
+                    f"for the container, the queue timeout is {self.queue_timeout} seconds"
+                )
+            self._in_flight += 1
+
+    def _record_wait(self, waited: float) -> None:
+        self._wait_count += 1
+        self._wait_sum += waited
+        self._wait_max = max(self._wait_max, waited)
+
+    def collect(self) -> List[MetricFamily]:
+        """
+        Returns
+        -------
+        List[MetricFamily]
+            Current queue gauges and wait time statistics of this controller
+        """
+        with self._condition:
+            labels = {"function": self.function_name}
+            return [
+                MetricFamily(
+                    "sam_local_container_queue_length",
+                    "gauge",
+                    "Number of requests waiting for a busy container.",
+                    [(labels, self._queued)],
+                ),
+                MetricFamily(
+                    "sam_local_container_in_flight",
+                    "gauge",
+                    "Number of requests being handled by a container.",
+                    [(labels, self._in_flight)],
+                ),
+                MetricFamily(
+                    "sam_local_container_max_concurrency",
+                    "gauge",
+                    "Number of requests a container can handle at the same time.",
+                    [(labels, self.max_concurrency)],
+                ),
+                MetricFamily(
+                    "sam_local_container_throttles_total",
+                    "counter",
+                    "Number of requests rejected with TooManyRequestsException.",
+                    [(labels, self._throttled)],
+                ),
+                MetricFamily(
+                    "sam_local_container_queue_wait_seconds_sum",
+                    "counter",
+                    "Total time requests waited for a container.",
+                    [(labels, round(self._wait_sum, 9))],
+                ),
+                MetricFamily(
+                    "sam_local_container_queue_wait_seconds_count",
+                    "counter",
+                    "Number of requests admitted into a container or timed out waiting for it.",
+                    [(labels, self._wait_count)],
+                ),
+                MetricFamily(
+                    "sam_local_container_queue_wait_seconds_max",
+                    "gauge",
+                    "Longest time a request waited for a container.",
+                    [(labels, round(self._wait_max, 9))],
+                ),
+            ]
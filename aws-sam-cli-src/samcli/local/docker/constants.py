@@ -0,0 +1,5 @@
+"""
+Constants of the local containers, which can be used without importing the docker client
+"""
+
+DEFAULT_CONTAINER_HOST_INTERFACE = "127.0.0.1"
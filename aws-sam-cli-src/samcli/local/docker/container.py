@@ -29,6 +29,8 @@ from samcli.lib.utils.retry import retry
 from samcli.lib.utils.stream_writer import StreamWriter
 from samcli.lib.utils.tar import extract_tarfile
 from samcli.local.docker import utils
+from samcli.local.docker.admission_controller import ContainerAdmissionController
+from samcli.local.docker.constants import DEFAULT_CONTAINER_HOST_INTERFACE
 from samcli.local.docker.effective_user import ROOT_USER_ID, EffectiveUser
 from samcli.local.docker.exceptions import (
     ContainerNotStartableException,
@@ -36,11 +38,11 @@ from samcli.local.docker.exceptions import (
     PortAlreadyInUse,
 )
 from samcli.local.docker.utils import NoFreePortsError, find_free_port, to_posix_path
+from samcli.local.services.invoke_metrics import timed_phase
 
 LOG = logging.getLogger(__name__)
 
 CONTAINER_CONNECTION_TIMEOUT = float(os.environ.get("SAM_CLI_CONTAINER_CONNECTION_TIMEOUT", "20"))
-DEFAULT_CONTAINER_HOST_INTERFACE = "127.0.0.1"
 
 
 class ContainerResponseException(Exception):
@@ -161,7 +163,7 @@ class Container:
         self._mount_symlinks = mount_symlinks
         self.debug_options = debug_options
         # Container-level concurrency management
-        self._concurrency_semaphore: Optional[threading.Semaphore] = None  # Controls concurrent Lambda executions
+        self._admission_controller: Optional[ContainerAdmissionController] = None  # Controls concurrent executions
         self._max_concurrency: int = 1  # Default to 1 for normal functions
 
         try:
@@ -457,7 +459,7 @@ class Container:
         In debug mode, force concurrency to 1 to avoid debugging conflicts.
         Called once during container creation.
         """
-        if self._concurrency_semaphore is not None:
+        if self._admission_controller is not None:
             return  # Already initialized
 
         # Check if we're in debug mode
@@ -473,8 +475,10 @@ class Container:
             LOG.warning("Invalid AWS_LAMBDA_MAX_CONCURRENCY value: %s, defaulting to 1", max_concurrency_str)
             self._max_concurrency = 1
 
-        # Create semaphore with the determined max concurrency
-        self._concurrency_semaphore = threading.Semaphore(self._max_concurrency)
+        # Create the admission controller with the determined max concurrency
+        self._admission_controller = ContainerAdmissionController(
+            self._max_concurrency, function_name=self._labels.get("sam.cli.function.name", self.id or "unknown")
+        )
         LOG.debug("Initialized container %s with max_concurrency=%d", self.id or "unknown", self._max_concurrency)
 
     def get_max_concurrency(self) -> int:
@@ -496,27 +500,16 @@ class Container:
         # a read time out for the response received from the server.
 
         """
-        Concurrency is handled entirely by the semaphore:
-        - Traditional functions: Semaphore(1) = single-threaded execution allowed
-        - LMI functions: Semaphore(N) = N concurrent executions allowed
-        """
-
-        # Concurrency control is initialized during create(), so semaphore should always be available
-        if self._concurrency_semaphore:
-            # Use context manager for automatic concurrency control
-            # This ensures that concurrent requests are properly limited and queued
-            # Debug logging: Show semaphore state
-            available_permits = self._concurrency_semaphore._value
-            LOG.debug(
-                "Container-%s (concurrency available: %d/%d) - %s for request (%s)",
-                self.id[:12] if self.id else "unknown",
-                available_permits,
-                self._max_concurrency,
-                "ALLOWED" if available_permits > 0 else "QUEUED",
-                event,
-            )
+        Concurrency is handled entirely by the admission controller:
+        - Traditional functions: max concurrency 1 = single-threaded execution allowed
+        - LMI functions: max concurrency N = N concurrent executions allowed
+        Requests beyond the max concurrency are queued. When the queue is full, or the queue timeout expires,
+        ContainerThrottledException is raised so the local services can answer with TooManyRequestsException.
+        """
 
-            with self._concurrency_semaphore:
+        # Concurrency control is initialized during create(), so the controller should always be available
+        if self._admission_controller:
+            with self._admission_controller.admit(event):
                 return self._make_http_request(event, tenant_id)
         else:
             LOG.warning("Container concurrency control not initiated properly during container creation")
@@ -565,26 +558,32 @@ class Container:
 
         # wait_for_http_response will attempt to establish a connection to the socket
         # but it'll fail if the socket is not listening yet, so we wait for the socket
-        self._wait_for_socket_connection()
+        with timed_phase("socket_wait"):
+            self._wait_for_socket_connection()
 
         # start the timer for function timeout right before executing the function, as waiting for the socket
         # can take some time
         timer = start_timer() if start_timer else None
-        response, is_image = self.wait_for_http_response(full_path, event, stdout, tenant_id)
-        if timer:
-            timer.cancel()
-
-        self._logs_thread_event.wait(timeout=1)
-        if isinstance(response, str):
-            stdout.write_str(response)
-        elif isinstance(response, bytes) and is_image:
-            stdout.write_bytes(response)
-        elif isinstance(response, bytes):
-            stdout.write_str(response.decode("utf-8"))
-        stdout.flush()
-        stderr.write_str("\n")
-        stderr.flush()
-        self._logs_thread_event.clear()
+        try:
+            with timed_phase("rie_invoke"):
+                response, is_image = self.wait_for_http_response(full_path, event, stdout, tenant_id)
+        finally:
+            # a throttled request never ran the function, its timeout must not fire and stop the container
+            if timer:
+                timer.cancel()
+
+        with timed_phase("log_drain"):
+            self._logs_thread_event.wait(timeout=1)
+            if isinstance(response, str):
+                stdout.write_str(response)
+            elif isinstance(response, bytes) and is_image:
+                stdout.write_bytes(response)
+            elif isinstance(response, bytes):
+                stdout.write_str(response.decode("utf-8"))
+            stdout.flush()
+            stderr.write_str("\n")
+            stderr.flush()
+            self._logs_thread_event.clear()
 
     def start_logs_thread_if_not_alive(self, stderr):
         """Start the logging thread if not already running."""
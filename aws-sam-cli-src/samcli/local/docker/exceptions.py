@@ -21,6 +21,13 @@ class PortAlreadyInUse(Exception):
     """
 
 
+class ContainerThrottledException(Exception):
+    """
+    Raised when a request is rejected because the container is busy and its request queue is full,
+    or the request waited longer than the queue timeout
+    """
+
+
 class ContainerFailureError(UserException):
     """
     Raised when the invoke container fails execution
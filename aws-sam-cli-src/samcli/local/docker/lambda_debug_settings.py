@@ -7,7 +7,7 @@ from argparse import ArgumentParser
 from collections import namedtuple
 from typing import List, cast
 
-from samcli.local.docker.lambda_image import Runtime
+from samcli.local.docker.lambda_runtime import Runtime
 
 
 class DebuggingNotSupported(Exception):
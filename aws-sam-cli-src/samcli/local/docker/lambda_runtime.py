@@ -0,0 +1,90 @@
+"""
+Runtimes of the Lambda images, kept apart from the image builder so that they can be used without importing docker
+"""
+
+import re
+from enum import Enum
+
+from samcli.lib.utils.architecture import has_runtime_multi_arch_image
+
+
+class Runtime(Enum):
+    nodejs16x = "nodejs16.x"
+    nodejs18x = "nodejs18.x"
+    nodejs20x = "nodejs20.x"
+    nodejs22x = "nodejs22.x"
+    nodejs24x = "nodejs24.x"
+    python38 = "python3.8"
+    python39 = "python3.9"
+    python310 = "python3.10"
+    python311 = "python3.11"
+    python312 = "python3.12"
+    python313 = "python3.13"
+    python314 = "python3.14"
+    ruby32 = "ruby3.2"
+    ruby33 = "ruby3.3"
+    ruby34 = "ruby3.4"
+    java8al2 = "java8.al2"
+    java11 = "java11"
+    java17 = "java17"
+    java21 = "java21"
+    java25 = "java25"
+    go1x = "go1.x"
+    dotnet6 = "dotnet6"
+    dotnet8 = "dotnet8"
+    provided = "provided"
+    providedal2 = "provided.al2"
+    providedal2023 = "provided.al2023"
+
+    @classmethod
+    def has_value(cls, value):
+        """
+        Checks if the enum has this value
+
+        :param string value: Value to check
+        :return bool: True, if enum has the value
+        """
+        return any(value == item.value for item in cls)
+
+    @classmethod
+    def get_image_name_tag(cls, runtime: str, architecture: str, is_preview: bool = False) -> str:
+        """
+        Returns the image name and tag for a particular runtime
+
+        Parameters
+        ----------
+        runtime : str
+            AWS Lambda runtime
+        architecture : str
+            Architecture for the runtime
+        is_preview : bool
+            Flag to use preview tag
+
+        Returns
+        -------
+        str
+            Image name and tag for the runtime's base image, like `python:3.12` or `provided:al2`
+        """
+        runtime_image_tag = ""
+        if runtime == cls.provided.value:
+            # There's a special tag for `provided` not al2 (provided:alami)
+            runtime_image_tag = "provided:alami"
+        elif runtime.startswith("provided"):
+            # `provided.al2` becomes `provided:al2``
+            runtime_image_tag = runtime.replace(".", ":")
+        elif runtime.startswith("dotnet"):
+            # dotnet6 becomes dotnet:6
+            runtime_image_tag = runtime.replace("dotnet", "dotnet:")
+        else:
+            # This fits most runtimes format: `nameN.M` becomes `name:N.M` (python3.9 -> python:3.9)
+            runtime_image_tag = re.sub(r"^([a-z]+)([0-9][a-z0-9\.]*)$", r"\1:\2", runtime)
+            # nodejs20.x, go1.x, etc don't have the `.x` part.
+            runtime_image_tag = runtime_image_tag.replace(".x", "")
+
+        if is_preview:
+            runtime_image_tag = f"{runtime_image_tag}-preview"
+
+        # Runtime image tags contain the architecture only if more than one is supported for that runtime
+        if has_runtime_multi_arch_image(runtime):
+            runtime_image_tag = f"{runtime_image_tag}-{architecture}"
+        return runtime_image_tag
@@ -26,6 +26,9 @@ class LambdaErrorResponses:
 
     ContainerCreationFailed = ("ContainerCreationFailed", 501)
 
+    # The request throughput limit was exceeded.
+    TooManyRequestsException = ("TooManyRequestsException", 429)
+
     PathNotFoundException = ("PathNotFoundLocally", 404)
 
     MethodNotAllowedException = ("MethodNotAllowedLocally", 405)
@@ -255,6 +258,29 @@ class LambdaErrorResponses:
             status_code,
         )
 
+    @staticmethod
+    def too_many_requests(message):
+        """
+        Creates a Lambda Service TooManyRequestsException Response
+
+        Parameters
+        ----------
+        message str
+            Message to be added to the body of the response
+
+        Returns
+        -------
+        Flask.Response
+            A response object representing the TooManyRequestsException Error
+        """
+        exception_tuple = LambdaErrorResponses.TooManyRequestsException
+
+        return BaseLocalService.service_response(
+            LambdaErrorResponses._construct_error_response_body(LambdaErrorResponses.USER_ERROR, message),
+            LambdaErrorResponses._construct_headers(exception_tuple[0]),
+            exception_tuple[1],
+        )
+
     @staticmethod
     def _construct_error_response_body(error_type, error_message):
         """
@@ -13,9 +13,10 @@ from samcli.commands.local.cli_common.durable_context import DurableContext
 from samcli.commands.local.lib.exceptions import TenantIdValidationError, UnsupportedInlineCodeError
 from samcli.lib.utils.name_utils import InvalidFunctionNameException, normalize_sam_function_identifier
 from samcli.lib.utils.stream_writer import StreamWriter
-from samcli.local.docker.exceptions import DockerContainerCreationFailedException
+from samcli.local.docker.exceptions import ContainerThrottledException, DockerContainerCreationFailedException
 from samcli.local.lambdafn.exceptions import DurableExecutionNotFound, FunctionNotFound, UnsupportedInvocationType
 from samcli.local.services.base_local_service import BaseLocalService, LambdaOutputParser
+from samcli.local.services.invoke_metrics import timed_phase
 
 from .lambda_error_responses import LambdaErrorResponses
 
@@ -130,6 +131,9 @@ class LocalLambdaHttpService(BaseLocalService):
             methods=["POST"],
         )
 
+        # timing hooks are registered first so that requests rejected by the validation below are timed as well
+        self._setup_invoke_metrics("start-lambda")
+
         # setup request validation before Flask calls the view_func
         self._app.before_request(LocalLambdaHttpService.validate_request)
 
@@ -248,15 +252,16 @@ class LocalLambdaHttpService(BaseLocalService):
             # Normalize function name from ARN if provided
             normalized_function_name = normalize_sam_function_identifier(function_name)
 
-            invoke_headers = self.lambda_runner.invoke(
-                normalized_function_name,
-                request_data,
-                invocation_type=invocation_type,
-                durable_execution_name=durable_execution_name,
-                tenant_id=tenant_id,
-                stdout=stdout_stream_writer,
-                stderr=self.stderr,
-            )
+            with timed_phase("lambda_invoke"):
+                invoke_headers = self.lambda_runner.invoke(
+                    normalized_function_name,
+                    request_data,
+                    invocation_type=invocation_type,
+                    durable_execution_name=durable_execution_name,
+                    tenant_id=tenant_id,
+                    stdout=stdout_stream_writer,
+                    stderr=self.stderr,
+                )
         except (InvalidFunctionNameException, TenantIdValidationError) as e:
             LOG.error("Validation error: %s", str(e))
             return LambdaErrorResponses.validation_exception(str(e))
@@ -270,12 +275,13 @@ class LocalLambdaHttpService(BaseLocalService):
             return LambdaErrorResponses.not_implemented_locally(
                 "Inline code is not supported for sam local commands. Please write your code in a separate file."
             )
-        except DockerContainerCreationFailedException as ex:
-            return LambdaErrorResponses.container_creation_failed(ex.message)
+        except (DockerContainerCreationFailedException, ContainerThrottledException) as ex:
+            return self._container_error_response(normalized_function_name, ex)
 
-        lambda_response, is_lambda_user_error_response = LambdaOutputParser.get_lambda_output(
-            stdout_stream_string, stdout_stream_bytes
-        )
+        with timed_phase("output_parse"):
+            lambda_response, is_lambda_user_error_response = LambdaOutputParser.get_lambda_output(
+                stdout_stream_string, stdout_stream_bytes
+            )
 
         # Prepare headers
         headers = {"Content-Type": "application/json"}
@@ -292,6 +298,27 @@ class LocalLambdaHttpService(BaseLocalService):
 
         return self.service_response(lambda_response, headers, 200)
 
+    @staticmethod
+    def _container_error_response(function_name, error):
+        """
+        Returns the Lambda error response of a request which the function container could not run
+
+        Parameters
+        ----------
+        function_name str
+            Name of the invoked function
+        error DockerContainerCreationFailedException or ContainerThrottledException
+            The container error
+
+        Returns
+        -------
+        A Flask Response with the Lambda error
+        """
+        if isinstance(error, ContainerThrottledException):
+            LOG.warning("Function %s was throttled: %s", function_name, str(error))
+            return LambdaErrorResponses.too_many_requests(str(error))
+        return LambdaErrorResponses.container_creation_failed(error.message)
+
     def _get_durable_execution_handler(self, durable_execution_arn):
         """
         Handler for GET /2025-12-01/durable-executions/{DurableExecutionArn}
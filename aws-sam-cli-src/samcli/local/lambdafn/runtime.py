@@ -21,6 +21,7 @@ from samcli.local.docker.durable_lambda_container import DurableLambdaContainer
 from samcli.local.docker.exceptions import ContainerFailureError, DockerContainerCreationFailedException
 from samcli.local.docker.lambda_container import LambdaContainer
 from samcli.local.lambdafn.exceptions import UnsupportedInvocationType
+from samcli.local.services.invoke_metrics import timed_phase
 
 from ...lib.providers.provider import LayerVersion
 from ...lib.utils.stream_writer import StreamWriter
@@ -271,17 +272,19 @@ class LambdaRuntime:
         headers = None
         try:
             # Start the container. This call returns immediately after the container starts
-            container = self.create(
-                function_config, debug_context, container_host, container_host_interface, extra_hosts
-            )
-            container = self.run(
-                container,
-                function_config,
-                debug_context,
-                container_host,
-                container_host_interface,
-                extra_hosts,
-            )
+            with timed_phase("container_create"):
+                container = self.create(
+                    function_config, debug_context, container_host, container_host_interface, extra_hosts
+                )
+            with timed_phase("container_start"):
+                container = self.run(
+                    container,
+                    function_config,
+                    debug_context,
+                    container_host,
+                    container_host_interface,
+                    extra_hosts,
+                )
             # Setup appropriate interrupt - timeout or Ctrl+C - before function starts executing and
             # get callback function to start timeout timer
             start_timer = self._configure_interrupt(
@@ -294,15 +297,16 @@ class LambdaRuntime:
             # either successfully or be killed by one of the interrupt handlers above.
 
             if isinstance(container, DurableLambdaContainer):
-                headers = container.wait_for_result(
-                    full_path=function_config.full_path,
-                    event=event,
-                    stdout=stdout,
-                    stderr=stderr,
-                    start_timer=start_timer,
-                    durable_execution_name=durable_execution_name,
-                    invocation_type=invocation_type,
-                )
+                with timed_phase("durable_execution"):
+                    headers = container.wait_for_result(
+                        full_path=function_config.full_path,
+                        event=event,
+                        stdout=stdout,
+                        stderr=stderr,
+                        start_timer=start_timer,
+                        durable_execution_name=durable_execution_name,
+                        invocation_type=invocation_type,
+                    )
             else:
                 # Only RequestResponse supported for regular Lambda functions
                 if invocation_type != "RequestResponse":
@@ -329,7 +333,8 @@ class LambdaRuntime:
         finally:
             # We will be done with execution, if either the execution completed or an interrupt was fired
             # Any case, cleanup the container.
-            self._on_invoke_done(container)
+            with timed_phase("container_cleanup"):
+                self._on_invoke_done(container)
 
         return headers
 
@@ -31,7 +31,7 @@ def _is_symlink(file_info):
     return (file_info.external_attr >> 28) == 0xA  # noqa: PLR2004
 
 
-def _extract(file_info, output_dir, zip_ref):
+def extract_member(file_info, output_dir, zip_ref):
     """
     Unzip the given file into the given directory while preserving file permissions in the process.
 
@@ -89,12 +89,12 @@ def unzip(zip_file_path, output_dir, permission=None):
     with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
         # For each item in the zip file, extract the file and set permissions if available
         for file_info in zip_ref.infolist():
-            extracted_path = _extract(file_info, output_dir, zip_ref)
+            extracted_path = extract_member(file_info, output_dir, zip_ref)
 
             # If the extracted_path is a symlink, do not set the permissions. If the target of the symlink does not
             # exist, then os.chmod will fail with FileNotFoundError
             if not os.path.islink(extracted_path):
-                _set_permissions(file_info, extracted_path)
+                set_permissions(file_info, extracted_path)
                 _override_permissions(extracted_path, permission)
 
     if not os.path.islink(extracted_path):
@@ -117,7 +117,7 @@ def _override_permissions(path, permission):
         os.chmod(path, permission)
 
 
-def _set_permissions(zip_file_info, extracted_path):
+def set_permissions(zip_file_info, extracted_path):
     """
     Sets permissions on the extracted file by reading the ``external_attr`` property of given file info.
 
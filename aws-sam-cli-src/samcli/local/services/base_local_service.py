@@ -6,9 +6,17 @@ import logging
 import signal
 from typing import Optional, Tuple, Union
 
-from flask import Response
+from flask import Response, request
 
 from samcli.local.docker.exceptions import ProcessSigTermException
+from samcli.local.services.invoke_metrics import (
+    INVOKE_METRICS,
+    METRICS_CONTENT_TYPE,
+    METRICS_ENDPOINT,
+    finish_request_timings,
+    is_metrics_enabled,
+    start_request_timings,
+)
 
 LOG = logging.getLogger(__name__)
 
@@ -41,6 +49,48 @@ class BaseLocalService:
         """
         raise NotImplementedError("Required method to implement")
 
+    def _setup_invoke_metrics(self, service_name):
+        """
+        Registers the request hooks that record per request phase timings, and the metrics endpoint that exposes
+        them. This is a no-op unless SAM_CLI_LOCAL_METRICS is set to 1. Must be called from ``create`` before any
+        other ``before_request`` hook, so that requests rejected by those hooks are still timed.
+
+        Parameters
+        ----------
+        service_name str
+            Name of the service, used as the ``service`` label of the exposed metrics
+        """
+        if not is_metrics_enabled():
+            return
+
+        LOG.debug("Invocation metrics are enabled, exposing them on %s", METRICS_ENDPOINT)
+
+        def before_request():
+            if request.path != METRICS_ENDPOINT:
+                start_request_timings()
+
+        def after_request(response):
+            timings = finish_request_timings()
+            if timings:
+                INVOKE_METRICS.observe(service_name, timings)
+                response.headers["Server-Timing"] = timings.to_server_timing_header()
+            return response
+
+        def metrics_handler():
+            return self.service_response(
+                INVOKE_METRICS.render_prometheus(), {"Content-Type": METRICS_CONTENT_TYPE}, 200
+            )
+
+        self._app.before_request(before_request)
+        self._app.after_request(after_request)
+        self._app.add_url_rule(
+            METRICS_ENDPOINT,
+            endpoint=METRICS_ENDPOINT,
+            view_func=metrics_handler,
+            methods=["GET"],
+            provide_automatic_options=False,
+        )
+
     def run(self):
         """
         This starts up the (threaded) Local Server.
@@ -0,0 +1,282 @@
+"""
+Low overhead timing of the phases of local Lambda invocations, exposed through the Server-Timing response header
+and a Prometheus text format endpoint on the local services.
+"""
+
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Set this environment variable to "1" to enable the Server-Timing header and the metrics endpoint
+SAM_CLI_LOCAL_METRICS_ENV_VAR = "SAM_CLI_LOCAL_METRICS"
+METRICS_ENDPOINT = "/__sam/metrics"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_NANOSECONDS_PER_SECOND = 1_000_000_000
+_NANOSECONDS_PER_MILLISECOND = 1_000_000
+
+_CURRENT = threading.local()
+
+
+def is_metrics_enabled() -> bool:
+    """
+    Returns
+    -------
+    bool
+        True if invocation metrics were requested through the SAM_CLI_LOCAL_METRICS environment variable
+    """
+    return os.environ.get(SAM_CLI_LOCAL_METRICS_ENV_VAR, "") == "1"
+
+
+class InvocationTimings:
+    """
+    Phase durations recorded while handling a single request. Durations are measured with the monotonic
+    ``time.perf_counter_ns`` clock and kept in nanoseconds until they are rendered.
+    """
+
+    __slots__ = ("_phases", "_start_ns", "_end_ns")
+
+    def __init__(self) -> None:
+        self._phases: List[Tuple[str, int]] = []
+        self._start_ns = time.perf_counter_ns()
+        self._end_ns: Optional[int] = None
+
+    def add(self, phase: str, duration_ns: int) -> None:
+        self._phases.append((phase, duration_ns))
+
+    def finish(self) -> None:
+        if self._end_ns is None:
+            self._end_ns = time.perf_counter_ns()
+
+    @property
+    def phases(self) -> List[Tuple[str, int]]:
+        return list(self._phases)
+
+    @property
+    def total_ns(self) -> int:
+        end_ns = self._end_ns if self._end_ns is not None else time.perf_counter_ns()
+        return end_ns - self._start_ns
+
+    def to_server_timing_header(self) -> str:
+        """
+        Renders the timings as a Server-Timing header value, with durations in milliseconds.
+        See: https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Server-Timing
+
+        Returns
+        -------
+        str
+            Value of the Server-Timing header, ending with the total time spent handling the request
+        """
+        entries = [
+            "{};dur={:.3f}".format(phase, duration_ns / _NANOSECONDS_PER_MILLISECOND)
+            for phase, duration_ns in self._phases
+        ]
+        entries.append("total;dur={:.3f}".format(self.total_ns / _NANOSECONDS_PER_MILLISECOND))
+        return ", ".join(entries)
+
+
+def start_request_timings() -> InvocationTimings:
+    """
+    Starts recording phase timings for the request handled by the current thread
+    """
+    timings = InvocationTimings()
+    _CURRENT.timings = timings
+    return timings
+
+
+def get_request_timings() -> Optional[InvocationTimings]:
+    """
+    Returns the timings recorded for the request handled by the current thread, if any
+    """
+    return getattr(_CURRENT, "timings", None)
+
+
+def finish_request_timings() -> Optional[InvocationTimings]:
+    """
+    Stops recording timings for the current thread and returns what was recorded
+    """
+    timings = getattr(_CURRENT, "timings", None)
+    _CURRENT.timings = None
+    if timings:
+        timings.finish()
+    return timings
+
+
+@contextmanager
+def timed_phase(phase: str) -> Iterator[None]:
+    """
+    Measures the duration of the wrapped block and records it as ``phase`` on the current request timings.
+    This is a no-op when the current thread is not recording, e.g. for ``sam local invoke``.
+
+    Parameters
+    ----------
+    phase: str
+        Name of the phase, used as the Server-Timing metric name and the Prometheus ``phase`` label
+    """
+    timings = getattr(_CURRENT, "timings", None)
+    if timings is None:
+        yield
+        return
+
+    start_ns = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter_ns() - start_ns)
+
+
+class MetricFamily(NamedTuple):
+    """
+    A metric reported by a collector, with one sample per distinct set of labels
+    """
+
+    name: str
+    metric_type: str
+    documentation: str
+    samples: List[Tuple[Dict[str, str], float]]
+
+
+class InvokeMetricsRegistry:
+    """
+    Process wide aggregation of request timings, rendered in the Prometheus text exposition format.
+    Objects owning live state (e.g. container admission queues) can register themselves as collectors; they are
+    asked for their current values every time the metrics are rendered.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._requests: Dict[str, int] = {}
+        self._request_duration: Dict[str, List[int]] = {}
+        # (service, phase) -> [count, sum_ns, max_ns]
+        self._phases: Dict[Tuple[str, str], List[int]] = {}
+        # collectors are weakly referenced so that they go away with the containers owning them
+        self._collectors: "weakref.WeakSet" = weakref.WeakSet()
+
+    def register_collector(self, collector) -> None:
+        """
+        Parameters
+        ----------
+        collector
+            Object with a ``collect()`` method returning an iterable of MetricFamily
+        """
+        with self._lock:
+            self._collectors.add(collector)
+
+    def observe(self, service: str, timings: InvocationTimings) -> None:
+        """
+        Adds the timings of a finished request to the aggregated metrics
+
+        Parameters
+        ----------
+        service: str
+            Name of the local service that handled the request (e.g. start-api)
+        timings: InvocationTimings
+            Timings recorded while handling the request
+        """
+        total_ns = timings.total_ns
+        with self._lock:
+            self._requests[service] = self._requests.get(service, 0) + 1
+            request_duration = self._request_duration.setdefault(service, [0, 0])
+            request_duration[0] += 1
+            request_duration[1] += total_ns
+
+            for phase, duration_ns in timings.phases:
+                stats = self._phases.get((service, phase))
+                if stats is None:
+                    self._phases[(service, phase)] = [1, duration_ns, duration_ns]
+                    continue
+                stats[0] += 1
+                stats[1] += duration_ns
+                stats[2] = max(stats[2], duration_ns)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._request_duration.clear()
+            self._phases.clear()
+
+    def render_prometheus(self) -> str:
+        """
+        Returns
+        -------
+        str
+            All collected metrics in the Prometheus text exposition format
+        """
+        with self._lock:
+            requests = sorted(self._requests.items())
+            request_duration = sorted((service, list(stats)) for service, stats in self._request_duration.items())
+            phases = sorted((key, list(stats)) for key, stats in self._phases.items())
+            collectors = list(self._collectors)
+
+        lines = [
+            "# HELP sam_local_requests_total Number of requests handled by the local service.",
+            "# TYPE sam_local_requests_total counter",
+        ]
+        lines += ['sam_local_requests_total{{service="{}"}} {}'.format(service, count) for service, count in requests]
+
+        lines += [
+            "# HELP sam_local_request_duration_seconds Time spent handling requests in the local service.",
+            "# TYPE sam_local_request_duration_seconds summary",
+        ]
+        for service, (count, sum_ns) in request_duration:
+            labels = '{{service="{}"}}'.format(service)
+            lines.append("sam_local_request_duration_seconds_sum{} {}".format(labels, _to_seconds(sum_ns)))
+            lines.append("sam_local_request_duration_seconds_count{} {}".format(labels, count))
+
+        lines += [
+            "# HELP sam_local_phase_duration_seconds Time spent in each phase of a local invocation.",
+            "# TYPE sam_local_phase_duration_seconds summary",
+        ]
+        for (service, phase), (count, sum_ns, _) in phases:
+            labels = '{{service="{}",phase="{}"}}'.format(service, phase)
+            lines.append("sam_local_phase_duration_seconds_sum{} {}".format(labels, _to_seconds(sum_ns)))
+            lines.append("sam_local_phase_duration_seconds_count{} {}".format(labels, count))
+
+        lines += [
+            "# HELP sam_local_phase_duration_seconds_max Longest observed duration of each invocation phase.",
+            "# TYPE sam_local_phase_duration_seconds_max gauge",
+        ]
+        for (service, phase), (_, _, max_ns) in phases:
+            labels = '{{service="{}",phase="{}"}}'.format(service, phase)
+            lines.append("sam_local_phase_duration_seconds_max{} {}".format(labels, _to_seconds(max_ns)))
+
+        lines += _render_families(family for collector in collectors for family in collector.collect())
+
+        return "\n".join(lines) + "\n"
+
+
+def _render_families(families: Iterable[MetricFamily]) -> List[str]:
+    """
+    Renders the collected families, merging the samples of families reported under the same name
+    """
+    merged: Dict[str, MetricFamily] = {}
+    for family in families:
+        existing = merged.get(family.name)
+        if existing is None:
+            merged[family.name] = MetricFamily(family.name, family.metric_type, family.documentation, [])
+            existing = merged[family.name]
+        existing.samples.extend(family.samples)
+
+    lines = []
+    for name in sorted(merged):
+        family = merged[name]
+        lines.append("# HELP {} {}".format(name, family.documentation))
+        lines.append("# TYPE {} {}".format(name, family.metric_type))
+        for labels, value in family.samples:
+            rendered_labels = ",".join('{}="{}"'.format(key, _escape_label(str(val))) for key, val in labels.items())
+            lines.append("{}{{{}}} {}".format(name, rendered_labels, value))
+    return lines
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _to_seconds(duration_ns: int) -> str:
+    return "{:.9f}".format(duration_ns / _NANOSECONDS_PER_SECOND)
+
+
+INVOKE_METRICS = InvokeMetricsRegistry()
@@ -0,0 +1,105 @@
+"""
+Benchmark of the Lambda event construction of sam local start-api on requests with many headers and query parameters
+
+Builds requests with a growing number of headers, query parameters and cookies, and reports the time it takes to
+construct their payload 1.0 and 2.0 events, so that a regression to a per-key lookup, which is quadratic in the number
+of keys, shows up:
+
+    python -m tests.benchmarks.apigw_event.benchmark --sizes 10 100 1000
+
+The times are the median of the repeated runs. The last column is the ratio of the time per key with the time per key
+of the smallest size, it stays around 1 while the construction is linear in the number of keys.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from flask import Flask, request
+
+from samcli.local.apigw.event_constructor import construct_v1_event, construct_v2_event_http
+
+DEFAULT_SIZES = (10, 100, 1000)
+ROUTE_PATH = "/items/<item_id>"
+PORT = 3000
+
+
+class EventResult(NamedTuple):
+    event_version: str
+    keys: int
+    wall_time: float
+
+
+def build_request_arguments(keys: int) -> Dict:
+    """
+    Returns the arguments of a test request with the given number of headers, query parameters and cookies. Every
+    key has two values, so that the multi-value headers and query parameters are exercised as well.
+    """
+    headers = []
+    query_string = []
+    for index in range(keys):
+        headers += [(f"X-Header-{index}", f"value-{index}-a"), (f"X-Header-{index}", f"value-{index}-b")]
+        query_string += [(f"param{index}", f"value-{index}-a"), (f"param{index}", f"value-{index}-b")]
+    headers.append(("Cookie", "; ".join(f"cookie{index}=value-{index}" for index in range(keys))))
+    return {"path": "/items/1", "method": "GET", "headers": headers, "query_string": query_string}
+
+
+def _time_construction(construct: Callable[[], Dict], repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        construct()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def run_benchmark(sizes: List[int], repeat: int = 5) -> List[EventResult]:
+    app = Flask(__name__)
+    app.add_url_rule(ROUTE_PATH, endpoint=ROUTE_PATH, view_func=lambda item_id: "")
+
+    constructors = {
+        "1.0": lambda: construct_v1_event(request, PORT, binary_types=[], stage_name="Prod"),
+        "2.0": lambda: construct_v2_event_http(request, PORT, binary_types=[], stage_name="Prod", route_key="GET /"),
+    }
+    results = []
+    for keys in sizes:
+        with app.test_request_context(**build_request_arguments(keys)):
+            for event_version, construct in constructors.items():
+                # the first construction parses the headers, query string and cookies of the request
+                construct()
+                results.append(EventResult(event_version, keys, _time_construction(construct, repeat)))
+    return results
+
+
+def format_results(results: List[EventResult]) -> str:
+    lines = [f"{'event':<6} {'keys':>6} {'wall time (ms)':>15} {'time per key ratio':>19}"]
+    smallest: Dict[str, EventResult] = {}
+    for result in results:
+        first = smallest.setdefault(result.event_version, result)
+        ratio = (result.wall_time / result.keys) / (first.wall_time / first.keys)
+        lines.append(f"{result.event_version:<6} {result.keys:>6} {result.wall_time * 1000:>15.3f} {ratio:>19.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argparser = argparse.ArgumentParser(
+        description="Benchmark the Lambda event construction on requests with many headers and query parameters"
+    )
+    argparser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Numbers of headers, query parameters and cookies of the benchmarked requests",
+    )
+    argparser.add_argument("--repeat", type=int, default=5, help="Number of timed runs")
+    arguments = argparser.parse_args(argv)
+
+    print(format_results(run_benchmark(sorted(arguments.sizes), arguments.repeat)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
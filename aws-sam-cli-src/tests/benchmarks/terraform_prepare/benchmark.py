@@ -0,0 +1,267 @@
+"""
+Benchmark of the Terraform prepare hook phases on synthetic plans
+
+Translates a synthetic plan (see synthetic_plan.py) and reports the wall time and the peak memory of each phase of the
+translation, so that performance regressions on large projects show up before customers hit them:
+
+    python -m tests.benchmarks.terraform_prepare.benchmark --module-depth 3 --fan-out 4 --api-routes 10
+
+The wall times are the median of the repeated runs, which are not traced. The peak memory is measured in a separate,
+traced run, as tracing the allocations slows the translation down. With --baseline, the results are compared with a
+report previously written with --output, and the command fails when a phase regressed by more than the tolerance.
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from samcli.hook_packages.terraform.hooks.prepare import translate
+from tests.benchmarks.terraform_prepare.synthetic_plan import (
+    FAN_OUT_COUNT,
+    FAN_OUT_FOR_EACH,
+    SyntheticPlanShape,
+    generate_plan,
+)
+
+LOG = logging.getLogger(__name__)
+
+TRANSLATE_PHASE = "translate_to_cfn"
+# phases called from translate_to_cfn, measured by wrapping the names translate_to_cfn calls them through
+NESTED_PHASES = ("_build_module", "_handle_linking", "enrich_resources_and_generate_makefile")
+PHASES = (TRANSLATE_PHASE,) + NESTED_PHASES
+
+DEFAULT_TOLERANCE = 0.2
+
+
+class PhaseResult(NamedTuple):
+    phase: str
+    calls: int
+    wall_time: float
+    peak_memory: Optional[int]
+
+
+class _Frame:
+    def __init__(self, start_memory: int):
+        self.start_memory = start_memory
+        self.peak_memory = start_memory
+
+
+class PhaseRecorder:
+    """
+    Records the wall time and, while tracemalloc is tracing, the peak memory of nested phases.
+
+    The tracemalloc peak is reset when a phase starts, so that the peak of a phase is not hidden by an earlier peak.
+    The peak observed before the reset is kept in the frame of the enclosing phase, so that its own peak stays right.
+    """
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, int] = {}
+        self.wall_times: Dict[str, float] = {}
+        self.peak_memories: Dict[str, int] = {}
+        self._frames: List[_Frame] = []
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            current_memory, peak_memory = tracemalloc.get_traced_memory()
+            if self._frames:
+                self._frames[-1].peak_memory = max(self._frames[-1].peak_memory, peak_memory)
+            tracemalloc.reset_peak()
+            self._frames.append(_Frame(current_memory))
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.calls[phase] = self.calls.get(phase, 0) + 1
+            self.wall_times[phase] = self.wall_times.get(phase, 0.0) + elapsed
+
+            if tracing:
+                frame = self._frames.pop()
+                frame.peak_memory = max(frame.peak_memory, tracemalloc.get_traced_memory()[1])
+                self.peak_memories[phase] = max(
+                    self.peak_memories.get(phase, 0), frame.peak_memory - frame.start_memory
+                )
+                if self._frames:
+                    self._frames[-1].peak_memory = max(self._frames[-1].peak_memory, frame.peak_memory)
+
+    def wrap(self, phase: str, function: Callable) -> Callable:
+        def measured(*args, **kwargs):
+            with self.measure(phase):
+                return function(*args, **kwargs)
+
+        return measured
+
+
+@contextmanager
+def _patched(module: Any, name: str, replacement: Any) -> Iterator[None]:
+    original = getattr(module, name)
+    setattr(module, name, replacement)
+    try:
+        yield
+    finally:
+        setattr(module, name, original)
+
+
+def _translate(tf_json: dict, project_dir: str, output_dir: str, recorder: PhaseRecorder) -> None:
+    with ExitStack() as stack:
+        for phase in NESTED_PHASES:
+            stack.enter_context(_patched(translate, phase, recorder.wrap(phase, getattr(translate, phase))))
+        with recorder.measure(TRANSLATE_PHASE):
+            translate.translate_to_cfn(tf_json, output_dir, project_dir, project_dir)
+
+
+def run_benchmark(shape: SyntheticPlanShape, repeat: int = 3, measure_memory: bool = True) -> List[PhaseResult]:
+    """
+    Translates a synthetic plan of the given shape and measures each prepare phase
+
+    Parameters
+    ----------
+    shape: SyntheticPlanShape
+        The shape of the synthetic project
+    repeat: int
+        Number of timed runs, the reported wall time of a phase is the median of the runs
+    measure_memory: bool
+        Whether to run the translation once more with tracemalloc to measure the peak memory of each phase
+
+    Returns
+    -------
+    List[PhaseResult]
+        The measurements of each phase, in the order of PHASES
+    """
+    with tempfile.TemporaryDirectory() as project_dir:
+        source_code_path = os.path.join(project_dir, "src")
+        os.makedirs(source_code_path)
+        with open(os.path.join(source_code_path, "app.py"), "w") as source_file:
+            source_file.write("def lambda_handler(event, context):\n    return event\n")
+        built_output_path = os.path.join(project_dir, "build", "function.zip")
+        output_dir = os.path.join(project_dir, ".aws-sam-iacs", "iacs_metadata")
+        os.makedirs(output_dir)
+
+        tf_json = generate_plan(shape, source_code_path, built_output_path)
+
+        wall_times: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+        calls: Dict[str, int] = {}
+        for _ in range(max(repeat, 1)):
+            # the translation can update the plan in place, so every run gets a fresh copy
+            recorder = PhaseRecorder()
+            _translate(copy.deepcopy(tf_json), project_dir, output_dir, recorder)
+            for phase in PHASES:
+                wall_times[phase].append(recorder.wall_times.get(phase, 0.0))
+            calls = recorder.calls
+
+        peak_memories: Dict[str, int] = {}
+        if measure_memory:
+            recorder = PhaseRecorder()
+            run_tf_json = copy.deepcopy(tf_json)
+            tracemalloc.start()
+            try:
+                _translate(run_tf_json, project_dir, output_dir, recorder)
+            finally:
+                tracemalloc.stop()
+            peak_memories = recorder.peak_memories
+
+    return [
+        PhaseResult(phase, calls.get(phase, 0), statistics.median(wall_times[phase]), peak_memories.get(phase))
+        for phase in PHASES
+    ]
+
+
+def find_regressions(
+    results: List[PhaseResult], baseline: Dict[str, Dict], tolerance: float = DEFAULT_TOLERANCE
+) -> List[str]:
+    """
+    Compares the results with a baseline report, and describes the phases whose wall time or peak memory grew by
+    more than the tolerance (a ratio, 0.2 allows 20% growth)
+    """
+    regressions = []
+    for result in results:
+        baseline_phase = baseline.get(result.phase)
+        if not baseline_phase:
+            continue
+        for metric in ("wall_time", "peak_memory"):
+            current = getattr(result, metric)
+            previous = baseline_phase.get(metric)
+            if current is None or not previous:
+                continue
+            if current > previous * (1 + tolerance):
+                regressions.append(
+                    f"{result.phase} {metric} regressed from {previous} to {current} "
+                    f"({(current / previous - 1) * 100:.0f}% > {tolerance * 100:.0f}%)"
+                )
+    return regressions
+
+
+def format_results(shape: SyntheticPlanShape, results: List[PhaseResult]) -> str:
+    lines = [
+        f"Synthetic plan: {shape.modules_count} modules, {shape._asdict()}",
+        f"{'phase':<40} {'calls':>6} {'wall time (ms)':>15} {'peak memory (KiB)':>18}",
+    ]
+    for result in results:
+        peak_memory = f"{result.peak_memory / 1024:.0f}" if result.peak_memory is not None else "n/a"
+        lines.append(f"{result.phase:<40} {result.calls:>6} {result.wall_time * 1000:>15.1f} {peak_memory:>18}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argparser = argparse.ArgumentParser(description="Benchmark the Terraform prepare hook on a synthetic plan")
+    argparser.add_argument("--module-depth", type=int, default=2, help="Levels of nested modules")
+    argparser.add_argument("--child-modules", type=int, default=2, help="Modules called by each module")
+    argparser.add_argument("--resources-per-module", type=int, default=5, help="Lambda functions in each module")
+    argparser.add_argument("--fan-out", type=int, default=1, help="Instances of each Lambda function")
+    argparser.add_argument(
+        "--fan-out-mode", choices=(FAN_OUT_COUNT, FAN_OUT_FOR_EACH), default=FAN_OUT_COUNT, help="count or for_each"
+    )
+    argparser.add_argument("--api-routes", type=int, default=0, help="API Gateway routes in each module")
+    argparser.add_argument("--repeat", type=int, default=3, help="Number of timed runs")
+    argparser.add_argument("--no-memory", action="store_true", help="Skip the peak memory measurement")
+    argparser.add_argument("--output", help="Write the results as JSON to this file")
+    argparser.add_argument("--baseline", help="Fail when a phase regressed compared to this JSON results file")
+    argparser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed growth ratio compared to the baseline"
+    )
+    arguments = argparser.parse_args(argv)
+
+    shape = SyntheticPlanShape(
+        module_depth=arguments.module_depth,
+        child_modules=arguments.child_modules,
+        resources_per_module=arguments.resources_per_module,
+        fan_out=arguments.fan_out,
+        fan_out_mode=arguments.fan_out_mode,
+        api_routes_per_module=arguments.api_routes,
+    )
+    results = run_benchmark(shape, arguments.repeat, not arguments.no_memory)
+    print(format_results(shape, results))
+
+    report = {result.phase: result._asdict() for result in results}
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump({"shape": shape._asdict(), "phases": report}, output_file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline, "r") as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get("shape") != shape._asdict():
+            LOG.warning("The baseline was measured on a different synthetic plan shape: %s", baseline.get("shape"))
+        regressions = find_regressions(results, baseline.get("phases", {}), arguments.tolerance)
+        for regression in regressions:
+            print(regression, file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Peak memory benchmark of the loading of the `terraform show -json` output
+
+Writes a synthetic plan (see synthetic_plan.py) to a file, with a prior state and resource changes as large as a
+plan of an applied project, and compares the peak memory and the wall time of loading it with plan_json.load_plan_json
+and with json.loads:
+
+    python -m tests.benchmarks.terraform_prepare.plan_memory --module-depth 4 --fan-out 4 --api-routes 10
+
+The peak memory is measured with tracemalloc, it covers the Python objects and the bytes read from the file. The
+pages of the memory map load_plan_json scans are backed by the file, they are not allocated by Python and are not
+part of its peak.
+"""
+
+import argparse
+import copy
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from samcli.hook_packages.terraform.hooks.prepare.plan_json import load_plan_json
+from tests.benchmarks.terraform_prepare.synthetic_plan import (
+    FAN_OUT_COUNT,
+    FAN_OUT_FOR_EACH,
+    SyntheticPlanShape,
+    generate_plan,
+)
+
+
+class LoaderResult(NamedTuple):
+    loader: str
+    wall_time: float
+    peak_memory: int
+
+
+def _json_loads(plan_json_path: str) -> Dict:
+    with open(plan_json_path, "rb") as plan_json_file:
+        return json.loads(plan_json_file.read())
+
+
+LOADERS: Dict[str, Callable[[str], Dict]] = {
+    "json.loads": _json_loads,
+    "load_plan_json": load_plan_json,
+}
+
+
+def _resource_changes(module: Dict) -> List[Dict]:
+    changes = []
+    for resource in module.get("resources", []):
+        changes.append(
+            {
+                "address": resource["address"],
+                "type": resource["type"],
+                "name": resource["name"],
+                "change": {"actions": ["update"], "before": resource["values"], "after": resource["values"]},
+            }
+        )
+    for child_module in module.get("child_modules", []):
+        changes += _resource_changes(child_module)
+    return changes
+
+
+def write_plan_file(shape: SyntheticPlanShape, path: str) -> int:
+    """
+    Writes the synthetic plan of the given shape, with its prior state and resource changes, and returns its size
+    """
+    with tempfile.TemporaryDirectory() as project_dir:
+        plan = generate_plan(shape, os.path.join(project_dir, "src"), os.path.join(project_dir, "function.zip"))
+    root_module = plan["planned_values"]["root_module"]
+    plan["prior_state"] = {"format_version": "1.0", "values": {"root_module": copy.deepcopy(root_module)}}
+    plan["resource_changes"] = _resource_changes(root_module)
+    with open(path, "w") as plan_file:
+        json.dump(plan, plan_file)
+    return os.path.getsize(path)
+
+
+def measure(loader_name: str, loader: Callable[[str], Dict], plan_json_path: str, repeat: int) -> LoaderResult:
+    durations = []
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        loader(plan_json_path)
+        durations.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        # the loaded plan is kept alive until the peak is read, as the hook keeps it while translating it
+        plan = loader(plan_json_path)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del plan
+    return LoaderResult(loader_name, statistics.median(durations), peak_memory)
+
+
+def run_benchmark(shape: SyntheticPlanShape, repeat: int = 3) -> Tuple[int, List[LoaderResult]]:
+    """
+    Loads the synthetic plan of the given shape with every loader, and returns the size of the plan file and the
+    measurements of each loader
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        plan_json_path = os.path.join(work_dir, "plan.json")
+        plan_size = write_plan_file(shape, plan_json_path)
+        return plan_size, [
+            measure(loader_name, loader, plan_json_path, repeat) for loader_name, loader in LOADERS.items()
+        ]
+
+
+def format_results(shape: SyntheticPlanShape, plan_size: int, results: List[LoaderResult]) -> str:
+    lines = [
+        f"Synthetic plan: {plan_size / 1024 / 1024:.1f} MiB, {shape.modules_count} modules, {shape._asdict()}",
+        f"{'loader':<20} {'wall time (ms)':>15} {'peak memory (KiB)':>18}",
+    ]
+    for result in results:
+        lines.append(f"{result.loader:<20} {result.wall_time * 1000:>15.1f} {result.peak_memory / 1024:>18.0f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argparser = argparse.ArgumentParser(description="Compare the peak memory of the loaders of a synthetic JSON plan")
+    argparser.add_argument("--module-depth", type=int, default=3, help="Levels of nested modules")
+    argparser.add_argument("--child-modules", type=int, default=3, help="Modules called by each module")
+    argparser.add_argument("--resources-per-module", type=int, default=5, help="Lambda functions in each module")
+    argparser.add_argument("--fan-out", type=int, default=2, help="Instances of each Lambda function")
+    argparser.add_argument(
+        "--fan-out-mode", choices=(FAN_OUT_COUNT, FAN_OUT_FOR_EACH), default=FAN_OUT_COUNT, help="count or for_each"
+    )
+    argparser.add_argument("--api-routes", type=int, default=5, help="API Gateway routes in each module")
+    argparser.add_argument("--repeat", type=int, default=3, help="Number of timed runs")
+    arguments = argparser.parse_args(argv)
+
+    shape = SyntheticPlanShape(
+        module_depth=arguments.module_depth,
+        child_modules=arguments.child_modules,
+        resources_per_module=arguments.resources_per_module,
+        fan_out=arguments.fan_out,
+        fan_out_mode=arguments.fan_out_mode,
+        api_routes_per_module=arguments.api_routes,
+    )
+    plan_size, results = run_benchmark(shape, arguments.repeat)
+    print(format_results(shape, plan_size, results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
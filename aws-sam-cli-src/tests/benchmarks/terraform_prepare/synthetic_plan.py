@@ -0,0 +1,409 @@
+"""
+Generator of synthetic Terraform plans, used to benchmark the prepare hook on projects of a given shape
+
+The generated document has the structure of the `terraform show -json` output the hook consumes: the planned values
+and the configuration of a tree of modules. Every module contains
+
+* Lambda functions, each expanded into several instances through `count` or `for_each`, and a sam metadata resource
+  per function that points to its source code
+* optionally, an API Gateway REST API with routes integrated with a handler function of the module
+
+The root module declares a Lambda layer, which is passed down to the child modules through a `layer_arn` variable, so
+that linking the functions of deeply nested modules to the layer resolves the variable through every parent module.
+
+The planned values hold the attributes of a project which was applied before, e.g. the ARN of the layer and the ids of
+the API Gateway resources, so that every property is resolved and the hook does not warn about unresolvable ones.
+"""
+
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from samcli.hook_packages.terraform.hooks.prepare.constants import (
+    TF_AWS_API_GATEWAY_INTEGRATION,
+    TF_AWS_API_GATEWAY_METHOD,
+    TF_AWS_API_GATEWAY_RESOURCE,
+    TF_AWS_API_GATEWAY_REST_API,
+    TF_AWS_API_GATEWAY_STAGE,
+    TF_AWS_LAMBDA_FUNCTION,
+    TF_AWS_LAMBDA_LAYER_VERSION,
+)
+from samcli.hook_packages.terraform.hooks.prepare.translate import (
+    AWS_PROVIDER_NAME,
+    NULL_RESOURCE_PROVIDER_NAME,
+    SAM_METADATA_NAME_PREFIX,
+    SAM_METADATA_RESOURCE_TYPE,
+)
+
+FAN_OUT_COUNT = "count"
+FAN_OUT_FOR_EACH = "for_each"
+
+LAYER_NAME = "layer"
+LAYER_VARIABLE = "layer_arn"
+API_NAME = "api"
+API_HANDLER_NAME = "api_handler"
+
+REGION = "us-east-1"
+ACCOUNT_ID = "123456789012"
+LAYER_ARN = f"arn:aws:lambda:{REGION}:{ACCOUNT_ID}:layer:synthetic-layer:1"
+
+
+class SyntheticPlanShape(NamedTuple):
+    """
+    Shape of a synthetic Terraform project
+
+    module_depth: int
+        Number of levels of nested modules under the root module
+    child_modules: int
+        Number of modules called by each module that is not at the deepest level
+    resources_per_module: int
+        Number of Lambda functions, each with a sam metadata resource, declared in each module
+    fan_out: int
+        Number of instances of each Lambda function and its sam metadata resource
+    fan_out_mode: str
+        How the instances are declared, either "count" or "for_each"
+    api_routes_per_module: int
+        Number of API Gateway routes (resource, method and integration) in each module. No REST API is declared when
+        it is 0.
+    """
+
+    module_depth: int = 2
+    child_modules: int = 2
+    resources_per_module: int = 5
+    fan_out: int = 1
+    fan_out_mode: str = FAN_OUT_COUNT
+    api_routes_per_module: int = 0
+
+    @property
+    def modules_count(self) -> int:
+        return sum(self.child_modules**level for level in range(self.module_depth + 1))
+
+
+def generate_plan(shape: SyntheticPlanShape, source_code_path: str, built_output_path: str) -> Dict[str, Any]:
+    """
+    Generates the JSON plan of a synthetic Terraform project
+
+    Parameters
+    ----------
+    shape: SyntheticPlanShape
+        The shape of the project
+    source_code_path: str
+        The source code directory of all the Lambda functions, it must exist for the enrichment to succeed
+    built_output_path: str
+        The path of the built artifact of all the Lambda functions and of the layer
+
+    Returns
+    -------
+    dict
+        The plan, with the same sections as the output of `terraform show -json`
+    """
+    if shape.fan_out_mode not in (FAN_OUT_COUNT, FAN_OUT_FOR_EACH):
+        raise ValueError(f"Unsupported fan out mode {shape.fan_out_mode}")
+    if shape.fan_out < 1:
+        raise ValueError("The fan out should be at least 1")
+
+    planned_root_module, config_root_module = _generate_module(shape, 0, None, source_code_path, built_output_path)
+    return {
+        "format_version": "1.2",
+        "terraform_version": "1.5.0",
+        "variables": {},
+        "planned_values": {"root_module": planned_root_module},
+        "configuration": {"provider_config": {"aws": {"name": "aws"}}, "root_module": config_root_module},
+    }
+
+
+def _generate_module(
+    shape: SyntheticPlanShape,
+    level: int,
+    module_address: Optional[str],
+    source_code_path: str,
+    built_output_path: str,
+) -> Tuple[Dict, Dict]:
+    """
+    Generates the planned values and the configuration of a module and of its child modules
+    """
+    generator = _ModuleGenerator(module_address, source_code_path, built_output_path)
+
+    if module_address is None:
+        generator.add_resource(
+            TF_AWS_LAMBDA_LAYER_VERSION,
+            LAYER_NAME,
+            {
+                "layer_name": "synthetic-layer",
+                "filename": built_output_path,
+                "compatible_runtimes": ["python3.11"],
+                "arn": LAYER_ARN,
+            },
+            {"layer_name": _constant("synthetic-layer"), "filename": _constant(built_output_path)},
+        )
+        layer_references = _references(f"{TF_AWS_LAMBDA_LAYER_VERSION}.{LAYER_NAME}.arn")
+    else:
+        generator.config_module["variables"] = {LAYER_VARIABLE: {"description": "The ARN of the shared layer"}}
+        layer_references = _references(f"var.{LAYER_VARIABLE}")
+
+    for index in range(shape.resources_per_module):
+        generator.add_function(f"function_{index}", shape, layer_references)
+
+    if shape.api_routes_per_module:
+        generator.add_function(API_HANDLER_NAME, shape._replace(fan_out=1), layer_references)
+        generator.add_rest_api(shape.api_routes_per_module)
+
+    if level < shape.module_depth:
+        planned_child_modules = []
+        module_calls = {}
+        for index in range(shape.child_modules):
+            module_name = f"m{index}"
+            child_address = f"{module_address}.module.{module_name}" if module_address else f"module.{module_name}"
+            planned_child_module, config_child_module = _generate_module(
+                shape, level + 1, child_address, source_code_path, built_output_path
+            )
+            planned_child_modules.append(planned_child_module)
+            module_calls[module_name] = {
+                "source": "./modules/synthetic",
+                "expressions": {LAYER_VARIABLE: layer_references},
+                "module": config_child_module,
+            }
+        generator.planned_module["child_modules"] = planned_child_modules
+        generator.config_module["module_calls"] = module_calls
+
+    return generator.planned_module, generator.config_module
+
+
+class _ModuleGenerator:
+    """
+    Accumulates the planned values and the configuration of the resources of a single module
+    """
+
+    def __init__(self, module_address: Optional[str], source_code_path: str, built_output_path: str):
+        self.module_address = module_address
+        self.source_code_path = source_code_path
+        self.built_output_path = built_output_path
+        self.planned_module: Dict[str, Any] = {"resources": []}
+        if module_address:
+            self.planned_module["address"] = module_address
+        self.config_module: Dict[str, Any] = {"resources": []}
+
+    def add_resource(
+        self,
+        resource_type: str,
+        name: str,
+        values: Dict,
+        expressions: Dict,
+        instance_keys: Optional[List] = None,
+        fan_out_mode: str = FAN_OUT_COUNT,
+        provider_name: str = AWS_PROVIDER_NAME,
+        instance_values: Optional[Callable[[str], Dict]] = None,
+    ) -> None:
+        """
+        Adds a resource to the module, with a planned instance for each of the instance keys, or a single planned
+        instance when no keys are given. `instance_values` returns the values specific to an instance from its address
+        suffix (e.g. `[0]`), which are merged into the common values.
+        """
+        config_address = f"{resource_type}.{name}"
+        config_resource: Dict[str, Any] = {
+            "address": config_address,
+            "mode": "managed",
+            "type": resource_type,
+            "name": name,
+            "provider_config_key": provider_name.rsplit("/", 1)[-1],
+            "expressions": expressions,
+            "schema_version": 0,
+        }
+        if instance_keys is not None:
+            if fan_out_mode == FAN_OUT_COUNT:
+                config_resource["count_expression"] = _constant(len(instance_keys))
+            else:
+                config_resource["for_each_expression"] = _constant({key: key for key in instance_keys})
+        self.config_module["resources"].append(config_resource)
+
+        for instance_key in instance_keys if instance_keys is not None else [None]:
+            suffix = _instance_suffix(instance_key)
+            address = config_address + suffix
+            planned_resource: Dict[str, Any] = {
+                "address": f"{self.module_address}.{address}" if self.module_address else address,
+                "mode": "managed",
+                "type": resource_type,
+                "name": name,
+                "provider_name": provider_name,
+                "schema_version": 0,
+                "values": dict(values, **instance_values(suffix)) if instance_values else values,
+                "sensitive_values": {},
+            }
+            if instance_key is not None:
+                planned_resource["index"] = instance_key
+            self.planned_module["resources"].append(planned_resource)
+
+    def add_function(self, name: str, shape: SyntheticPlanShape, layer_references: Dict) -> None:
+        """
+        Adds a zip Lambda function and its sam metadata resource, both expanded into `shape.fan_out` instances
+        """
+        instance_keys: Optional[List] = None
+        if shape.fan_out > 1:
+            instance_keys = (
+                list(range(shape.fan_out))
+                if shape.fan_out_mode == FAN_OUT_COUNT
+                else [f"key{index}" for index in range(shape.fan_out)]
+            )
+
+        self.add_resource(
+            TF_AWS_LAMBDA_FUNCTION,
+            name,
+            {
+                "filename": self.built_output_path,
+                "handler": "app.lambda_handler",
+                "runtime": "python3.11",
+                "package_type": "Zip",
+                "architectures": ["x86_64"],
+                "memory_size": 128,
+                "timeout": 3,
+                "layers": [LAYER_ARN],
+            },
+            {
+                "function_name": _constant(name),
+                "filename": _constant(self.built_output_path),
+                "handler": _constant("app.lambda_handler"),
+                "runtime": _constant("python3.11"),
+                "layers": layer_references,
+            },
+            instance_keys,
+            shape.fan_out_mode,
+            # function names are unique per instance, as they would be when built from count.index or each.key
+            instance_values=lambda suffix: self._function_values("-".join([name, suffix.strip('[]"')]).rstrip("-")),
+        )
+
+        triggers = {
+            "resource_type": "ZIP_LAMBDA_FUNCTION",
+            "original_source_code": self.source_code_path,
+            "built_output_path": self.built_output_path,
+        }
+        self.add_resource(
+            SAM_METADATA_RESOURCE_TYPE,
+            f"{SAM_METADATA_NAME_PREFIX}{name}",
+            {},
+            {"triggers": _constant(triggers)},
+            instance_keys,
+            shape.fan_out_mode,
+            NULL_RESOURCE_PROVIDER_NAME,
+            instance_values=lambda suffix: {
+                "triggers": dict(triggers, resource_name=f"{TF_AWS_LAMBDA_FUNCTION}.{name}{suffix}")
+            },
+        )
+
+    def _function_values(self, function_name: str) -> Dict:
+        """
+        Returns the planned values specific to an instance of a function
+        """
+        function_arn = f"arn:aws:lambda:{REGION}:{ACCOUNT_ID}:function:{self._physical_id(function_name)}"
+        return {
+            "function_name": function_name,
+            "arn": function_arn,
+            "invoke_arn": f"arn:aws:apigateway:{REGION}:lambda:path/2015-03-31/functions/{function_arn}/invocations",
+        }
+
+    def _physical_id(self, name: str) -> str:
+        """
+        Returns an id of the resource with the given name which is unique across the modules, as the applied project
+        would have
+        """
+        if not self.module_address:
+            return name
+        return "-".join([self.module_address.replace("module.", "").replace(".", "-"), name])
+
+    def add_rest_api(self, routes: int) -> None:
+        """
+        Adds a REST API with a stage and the given number of routes, all integrated with the api handler function
+        """
+        api_id = self._physical_id(API_NAME)
+        root_resource_id = self._physical_id("root")
+        rest_api_id = _references(f"{TF_AWS_API_GATEWAY_REST_API}.{API_NAME}.id")
+        self.add_resource(
+            TF_AWS_API_GATEWAY_REST_API,
+            API_NAME,
+            {
+                "name": "synthetic-api",
+                "binary_media_types": [],
+                "parameters": None,
+                "id": api_id,
+                "root_resource_id": root_resource_id,
+            },
+            {"name": _constant("synthetic-api")},
+        )
+        self.add_resource(
+            TF_AWS_API_GATEWAY_STAGE,
+            API_NAME,
+            {"stage_name": "prod", "variables": None, "rest_api_id": api_id},
+            {"rest_api_id": rest_api_id, "stage_name": _constant("prod")},
+        )
+
+        handler_invoke_arn = self._function_values(API_HANDLER_NAME)["invoke_arn"]
+        for index in range(routes):
+            route_name = f"route_{index}"
+            route_id = self._physical_id(route_name)
+            resource_id = _references(f"{TF_AWS_API_GATEWAY_RESOURCE}.{route_name}.id")
+            self.add_resource(
+                TF_AWS_API_GATEWAY_RESOURCE,
+                route_name,
+                {"path_part": f"route{index}", "id": route_id, "rest_api_id": api_id, "parent_id": root_resource_id},
+                {
+                    "rest_api_id": rest_api_id,
+                    "parent_id": _references(f"{TF_AWS_API_GATEWAY_REST_API}.{API_NAME}.root_resource_id"),
+                    "path_part": _constant(f"route{index}"),
+                },
+            )
+            self.add_resource(
+                TF_AWS_API_GATEWAY_METHOD,
+                route_name,
+                {
+                    "http_method": "GET",
+                    "authorization": "NONE",
+                    "operation_name": None,
+                    "rest_api_id": api_id,
+                    "resource_id": route_id,
+                },
+                {
+                    "rest_api_id": rest_api_id,
+                    "resource_id": resource_id,
+                    "http_method": _constant("GET"),
+                    "authorization": _constant("NONE"),
+                },
+            )
+            self.add_resource(
+                TF_AWS_API_GATEWAY_INTEGRATION,
+                route_name,
+                {
+                    "http_method": "GET",
+                    "type": "AWS_PROXY",
+                    "integration_http_method": "POST",
+                    "rest_api_id": api_id,
+                    "resource_id": route_id,
+                    "uri": handler_invoke_arn,
+                },
+                {
+                    "rest_api_id": rest_api_id,
+                    "resource_id": resource_id,
+                    "http_method": _constant("GET"),
+                    "type": _constant("AWS_PROXY"),
+                    "uri": _references(f"{TF_AWS_LAMBDA_FUNCTION}.{API_HANDLER_NAME}.invoke_arn"),
+                },
+            )
+
+
+def _instance_suffix(instance_key: Any) -> str:
+    if instance_key is None:
+        return ""
+    if isinstance(instance_key, int):
+        return f"[{instance_key}]"
+    return f'["{instance_key}"]'
+
+
+def _constant(value: Any) -> Dict:
+    return {"constant_value": value}
+
+
+def _references(attribute_address: str) -> Dict:
+    """
+    Builds the references of an expression to a resource attribute or a variable, as Terraform lists them: the
+    attribute address followed by the address of the resource it belongs to
+    """
+    references = [attribute_address]
+    if not attribute_address.startswith("var."):
+        references.append(attribute_address.rsplit(".", 1)[0])
+    return {"references": references}
@@ -0,0 +1,74 @@
+"""
+Scaling test of the resource linking of the Terraform prepare hook
+
+Translates synthetic plans (see synthetic_plan.py) of growing size and checks that the time spent linking the resources
+grows about linearly with the number of resources, whether the resources are added to each module (API Gateway
+routes linking to their resources, methods and functions) or spread across more modules. The modules are added at
+the same depth, the variables of deeper modules are resolved through every parent module, which adds work per level.
+"""
+
+import logging
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from tests.benchmarks.terraform_prepare.benchmark import run_benchmark
+from tests.benchmarks.terraform_prepare.synthetic_plan import SyntheticPlanShape, generate_plan
+
+LINKING_PHASE = "_handle_linking"
+REPEAT = 5
+
+# The linking time may grow this many times faster than the number of resources, e.g. 8 times more resources may take
+# up to 16 times longer to link, which leaves room for noise but not for a quadratic growth (64 times longer)
+LINEAR_GROWTH_TOLERANCE = 2
+
+
+def count_planned_resources(shape: SyntheticPlanShape) -> int:
+    plan = generate_plan(shape, "src", "function.zip")
+    modules = [plan["planned_values"]["root_module"]]
+    count = 0
+    while modules:
+        module = modules.pop()
+        count += len(module.get("resources", []))
+        modules.extend(module.get("child_modules", []))
+    return count
+
+
+def linking_time(shape: SyntheticPlanShape) -> float:
+    results = {result.phase: result for result in run_benchmark(shape, REPEAT, measure_memory=False)}
+    return results[LINKING_PHASE].wall_time
+
+
+class TestLinkingScaling(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # the synthetic functions are not built, the hook logs a warning for each of them
+        logging.disable(logging.WARNING)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    @parameterized.expand(
+        [
+            (
+                "more_api_routes_per_module",
+                SyntheticPlanShape(module_depth=1, child_modules=2, api_routes_per_module=25),
+                SyntheticPlanShape(module_depth=1, child_modules=2, api_routes_per_module=200),
+            ),
+            (
+                "more_modules",
+                SyntheticPlanShape(module_depth=1, child_modules=4, api_routes_per_module=10),
+                SyntheticPlanShape(module_depth=1, child_modules=32, api_routes_per_module=10),
+            ),
+        ]
+    )
+    def test_linking_time_grows_linearly(self, _, small_shape, large_shape):
+        resources_growth = count_planned_resources(large_shape) / count_planned_resources(small_shape)
+        time_growth = linking_time(large_shape) / linking_time(small_shape)
+
+        self.assertLessEqual(
+            time_growth,
+            resources_growth * LINEAR_GROWTH_TOLERANCE,
+            f"Linking {resources_growth:.1f} times more resources took {time_growth:.1f} times longer",
+        )
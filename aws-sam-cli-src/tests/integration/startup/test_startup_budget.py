@@ -0,0 +1,61 @@
+"""
+Cold startup time budget of key SAM CLI commands
+
+Each command runs in new processes, and the median wall time must stay within its budget. The budgets leave about
+three times the startup measured on a developer machine, so that they catch import regressions (e.g. a command
+module importing boto3 or docker at module level) rather than slow CI hosts.
+
+Set SAM_CLI_PROFILE_STARTUP (see samcli/cli/startup_profiler.py) to find out where the time goes.
+"""
+
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from samcli.cli.startup_profiler import STARTUP_PROFILE_ENV_VAR
+
+RUNS = 5
+
+
+def measure_startup(command: str, runs: int = RUNS) -> float:
+    """
+    Runs `sam <command>` in new processes and returns the median wall time in milliseconds
+    """
+    env = dict(os.environ, SAM_CLI_TELEMETRY="0")
+    env.pop(STARTUP_PROFILE_ENV_VAR, None)
+    args = [sys.executable, "-m", "samcli", *shlex.split(command)]
+
+    # the first run compiles the bytecode of the modules which are not compiled yet
+    subprocess.run(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+class TestStartupBudget(TestCase):
+    @parameterized.expand(
+        [
+            ("--version", 1000),
+            ("--help", 1000),
+            ("local invoke --help", 2000),
+            ("local start-api --help", 2000),
+            ("deploy --help", 2000),
+        ]
+    )
+    def test_startup_within_budget(self, command, budget_ms):
+        duration = measure_startup(command)
+        self.assertLessEqual(
+            duration,
+            budget_ms,
+            f"`sam {command}` took {duration:.0f} ms to start, over its {budget_ms} ms budget",
+        )
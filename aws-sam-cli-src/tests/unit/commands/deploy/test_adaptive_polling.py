@@ -0,0 +1,166 @@
+import os
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import boto3
+from botocore.stub import Stubber
+
+from samcli.commands.deploy.adaptive_polling import (
+    CALLS_BURST,
+    CALLS_PER_SECOND,
+    AdaptivePollSchedule,
+    AdaptiveStackPoller,
+    RateLimiter,
+    fast_event_polls,
+    rate_limiter_from_environment,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def stack_events(event_id):
+    return {
+        "StackEvents": [
+            {
+                "StackId": "stack-id",
+                "EventId": event_id,
+                "StackName": "stack",
+                "Timestamp": "2026-01-01T00:00:00Z",
+            }
+        ]
+    }
+
+
+class TestAdaptivePollSchedule(TestCase):
+    def test_delays_grow_from_min_delay_up_to_max_delay(self):
+        schedule = AdaptivePollSchedule(2, 10, backoff=2, random_source=lambda: 0)
+
+        self.assertEqual([schedule.next_delay() for _ in range(5)], [2, 4, 8, 10, 10])
+
+    def test_reset_goes_back_to_min_delay(self):
+        schedule = AdaptivePollSchedule(2, 10, backoff=2, random_source=lambda: 0)
+        schedule.next_delay()
+        schedule.next_delay()
+
+        schedule.reset()
+
+        self.assertEqual(schedule.next_delay(), 2)
+
+    def test_jitter_only_lengthens_the_delay(self):
+        schedule = AdaptivePollSchedule(2, 10, jitter=0.5, random_source=lambda: 1)
+
+        self.assertEqual(schedule.next_delay(), 3)
+
+
+class TestRateLimiter(TestCase):
+    def test_calls_within_the_burst_do_not_wait(self):
+        clock = FakeClock()
+        limiter = RateLimiter(2, 3, clock=clock, sleep=clock.sleep)
+
+        self.assertEqual([limiter.acquire() for _ in range(3)], [0, 0, 0])
+
+    def test_calls_past_the_burst_wait_for_their_token(self):
+        clock = FakeClock()
+        limiter = RateLimiter(2, 1, clock=clock, sleep=clock.sleep)
+
+        limiter.acquire()
+
+        self.assertEqual(limiter.acquire(), 0.5)
+        self.assertEqual(clock.sleeps, [0.5])
+
+    @patch.dict(
+        os.environ, {"SAM_CLI_CLOUDFORMATION_CALLS_PER_SECOND": "10", "SAM_CLI_CLOUDFORMATION_CALLS_BURST": "20"}
+    )
+    def test_rate_is_configured_by_environment_variables(self):
+        limiter = rate_limiter_from_environment()
+
+        self.assertEqual((limiter.rate, limiter.burst), (10, 20))
+
+    @patch.dict(
+        os.environ, {"SAM_CLI_CLOUDFORMATION_CALLS_PER_SECOND": "fast", "SAM_CLI_CLOUDFORMATION_CALLS_BURST": "0"}
+    )
+    def test_invalid_environment_variables_are_ignored(self):
+        limiter = rate_limiter_from_environment()
+
+        self.assertEqual((limiter.rate, limiter.burst), (CALLS_PER_SECOND, CALLS_BURST))
+
+
+class TestAdaptiveStackPoller(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.client = boto3.client(
+            "cloudformation", region_name="us-east-1", aws_access_key_id="key", aws_secret_access_key="secret"
+        )
+        rate_limiter = RateLimiter(1000, 1000, clock=self.clock, sleep=self.clock.sleep)
+        self.poller = AdaptiveStackPoller(
+            10, rate_limiter=rate_limiter, clock=self.clock, sleep=self.clock.sleep, random_source=lambda: 0
+        )
+        self.poller.register(self.client)
+
+    def poll(self, stubber, event_id):
+        stubber.add_response("describe_stack_events", stack_events(event_id), {"StackName": "stack"})
+        self.client.describe_stack_events(StackName="stack")
+        return self.clock.now
+
+    def test_polls_fast_then_back_off_until_new_events(self):
+        # the deployer sleeps the shortest delay of the poller before each poll
+        deployer_sleep = self.poller.min_delay
+        poll_times = []
+        with Stubber(self.client) as stubber:
+            for event_id in ["e1", "e1", "e1", "e1", "e2", "e2"]:
+                poll_times.append(self.poll(stubber, event_id))
+                self.clock.now += deployer_sleep
+
+        intervals = [later - earlier for earlier, later in zip(poll_times, poll_times[1:])]
+        self.assertEqual(intervals, [2, 3, 4.5, 6.75, 2])
+
+    def test_delays_start_below_poll_delay_and_grow_past_it(self):
+        self.assertEqual(self.poller.min_delay, 2)
+        self.assertEqual(self.poller.max_delay, 40)
+
+    def test_next_pages_are_not_paced(self):
+        with Stubber(self.client) as stubber:
+            self.poll(stubber, "e1")
+            self.clock.now += 1
+            stubber.add_response(
+                "describe_stack_events", stack_events("e0"), {"StackName": "stack", "NextToken": "token"}
+            )
+            self.client.describe_stack_events(StackName="stack", NextToken="token")
+
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_stacks_are_paced_independently(self):
+        with Stubber(self.client) as stubber:
+            self.poll(stubber, "e1")
+            stubber.add_response("describe_stack_events", stack_events("e1"), {"StackName": "other-stack"})
+            self.client.describe_stack_events(StackName="other-stack")
+
+        self.assertEqual(self.clock.sleeps, [])
+
+
+class TestFastEventPolls(TestCase):
+    def test_lowers_the_deployer_sleep_while_the_changeset_executes(self):
+        deployer = Mock(client_sleep=10)
+        poller = AdaptiveStackPoller(10)
+
+        with fast_event_polls(deployer, poller):
+            self.assertEqual(deployer.client_sleep, 2)
+
+        self.assertEqual(deployer.client_sleep, 10)
+
+    def test_keeps_the_deployer_sleep_without_a_poller(self):
+        deployer = Mock(client_sleep=10)
+
+        with fast_event_polls(deployer, None):
+            self.assertEqual(deployer.client_sleep, 10)
@@ -0,0 +1,223 @@
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from parameterized import parameterized
+
+from samcli.commands.deploy.exceptions import DeployFailedError, StacksFileError
+from samcli.commands.deploy.multi_stack_deploy import (
+    DEPLOYED,
+    FAILED,
+    SKIPPED,
+    MultiStackDeployContext,
+    StackEntry,
+    _find_cycle,
+    read_stacks_file,
+)
+from samcli.commands.exceptions import UserException
+
+
+def entry(stack_name, depends_on=(), output_references=None, parameter_overrides=None):
+    return StackEntry(
+        stack_name=stack_name,
+        template_file=f"{stack_name}.yaml",
+        depends_on=set(depends_on),
+        output_references=output_references or {},
+        parameter_overrides=parameter_overrides or {},
+    )
+
+
+class TestReadStacksFile(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for template in ("network.yaml", "api.yaml"):
+            with open(os.path.join(self.directory, template), "w") as template_file:
+                template_file.write("Resources: {}\n")
+        self.stacks_file = os.path.join(self.directory, "stacks.yaml")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read(self, content):
+        with open(self.stacks_file, "w") as stacks_file:
+            stacks_file.write(content)
+        return read_stacks_file(self.stacks_file)
+
+    def test_reads_the_stacks_and_their_dependencies(self):
+        entries = self.read(
+            """
+stacks:
+  - stack_name: network
+    template_file: network.yaml
+  - stack_name: api
+    template_file: api.yaml
+    parameter_overrides:
+      Stage: prod
+      VpcId:
+        StackOutput: network.VpcId
+    tags:
+      team: api
+    capabilities: CAPABILITY_IAM
+"""
+        )
+
+        network, api = entries
+        self.assertEqual(network.template_file, os.path.join(self.directory, "network.yaml"))
+        self.assertEqual(api.parameter_overrides, {"Stage": "prod"})
+        self.assertEqual(api.output_references, {"VpcId": ("network", "VpcId")})
+        self.assertEqual(api.dependencies, {"network"})
+        self.assertEqual(api.tags, {"team": "api"})
+        self.assertEqual(api.capabilities, ["CAPABILITY_IAM"])
+
+    @parameterized.expand(
+        [
+            ("not_a_list", "stacks: network", "non-empty list of stacks"),
+            ("empty", "stacks: []", "non-empty list of stacks"),
+            ("missing_template", "stacks:\n  - stack_name: network", "stack_name and a template_file"),
+            (
+                "template_not_found",
+                "stacks:\n  - stack_name: network\n    template_file: missing.yaml",
+                "does not exist",
+            ),
+            (
+                "duplicate_stack",
+                "stacks:\n"
+                "  - stack_name: network\n    template_file: network.yaml\n"
+                "  - stack_name: network\n    template_file: api.yaml",
+                "listed more than once",
+            ),
+            (
+                "unknown_dependency",
+                "stacks:\n  - stack_name: network\n    template_file: network.yaml\n    depends_on: [database]",
+                "depends on database, not in the file",
+            ),
+            (
+                "invalid_stack_output",
+                "stacks:\n  - stack_name: api\n    template_file: api.yaml\n"
+                "    parameter_overrides:\n      VpcId:\n        StackOutput: network",
+                "must be a value or",
+            ),
+            (
+                "invalid_tags",
+                "stacks:\n  - stack_name: api\n    template_file: api.yaml\n    tags: [team]",
+                "tags of the stack api must be a mapping",
+            ),
+            (
+                "cycle",
+                "stacks:\n"
+                "  - stack_name: network\n    template_file: network.yaml\n    depends_on: [api]\n"
+                "  - stack_name: api\n    template_file: api.yaml\n    depends_on: [network]",
+                "depend on each other: network -> api -> network",
+            ),
+        ]
+    )
+    def test_invalid_stacks_file(self, _, content, message):
+        with self.assertRaises(StacksFileError) as context:
+            self.read(content)
+
+        self.assertIn(message, str(context.exception))
+
+    def test_missing_stacks_file(self):
+        with self.assertRaises(StacksFileError):
+            read_stacks_file(os.path.join(self.directory, "missing.yaml"))
+
+
+class TestFindCycle(TestCase):
+    def test_no_cycle_in_a_dag(self):
+        entries = [entry("a"), entry("b", ["a"]), entry("c", ["a", "b"]), entry("d", ["c"])]
+
+        self.assertIsNone(_find_cycle(entries))
+
+    def test_cycle_through_depends_on(self):
+        entries = [entry("a", ["c"]), entry("b", ["a"]), entry("c", ["b"]), entry("d")]
+
+        self.assertEqual(_find_cycle(entries), ["a", "c", "b", "a"])
+
+    def test_cycle_through_stack_outputs(self):
+        entries = [entry("a", output_references={"P": ("b", "Out")}), entry("b", ["a"])]
+
+        self.assertEqual(_find_cycle(entries), ["a", "b", "a"])
+
+    def test_stack_depending_on_itself(self):
+        self.assertEqual(_find_cycle([entry("a", ["a"])]), ["a", "a"])
+
+
+class TestMultiStackDeployContextRun(TestCase):
+    def setUp(self):
+        self.context = MultiStackDeployContext(
+            stacks_file="stacks.yaml",
+            max_concurrent_deploys=2,
+            deploy_options={"parameter_overrides": {"Stage": "dev", "VpcId": "default"}},
+            region="us-east-1",
+            profile=None,
+            poll_delay=5,
+        )
+        self.deployed = []
+        self.lock = threading.Lock()
+
+    def deploy_stack(self, failing_stacks=(), outputs=None):
+        def _deploy_stack(stack_entry):
+            with self.lock:
+                self.deployed.append(stack_entry.stack_name)
+            if stack_entry.stack_name in failing_stacks:
+                raise UserException(f"{stack_entry.stack_name} failed")
+            return (outputs or {}).get(stack_entry.stack_name, {})
+
+        return _deploy_stack
+
+    @patch("samcli.commands.deploy.multi_stack_deploy.click")
+    def test_deploys_the_dependencies_first(self, _):
+        self.context.entries = [entry("api", ["network"]), entry("network"), entry("dashboards", ["api"])]
+
+        with patch.object(self.context, "_deploy_stack", side_effect=self.deploy_stack()):
+            self.context.run()
+
+        self.assertEqual(self.deployed, ["network", "api", "dashboards"])
+        self.assertEqual(set(self.context.statuses.values()), {DEPLOYED})
+
+    @patch("samcli.commands.deploy.multi_stack_deploy.click")
+    def test_skips_the_dependents_of_failed_stacks(self, _):
+        self.context.entries = [
+            entry("network"),
+            entry("api", ["network"]),
+            entry("dashboards", ["api"]),
+            entry("independent"),
+        ]
+
+        with patch.object(self.context, "_deploy_stack", side_effect=self.deploy_stack(failing_stacks=["network"])):
+            with self.assertRaises(DeployFailedError) as context:
+                self.context.run()
+
+        self.assertEqual(sorted(self.deployed), ["independent", "network"])
+        self.assertEqual(
+            self.context.statuses,
+            {"network": FAILED, "api": SKIPPED, "dashboards": SKIPPED, "independent": DEPLOYED},
+        )
+        self.assertEqual(context.exception.stack_name, "network, api, dashboards")
+
+    @patch("samcli.commands.deploy.multi_stack_deploy.click")
+    def test_resolves_stack_output_parameters(self, _):
+        api = entry("api", output_references={"VpcId": ("network", "VpcId")}, parameter_overrides={"Stage": "prod"})
+        self.context.entries = [entry("network"), api]
+        resolved = {}
+
+        def deploy_stack(stack_entry):
+            resolved[stack_entry.stack_name] = self.context._parameter_overrides(stack_entry)
+            return {"VpcId": "vpc-123"} if stack_entry.stack_name == "network" else {}
+
+        with patch.object(self.context, "_deploy_stack", side_effect=deploy_stack):
+            self.context.run()
+
+        self.assertEqual(resolved["network"], {"Stage": "dev", "VpcId": "default"})
+        self.assertEqual(resolved["api"], {"Stage": "prod", "VpcId": "vpc-123"})
+
+    def test_missing_stack_output_fails_the_stack(self):
+        self.context._outputs = {"network": {"SubnetId": "subnet-123"}}
+
+        with self.assertRaises(UserException) as context:
+            self.context._parameter_overrides(entry("api", output_references={"VpcId": ("network", "VpcId")}))
+
+        self.assertIn("has no output VpcId", str(context.exception))